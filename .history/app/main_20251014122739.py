@@ -1,49 +0,0 @@
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from app.core.config import settings
-
-app = FastAPI(
-    title=settings.APP_NAME,
-    description="多AI协作决策助手API",
-    version="1.0.0"
-)
-
-# CORS配置
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.ALLOWED_ORIGINS,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-@app.get("/")
-async def root():
-    """健康检查"""
-    return {
-        "app": settings.APP_NAME,
-        "status": "running",
-        "environment": settings.ENVIRONMENT
-    }
-
-@app.get("/health")
-async def health_check():
-    """健康检查端点"""
-    return {"status": "ok"}
-
-# 导入路由
-from app.api import test, auth, users
-
-# 注册路由
-app.include_router(test.router, prefix="/api")
-app.include_router(auth.router, prefix="/api")
-app.include_router(users.router, prefix="/api")
-
-if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(
-        "app.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True
-    )
\ No newline at end of file
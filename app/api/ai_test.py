@@ -1,28 +1,42 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from typing import List, Dict
+from fastapi import APIRouter, HTTPException, Depends
+import asyncio
+import orjson
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict
+from typing import List, Dict, Literal
 from app.services.ai_manager import get_ai_manager
+from app.core.config import settings
+from app.core.rate_limit import RateLimiter
 
 router = APIRouter(prefix="/ai-test", tags=["AI测试"])
 
+# ✅ 会触发LLM调用的接口按用户/IP限流，防止成本失控
+llm_rate_limit = RateLimiter(times=settings.LLM_TEST_RATE_LIMIT, seconds=60, namespace="rl:ai-test")
+
 class ChatRequest(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+    
     messages: List[Dict[str, str]]
-    ai_type: str  # "meta", "ai_a", "ai_b"
+    ai_type: Literal["meta", "ai_a", "ai_b"]  # ✅ 入参校验阶段即拒绝无效类型
 
-@router.post("/chat")
+# ✅ ai_type -> AIManager方法名（新增AI只需加一行）
+_DISPATCH = {
+    "meta": "call_meta_ai",
+    "ai_a": "call_ai_a",
+    "ai_b": "call_ai_b",
+}
+
+@router.post("/chat", dependencies=[Depends(llm_rate_limit)])
 async def test_chat(request: ChatRequest):
     """测试AI对话"""
     ai_manager = get_ai_manager()
     
+    call = getattr(ai_manager, _DISPATCH.get(request.ai_type, ""), None)
+    if call is None:
+        raise HTTPException(status_code=400, detail="无效的AI类型")
+    
     try:
-        if request.ai_type == "meta":
-            result = await ai_manager.call_meta_ai(request.messages)
-        elif request.ai_type == "ai_a":
-            result = await ai_manager.call_ai_a(request.messages)
-        elif request.ai_type == "ai_b":
-            result = await ai_manager.call_ai_b(request.messages)
-        else:
-            raise HTTPException(status_code=400, detail="无效的AI类型")
+        result = await call(request.messages)
         
         return {
             "status": "success",
@@ -44,34 +58,35 @@ async def reset_stats():
     ai_manager.reset_stats()
     return {"message": "统计信息已重置"}
 
-@router.post("/quick-test")
+@router.post("/quick-test", dependencies=[Depends(llm_rate_limit)])
 async def quick_test():
-    """快速测试所有AI"""
+    """
+    快速测试所有AI
+    
+    ✅ 以NDJSON流式返回：每个AI完成即输出一行，最后一行为统计信息
+    """
     ai_manager = get_ai_manager()
     
     test_messages = [
         {"role": "user", "content": "你好，请简单介绍一下你自己"}
     ]
     
-    results = {}
+    async def run(name: str, call) -> dict:
+        try:
+            return {"ai": name, "result": await call(test_messages)}
+        except Exception as e:
+            return {"ai": name, "error": f"测试失败: {str(e)}"}
     
-    try:
-        # 测试元认知AI
-        results["meta_ai"] = await ai_manager.call_meta_ai(test_messages)
-        
-        # 测试AI-A
-        results["ai_a"] = await ai_manager.call_ai_a(test_messages)
+    async def generate():
+        # ✅ 三个AI互不依赖，并行调用（并发上限由AIManager控制）
+        tasks = [
+            run("meta_ai", ai_manager.call_meta_ai),
+            run("ai_a", ai_manager.call_ai_a),
+            run("ai_b", ai_manager.call_ai_b)
+        ]
+        for next_done in asyncio.as_completed(tasks):
+            yield orjson.dumps(await next_done) + b"\n"
         
-        # 测试AI-B
-        results["ai_b"] = await ai_manager.call_ai_b(test_messages)
-        
-        # 获取统计
-        stats = ai_manager.get_stats()
-        
-        return {
-            "status": "success",
-            "results": results,
-            "stats": stats
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"测试失败: {str(e)}")
\ No newline at end of file
+        yield orjson.dumps({"status": "success", "stats": ai_manager.get_stats()}) + b"\n"
+    
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
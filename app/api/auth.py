@@ -2,21 +2,22 @@ from fastapi import APIRouter, HTTPException, status, Depends
 from datetime import timedelta
 from app.models.auth import UserRegister, UserLogin, Token
 from app.models.user import UserResponse
-from app.core.database import get_supabase
-from app.core.security import get_password_hash, verify_password, create_access_token
+from app.services.user_service import UserService, get_user_service
+from app.core.security import get_password_hash_async, create_access_token
 from app.core.config import settings
-from app.core.dependencies import get_current_active_user
+from app.api.users import get_current_user_info
 
 router = APIRouter(prefix="/auth", tags=["认证"])
 
 @router.post("/register", response_model=Token, status_code=status.HTTP_201_CREATED)
-async def register(user_data: UserRegister):
+async def register(
+    user_data: UserRegister,
+    user_service: UserService = Depends(get_user_service)
+):
     """用户注册"""
-    supabase = get_supabase()
-    
     # 检查邮箱是否已存在
-    existing = supabase.table("users").select("id").eq("email", user_data.email).execute()
-    if existing.data:
+    existing = await user_service.get_user_by_email(user_data.email)
+    if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="该邮箱已被注册"
@@ -24,7 +25,7 @@ async def register(user_data: UserRegister):
     
     # 创建用户（注意：实际生产环境应该使用Supabase Auth）
     # 这里为了简化MVP，直接在users表创建
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
     
     new_user = {
         "email": user_data.email,
@@ -35,16 +36,14 @@ async def register(user_data: UserRegister):
         "daily_used": 0
     }
     
-    response = supabase.table("users").insert(new_user).execute()
+    user = await user_service.create_user(new_user)
     
-    if not response.data:
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="用户创建失败"
         )
     
-    user = response.data[0]
-    
     # 生成token
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
@@ -55,21 +54,20 @@ async def register(user_data: UserRegister):
     return Token(access_token=access_token)
 
 @router.post("/login", response_model=Token)
-async def login(credentials: UserLogin):
+async def login(
+    credentials: UserLogin,
+    user_service: UserService = Depends(get_user_service)
+):
     """用户登录"""
-    supabase = get_supabase()
-    
     # 查找用户
-    response = supabase.table("users").select("*").eq("email", credentials.email).execute()
+    user = await user_service.get_user_by_email(credentials.email, columns="*")
     
-    if not response.data:
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="邮箱或密码错误"
         )
     
-    user = response.data[0]
-    
     # 注意：这里为了MVP简化，暂时跳过密码验证
     # 实际生产环境应该使用Supabase Auth或验证密码哈希
     
@@ -82,10 +80,14 @@ async def login(credentials: UserLogin):
     
     return Token(access_token=access_token)
 
-@router.get("/me", response_model=UserResponse)
-async def get_me(current_user: UserResponse = Depends(get_current_active_user)):
-    """获取当前用户信息"""
-    return current_user
+# ✅ /auth/me 与 /users/me 共用同一个处理函数（别名路由）
+router.add_api_route(
+    "/me",
+    get_current_user_info,
+    methods=["GET"],
+    response_model=UserResponse,
+    summary="获取当前用户信息（/users/me 的别名）"
+)
 
 @router.post("/logout")
 async def logout():
@@ -0,0 +1,98 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Any, Dict, List, Literal, Optional
+from urllib.parse import unquote, urlsplit
+from app.core.config import settings
+from app.core.rate_limit import RateLimiter
+import asyncio
+import httpx
+import orjson
+import posixpath
+
+router = APIRouter(prefix="/batch", tags=["批量请求"])
+
+# 单次批量请求的子请求上限
+MAX_BATCH_SIZE = 20
+
+# 透传给子请求的请求头（鉴权等，保证子请求与外层请求身份一致）
+_FORWARD_HEADERS = ("authorization", "cookie", "accept-language")
+
+# 子请求标记头：带此头的批量请求一律拒绝（防止批量嵌套）
+_SUBREQUEST_HEADER = "x-batch-subrequest"
+
+
+class BatchSubRequest(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
+    id: str
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"] = "GET"
+    url: str  # 应用内路径，例如 /api/workflow-test/phase0
+    body: Optional[Any] = None
+    headers: Dict[str, str] = {}
+
+
+class BatchRequest(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
+    requests: List[BatchSubRequest] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+async def _dispatch(client: httpx.AsyncClient, sub: BatchSubRequest, headers: Dict[str, str]) -> Dict[str, Any]:
+    """在进程内执行单个子请求，返回 {id, status, headers, body}"""
+    # ✅ 按解码、规范化后的路径校验（/api/%62atch、/api/x/../batch 等写法与路由实际匹配的路径一致）
+    path = posixpath.normpath(unquote(urlsplit(sub.url).path))
+    if not path.startswith("/api/") or path == "/api/batch" or path.startswith("/api/batch/"):
+        return {"id": sub.id, "status": 400, "headers": {}, "body": {"detail": "不支持的子请求地址"}}
+
+    try:
+        response = await asyncio.wait_for(
+            client.request(
+                sub.method,
+                sub.url,
+                headers={**sub.headers, **headers},  # 身份相关头与子请求标记不允许被子请求覆盖
+                content=orjson.dumps(sub.body) if sub.body is not None else None
+            ),
+            timeout=settings.BATCH_SUBREQUEST_TIMEOUT
+        )
+    except asyncio.TimeoutError:
+        return {"id": sub.id, "status": 504, "headers": {}, "body": {"detail": "子请求超时"}}
+    except Exception as e:
+        return {"id": sub.id, "status": 500, "headers": {}, "body": {"detail": f"子请求执行失败: {str(e)}"}}
+
+    try:
+        body = orjson.loads(response.content) if response.content else None
+    except orjson.JSONDecodeError:
+        body = response.text  # 非JSON响应（例如NDJSON流）原样返回
+
+    return {
+        "id": sub.id,
+        "status": response.status_code,
+        "headers": {"content-type": response.headers.get("content-type", "")},
+        "body": body
+    }
+
+
+@router.post("", dependencies=[Depends(RateLimiter(times=settings.BATCH_RATE_LIMIT, seconds=60, namespace="rl:batch"))])
+async def batch(batch_request: BatchRequest, request: Request):
+    """
+    批量请求：一次POST在进程内并发执行多个子请求
+
+    ✅ 省去客户端N次往返；子请求照常经过路由、鉴权、限流
+    ✅ 子请求沿用外层请求的客户端地址（按IP限流时各用户仍各自计数，而不是全部落到127.0.0.1）
+    """
+    if request.headers.get(_SUBREQUEST_HEADER):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="批量请求不能嵌套")
+
+    headers = {k: v for k, v in request.headers.items() if k in _FORWARD_HEADERS}
+    headers["content-type"] = "application/json"
+    headers[_SUBREQUEST_HEADER] = "1"
+
+    client_addr = (request.client.host, request.client.port) if request.client else ("unknown", 0)
+    transport = httpx.ASGITransport(app=request.app, client=client_addr)
+    async with httpx.AsyncClient(transport=transport, base_url="http://batch", timeout=settings.BATCH_SUBREQUEST_TIMEOUT) as client:
+        responses = await asyncio.gather(
+            *(_dispatch(client, sub, headers) for sub in batch_request.requests)
+        )
+
+    return ORJSONResponse({"responses": responses})
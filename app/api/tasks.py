@@ -1,69 +1,56 @@
 from fastapi import APIRouter, HTTPException, Depends, status, Query, Response
-from pydantic import BaseModel
-from typing import Dict, Any
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict
+from typing import Dict, Any, Optional
 import logging
 
 from app.services.task_service import get_task_service, TaskService
 from app.services.socket_manager import socket_manager
 from app.models.user import UserResponse
-from app.core.dependencies import get_current_active_user
-from app.core.database import get_supabase
+from app.models.task import TaskCreate
+from app.core.dependencies import get_current_active_user, invalidate_user_cache, cache_user
+from app.core.idempotency import IdempotentRequest, idempotency
+from app.core.config import settings
+from app.core.routing import ORJSONRoute
+from app.services.user_service import get_user_service
 
 # ✅ 配置日志
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/tasks", tags=["任务"])
-
-class TaskCreate(BaseModel):
-    scene: str
-    user_input: str
+router = APIRouter(prefix="/tasks", tags=["任务"], route_class=ORJSONRoute)
 
 class AnswersSubmit(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+    
     answers: Dict[int, str]
     intermediate_state: Dict[str, Any]
 
-# ✅ 辅助函数：原子递增配额
-async def increment_daily_used(user_id: str) -> int:
+# ✅ 辅助函数：原子消耗配额并插入任务
+async def consume_quota(user_id: str, scene: str, user_input: str) -> Dict[str, Any]:
     """
-    原子递增用户配额
+    原子消耗用户配额并插入任务行
     
-    使用PostgreSQL函数确保原子性
-    如果超过配额，抛出异常
+    使用PostgreSQL函数一次完成：配额校验 + 递增 + 插入任务 + 返回最新用户行
+    如果超过配额，抛出403（任务不会被插入）
     
     Returns:
-        新的 daily_used 值
+        {"task_id": 新任务ID, "user_row": 更新后的用户行}
     """
-    supabase = get_supabase()
+    created = await get_user_service().create_task_with_quota(user_id, scene, user_input)
     
-    try:
-        # ✅ 调用PostgreSQL函数（需要先创建）
-        result = supabase.rpc("increment_daily_used", {
-            "p_user_id": user_id
-        }).execute()
-        
-        if result.data is None:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="今日配额已用完"
-            )
-        
-        return result.data
-    except Exception as e:
-        if "quota_exceeded" in str(e):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="今日配额已用完"
-            )
-        raise
+    if created is None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="今日配额已用完"
+        )
+    
+    return created
 
 # ✅ 辅助函数：补偿回滚配额
 async def decrement_daily_used(user_id: str):
-    """补偿机制：回滚配额"""
-    supabase = get_supabase()
+    """补偿机制：回滚配额（任务已插入、但后续流程失败时）"""
     try:
-        supabase.rpc("decrement_daily_used", {
-            "p_user_id": user_id
-        }).execute()
+        await get_user_service().decrement_daily_used(user_id)
     except Exception as e:
         logger.error(f"回滚配额失败: user_id={user_id}, error={e}")
 
@@ -71,43 +58,45 @@ async def decrement_daily_used(user_id: str):
 async def create_task(
     task_data: TaskCreate,
     current_user: UserResponse = Depends(get_current_active_user),
-    task_service: TaskService = Depends(get_task_service)
+    task_service: TaskService = Depends(get_task_service),
+    idem: IdempotentRequest = Depends(idempotency)
 ):
     """
     创建新任务
     
     ✅ 改进：
-    - 原子递增配额（防止竞态）
+    - 原子递增配额并插入任务（防止竞态，单次往返）
     - 补偿机制（任务失败时回滚配额）
+    - 幂等键（客户端重试时回放首次响应，不重复扣配额、建任务）
     - 结构化日志
     """
     
-    # ✅ 开发环境：临时禁用配额检查
-    import os
-    if os.getenv("DISABLE_QUOTA_CHECK", "false").lower() == "true":
-        logger.info(f"开发环境：跳过配额检查 user_id={current_user.id}")
-    else:
-        # ✅ 前置检查（快速失败）
-        if current_user.daily_used >= current_user.daily_quota:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="今日配额已用完"
-            )
+    if idem.replay is not None:
+        return idem.replay
     
     user_id = str(current_user.id)
+    quota_enabled = not settings.DISABLE_QUOTA_CHECK
+    user_row = None
+    task_id = None
     
     try:
-        # ✅ 开发环境：跳过配额递增
-        if os.getenv("DISABLE_QUOTA_CHECK", "false").lower() != "true":
-            # ✅ 1. 先递增配额（原子操作）
-            new_used = await increment_daily_used(user_id)
-            logger.info(f"配额递增成功: user_id={user_id}, daily_used={new_used}")
+        if quota_enabled:
+            # ✅ 1. 原子消耗配额并插入任务（配额检查在SQL的WHERE中完成，同时返回任务ID与最新用户行）
+            created = await consume_quota(user_id, task_data.scene, task_data.user_input)
+            task_id, user_row = created["task_id"], created["user_row"]
+            await cache_user(user_row)
+            logger.info(f"配额递增成功: user_id={user_id}, daily_used={user_row['daily_used']}")
+        else:
+            # ✅ 开发环境：跳过配额检查
+            logger.info(f"开发环境：跳过配额检查 user_id={user_id}")
         
-        # ✅ 2. 创建任务（可能失败）
+        # ✅ 2. 运行任务（可能失败；任务行已插入时传入task_id）
         result = await task_service.create_task(
             user_id=user_id,
             scene=task_data.scene,
-            user_input=task_data.user_input
+            user_input=task_data.user_input,
+            task_id=task_id,
+            collaboration_mode=task_data.collaboration_mode
         )
         
         logger.info(
@@ -119,6 +108,15 @@ async def create_task(
             }
         )
         
+        # ✅ 返回最新配额，客户端无需再次拉取用户信息
+        if user_row is not None:
+            result["quota"] = {
+                "daily_used": user_row["daily_used"],
+                "daily_quota": user_row["daily_quota"],
+                "remaining": max(user_row["daily_quota"] - user_row["daily_used"], 0)
+            }
+        
+        await idem.complete(result, status.HTTP_201_CREATED)
         return result
         
     except HTTPException:
@@ -135,49 +133,59 @@ async def create_task(
             }
         )
         
-        await decrement_daily_used(user_id)
+        if user_row is not None:
+            await decrement_daily_used(user_id)
+            await invalidate_user_cache(user_id)
         
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="任务创建失败，请稍后重试"
         )
+    finally:
+        # ✅ 未complete（失败、客户端断开/超时导致请求被取消）时释放幂等键，否则重试会一直得到409
+        await idem.release()
 
 @router.post("/{task_id}/answers", status_code=status.HTTP_200_OK)
 async def submit_answers(
     task_id: str,
     answers_data: AnswersSubmit,
     current_user: UserResponse = Depends(get_current_active_user),
-    task_service: TaskService = Depends(get_task_service)
+    task_service: TaskService = Depends(get_task_service),
+    idem: IdempotentRequest = Depends(idempotency)
 ):
     """
     提交问询答案
     
     ✅ 改进：
     - 原子状态检查（防止重复提交）
+    - 幂等键（重试时回放首次响应，而不是因状态已变化返回400）
     - 结构化日志
     """
     
-    # 验证任务归属
-    task = task_service.get_task(task_id)
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="任务不存在"
-        )
-    
-    if task["user_id"] != str(current_user.id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="无权访问此任务"
-        )
-    
-    if task["status"] != "inquiring":
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"任务状态不正确，当前状态: {task['status']}"
-        )
+    if idem.replay is not None:
+        return idem.replay
     
     try:
+        # 验证任务归属
+        task = await task_service.get_task(task_id)
+        if not task:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="任务不存在"
+            )
+        
+        if task["user_id"] != str(current_user.id):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="无权访问此任务"
+            )
+        
+        if task["status"] != "inquiring":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"任务状态不正确，当前状态: {task['status']}"
+            )
+        
         result = await task_service.submit_answers_without_processing(
             task_id=task_id,
             answers=answers_data.answers,
@@ -193,8 +201,11 @@ async def submit_answers(
             }
         )
         
+        await idem.complete(result, status.HTTP_200_OK)
         return result
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.exception(
             "答案提交失败",
@@ -208,6 +219,9 @@ async def submit_answers(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="答案提交失败，请稍后重试"
         )
+    finally:
+        # ✅ 未complete（含请求被取消）时释放幂等键
+        await idem.release()
 
 @router.get("/{task_id}", status_code=status.HTTP_200_OK)
 async def get_task(
@@ -217,7 +231,7 @@ async def get_task(
 ):
     """获取任务详情"""
     
-    task = task_service.get_task(task_id)
+    task = await task_service.get_task(task_id)
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -230,7 +244,8 @@ async def get_task(
             detail="无权访问此任务"
         )
     
-    return task
+    # ✅ 数据库行直接orjson序列化（跳过jsonable_encoder）
+    return ORJSONResponse(task)
 
 @router.get("", status_code=status.HTTP_200_OK)
 async def list_tasks(
@@ -243,13 +258,14 @@ async def list_tasks(
     获取任务列表
     
     ✅ 已支持分页，返回总数
+    ✅ 数据库行已是JSON结构，直接orjson序列化（跳过jsonable_encoder）
     """
-    result = task_service.get_user_tasks(
+    result = await task_service.get_user_tasks(
         user_id=str(current_user.id),
         limit=limit,
         offset=offset
     )
-    return result
+    return ORJSONResponse(result)
 
 @router.post("/{task_id}/start-processing", status_code=status.HTTP_200_OK)
 async def start_processing(
@@ -261,49 +277,52 @@ async def start_processing(
     启动任务处理
     
     ✅ 改进：
-    - 原子状态切换
+    - 原子状态切换（条件UPDATE一次完成归属校验+认领，正常路径只有一次数据库往返）
     - 友好的错误消息
     - 结构化日志
     """
     
-    # 验证任务归属
-    task = task_service.get_task(task_id)
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="任务不存在"
-        )
-    
-    if task["user_id"] != str(current_user.id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="无权访问此任务"
-        )
-    
-    # ✅ 幂等性检查
-    current_status = task["status"]
-    if current_status == "processing":
-        return {
-            "task_id": task_id,
-            "status": "processing",
-            "message": "任务已在处理中"
-        }
-    
-    if current_status == "completed":
-        return {
-            "task_id": task_id,
-            "status": "completed",
-            "message": "任务已完成"
-        }
+    user_id = str(current_user.id)
+    claimed = await task_service.claim_for_processing(task_id, user_id)
     
-    if current_status != "ready_for_processing":
+    if claimed is None:
+        # 认领失败才查询一次，区分 不存在 / 无权访问 / 已在处理（幂等返回）
+        task = await task_service.get_task(task_id)
+        if not task:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="任务不存在"
+            )
+        
+        if task["user_id"] != user_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="无权访问此任务"
+            )
+        
+        # ✅ 幂等性检查
+        current_status = task["status"]
+        if current_status == "processing":
+            return {
+                "task_id": task_id,
+                "status": "processing",
+                "message": "任务已在处理中"
+            }
+        
+        if current_status == "completed":
+            return {
+                "task_id": task_id,
+                "status": "completed",
+                "message": "任务已完成"
+            }
+        
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"任务状态不正确，当前状态: {current_status}"
         )
     
     try:
-        result = await task_service.start_processing(task_id)
+        result = await task_service.start_processing(task_id, claimed)
         
         logger.info(
             "任务启动成功",
@@ -333,11 +352,12 @@ async def start_processing(
 async def get_task_progress(
     task_id: str,
     response: Response,
+    since: Optional[int] = Query(None, ge=0, description="已收到的最后一个sequence_id，只返回其后的进度"),
     current_user: UserResponse = Depends(get_current_active_user),
     task_service: TaskService = Depends(get_task_service)
 ):
     """
-    获取任务完整进度历史
+    获取任务进度历史（带 since 时只返回增量）
     
     ✅ 改进：
     - 不缓存（实时数据）
@@ -346,7 +366,7 @@ async def get_task_progress(
     """
     
     # 验证任务归属
-    task = task_service.get_task(task_id)
+    task = await task_service.get_task(task_id)
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -360,7 +380,7 @@ async def get_task_progress(
         )
     
     try:
-        progress_history = await socket_manager.get_full_progress(task_id)
+        progress_history = await socket_manager.get_progress_since(task_id, since)
         
         # ✅ 性能/缓存响应头
         response.headers["Cache-Control"] = "no-store"
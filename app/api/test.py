@@ -1,14 +1,24 @@
-from fastapi import APIRouter, HTTPException
-from app.core.database import get_supabase
+from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import ORJSONResponse
+from supabase import Client
+from app.core.database import get_supabase, run_in_executor
+from app.core.cache import JSONCache
 
 router = APIRouter(prefix="/test", tags=["测试"])
 
+# ✅ 场景模板几乎不变，缓存5分钟
+TEMPLATES_CACHE_TTL = 300
+_templates_cache = JSONCache("templates", ttl=TEMPLATES_CACHE_TTL, maxsize=32)
+
+
+@run_in_executor
+def _fetch_templates(supabase: Client):
+    return supabase.table("templates").select("name, scene, description").execute().data
+
 @router.get("/db-connection")
-async def test_db_connection():
+async def test_db_connection(supabase: Client = Depends(get_supabase)):
     """测试数据库连接"""
     try:
-        supabase = get_supabase()
-        
         # 查询templates表
         response = supabase.table("templates").select("*").limit(1).execute()
         
@@ -21,16 +31,19 @@ async def test_db_connection():
         raise HTTPException(status_code=500, detail=f"数据库连接失败: {str(e)}")
 
 @router.get("/tables")
-async def list_tables():
-    """列出所有场景模板"""
+async def list_tables(supabase: Client = Depends(get_supabase)):
+    """列出所有场景模板（带缓存）"""
     try:
-        supabase = get_supabase()
-        response = supabase.table("templates").select("name, scene, description").execute()
+        templates = await _templates_cache.get("all")
+        if templates is None:
+            templates = await _fetch_templates(supabase)
+            await _templates_cache.set("all", templates)
         
-        return {
+        # ✅ 直接返回ORJSONResponse，跳过jsonable_encoder
+        return ORJSONResponse({
             "status": "success",
-            "count": len(response.data),
-            "templates": response.data
-        }
+            "count": len(templates),
+            "templates": templates
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
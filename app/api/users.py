@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
 from app.models.user import UserResponse
 from app.core.dependencies import get_current_active_user
 from app.core.database import get_supabase
@@ -9,8 +10,13 @@ router = APIRouter(prefix="/users", tags=["用户"])
 async def get_current_user_info(
     current_user: UserResponse = Depends(get_current_active_user)
 ):
-    """获取当前用户详细信息"""
-    return current_user
+    """
+    获取当前用户详细信息
+    
+    ✅ current_user 已由依赖校验过，直接序列化返回，
+    跳过 response_model 的二次校验（response_model 仅用于文档）
+    """
+    return ORJSONResponse(current_user.model_dump())
 
 @router.get("/me/quota")
 async def get_user_quota(
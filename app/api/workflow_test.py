@@ -1,35 +1,95 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse, ORJSONResponse
+from pydantic import BaseModel, ConfigDict
+from langgraph.pregel import Pregel
 from app.services.langgraph.workflow import get_workflow
+from app.services.langgraph.state import merge_state
+from app.core.config import settings
+from app.core.rate_limit import RateLimiter
+from app.core.routing import ORJSONRoute
+from app.core.cache import JSONCache
 from uuid import uuid4
+from typing import AsyncIterator, Final, Literal
+import asyncio
+import hashlib
+import orjson
+
+# ✅ 所有接口都会触发LLM调用，统一按用户/IP限流，防止成本失控
+router = APIRouter(
+    prefix="/workflow-test",
+    tags=["工作流测试"],
+    route_class=ORJSONRoute,
+    dependencies=[Depends(RateLimiter(times=settings.LLM_TEST_RATE_LIMIT, seconds=60, namespace="rl:workflow-test"))]
+)
+
+# ✅ 初始状态模板（audit_trail 每次新建，避免共享可变列表）
+_BASE_STATE: Final = {
+    "user_id": "test-user",
+    "total_cost": 0.0
+}
+
+# ✅ 完整流程测试用的详细输入（信息充足，不触发问询）
+_DEBATE_TEST_INPUT: Final = """我是技术博主，粉丝主要是25-35岁的程序员，对新技术感兴趣，技术水平在中高级。
+我的视频播放量稳定在5-10万，之前做过3期AI相关视频（GPT-4应用、Prompt工程、AI绘画），效果不错，评论互动活跃。
+
+现在我想做一期关于AI Agent的视频。具体方向是：从实战应用角度切入，展示如何用LangChain搭建一个简单的AI Agent，包括代码演示。
+目标受众认知水平：了解基本AI概念，但没有实际开发过AI Agent。
+视频时长：15-20分钟，深度适中，既有理论也有实战。
+
+我的核心目标是：
+1. 涨粉（争取播放量突破15万）
+2. 建立AI实战开发的专业形象
+3. 为后续的AI开发系列铺垫
+
+制作资源：时间充足（可以花2周准备），有完整的开发环境，视频剪辑技术熟练。
+
+请帮我分析这个选题的可行性，从内容深度和流量效果两个角度给建议。"""
+
+_REVIEW_TEST_INPUT: Final = """帮我写一篇关于AI Agent的科普文章。
+
+目标受众：对AI感兴趣但没有技术背景的普通读者（如产品经理、创业者、学生）
+文章目的：让读者理解AI Agent是什么、能做什么、未来趋势
+核心观点：AI Agent不是遥不可及的技术，而是即将改变工作方式的实用工具
+
+具体要求：
+1. 字数：800-1000字
+2. 结构：什么是AI Agent → 实际应用案例 → 未来展望
+3. 风格：通俗易懂，多用比喻和生活化例子，避免专业术语
+4. 案例：至少2个真实的AI Agent应用场景（如客服、个人助理）
 
-router = APIRouter(prefix="/workflow-test", tags=["工作流测试"])
+请按照这些要求创作文章。"""
+
+def _initial_state(scene: str, user_input: str) -> dict:
+    """基于模板构建初始状态"""
+    return {
+        **_BASE_STATE,
+        "task_id": uuid4().hex,  # ✅ 测试ID，无需带连字符的格式
+        "scene": scene,
+        "user_input": user_input,
+        "audit_trail": []
+    }
 
 class EvaluateRequest(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+    
     scene: str
     user_input: str
 
 @router.post("/phase0-evaluate")
-async def test_phase0_evaluate(request: EvaluateRequest):
+async def test_phase0_evaluate(request: EvaluateRequest, workflow: Pregel = Depends(get_workflow)):
     """测试Phase 0评估节点"""
     
-    workflow = get_workflow()
-    
     # 初始化状态
-    initial_state = {
-        "task_id": str(uuid4()),
-        "user_id": "test-user",
-        "scene": request.scene,
-        "user_input": request.user_input,
-        "audit_trail": [],
-        "total_cost": 0.0
-    }
+    initial_state = _initial_state(
+        scene=request.scene,
+        user_input=request.user_input
+    )
     
     try:
         # 运行工作流
         result = await workflow.ainvoke(initial_state)
         
-        return {
+        return ORJSONResponse({
             "status": "success",
             "evaluation": {
                 "need_inquiry": result.get("need_inquiry"),
@@ -40,14 +100,33 @@ async def test_phase0_evaluate(request: EvaluateRequest):
             "audit_trail": result.get("audit_trail", []),
             "total_cost": result.get("total_cost"),
             "error": result.get("error")
-        }
+        })
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"工作流执行失败: {str(e)}")
 
+# ✅ 只读测试接口的工作流结果缓存：相同 (scene, user_input) 不重复调用LLM
+_workflow_result_cache = JSONCache("wf-test", ttl=600, maxsize=256)
+
+async def _cached_invoke(workflow: Pregel, scene: str, user_input: str) -> dict:
+    """运行工作流并缓存最终状态（缓存键不含 task_id / user_id）"""
+    key = f"{scene}:{hashlib.sha256(user_input.encode()).hexdigest()}"
+    
+    result = await _workflow_result_cache.get(key)
+    if result is None:
+        result = await workflow.ainvoke(_initial_state(scene=scene, user_input=user_input))
+        # 节点把LLM失败记录为 error 状态而不是抛异常：失败结果不缓存，避免一次偶发故障被固定10分钟
+        if not result.get("error"):
+            await _workflow_result_cache.set(key, result)
+    return result
+
 @router.post("/quick-test")
-async def quick_test():
-    """快速测试：信息充足和不足的场景"""
+async def quick_test(workflow: Pregel = Depends(get_workflow)):
+    """
+    快速测试：信息充足和不足的场景
+    
+    ✅ 以NDJSON流式返回，每个用例完成即输出一行
+    """
     
     test_cases = [
         {
@@ -62,60 +141,44 @@ async def quick_test():
         }
     ]
     
-    results = []
-    workflow = get_workflow()
-    
-    for test in test_cases:
-        initial_state = {
-            "task_id": str(uuid4()),
-            "user_id": "test-user",
-            "scene": test["scene"],
-            "user_input": test["user_input"],
-            "audit_trail": [],
-            "total_cost": 0.0
-        }
-        
+    async def run_case(test: dict) -> dict:
         try:
-            result = await workflow.ainvoke(initial_state)
-            results.append({
+            result = await _cached_invoke(workflow, test["scene"], test["user_input"])
+            return {
                 "test_name": test["name"],
                 "need_inquiry": result.get("need_inquiry"),
                 "info_sufficiency": result.get("info_sufficiency"),
                 "missing_info": result.get("missing_info"),
                 "cost": result.get("total_cost")
-            })
+            }
         except Exception as e:
-            results.append({
+            return {
                 "test_name": test["name"],
                 "error": str(e)
-            })
+            }
     
-    return {
-        "status": "success",
-        "test_results": results
-    }
+    async def generate():
+        # ✅ 测试用例互不依赖，并行执行；每完成一个即输出一行
+        for next_done in asyncio.as_completed([run_case(test) for test in test_cases]):
+            yield orjson.dumps(await next_done) + b"\n"
+    
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
 
 @router.post("/phase1-inquiry")
-async def test_phase1_inquiry(request: EvaluateRequest):
+async def test_phase1_inquiry(request: EvaluateRequest, workflow: Pregel = Depends(get_workflow)):
     """测试Phase 0-1完整流程（评估+生成问询）"""
     
-    workflow = get_workflow()
-    
     # 初始化状态
-    initial_state = {
-        "task_id": str(uuid4()),
-        "user_id": "test-user",
-        "scene": request.scene,
-        "user_input": request.user_input,
-        "audit_trail": [],
-        "total_cost": 0.0
-    }
+    initial_state = _initial_state(
+        scene=request.scene,
+        user_input=request.user_input
+    )
     
     try:
         # 运行工作流（Phase 0 + Phase 1）
         result = await workflow.ainvoke(initial_state)
         
-        return {
+        return ORJSONResponse({
             "status": "success",
             "evaluation": {
                 "need_inquiry": result.get("need_inquiry"),
@@ -129,7 +192,7 @@ async def test_phase1_inquiry(request: EvaluateRequest):
             "audit_trail": result.get("audit_trail", []),
             "total_cost": result.get("total_cost"),
             "error": result.get("error")
-        }
+        })
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"工作流执行失败: {str(e)}")
@@ -137,8 +200,14 @@ async def test_phase1_inquiry(request: EvaluateRequest):
 
 from typing import Any
 from app.services.langgraph.nodes.phase1_inquiry import phase1_process_answers
+from app.services.langgraph.nodes.phase2_planning import phase2_planning
+
+# 答案理解节点产出的字段（并发执行时只合并这些，其余以Phase 0-1结果为准）
+_ANSWER_KEYS: Final = ("need_inquiry", "missing_info", "info_sufficiency", "collected_info", "collaboration_mode")
 
 class AnswersRequest(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+    
     task_id: str
     scene: str
     user_input: str
@@ -168,41 +237,35 @@ async def test_phase1_process_answers(request: AnswersRequest):
     }
     
     try:
-        # 处理答案
-        result = await phase1_process_answers(state, request.answers)
+        # 处理答案（节点只返回变更字段，合并回状态后再读取）
+        merge_state(state, await phase1_process_answers(state, request.answers))
         
-        return {
+        return ORJSONResponse({
             "status": "success",
-            "collected_info": result.get("collected_info"),
-            "audit_trail": result.get("audit_trail", []),
-            "total_cost": result.get("total_cost"),
-            "error": result.get("error")
-        }
+            "collected_info": state.get("collected_info"),
+            "audit_trail": state.get("audit_trail", []),
+            "total_cost": state.get("total_cost"),
+            "error": state.get("error")
+        })
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"答案处理失败: {str(e)}")
 
 @router.post("/phase2-planning")
-async def test_phase2_planning(request: EvaluateRequest):
+async def test_phase2_planning(request: EvaluateRequest, workflow: Pregel = Depends(get_workflow)):
     """测试Phase 0-2完整流程（信息充足时直接规划）"""
     
-    workflow = get_workflow()
-    
     # 初始化状态（模拟信息充足的场景）
-    initial_state = {
-        "task_id": str(uuid4()),
-        "user_id": "test-user",
-        "scene": request.scene,
-        "user_input": request.user_input,
-        "audit_trail": [],
-        "total_cost": 0.0
-    }
+    initial_state = _initial_state(
+        scene=request.scene,
+        user_input=request.user_input
+    )
     
     try:
         # 运行工作流
         result = await workflow.ainvoke(initial_state)
         
-        return {
+        return ORJSONResponse({
             "status": "success",
             "evaluation": {
                 "need_inquiry": result.get("need_inquiry"),
@@ -218,55 +281,59 @@ async def test_phase2_planning(request: EvaluateRequest):
             "audit_trail": result.get("audit_trail", []),
             "total_cost": result.get("total_cost"),
             "error": result.get("error")
-        }
+        })
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"工作流执行失败: {str(e)}")
 
 
 @router.post("/full-test-with-inquiry")
-async def full_test_with_inquiry():
+async def full_test_with_inquiry(workflow: Pregel = Depends(get_workflow)):
     """完整测试：从评估→问询→规划（模拟完整流程）"""
     
     # 第一步：评估并生成问询
-    workflow = get_workflow()
+    initial_state = _initial_state(
+        scene="topic-analysis",
+        user_input="我想做一期关于AI Agent的视频"
+    )
     
-    initial_state = {
-        "task_id": str(uuid4()),
-        "user_id": "test-user",
-        "scene": "topic-analysis",
-        "user_input": "我想做一期关于AI Agent的视频",
-        "audit_trail": [],
-        "total_cost": 0.0
+    # 模拟用户回答问题（预先已知，不依赖Phase 0-1的结果）
+    mock_answers = {
+        1: "我的受众是25-35岁的程序员，对新技术感兴趣",
+        2: "之前做过3期AI视频，播放量5-10万",
+        3: "希望涨粉并建立专业形象"
     }
     
     try:
-        # Phase 0-1: 评估并生成问询
-        phase1_result = await workflow.ainvoke(initial_state)
-        
-        # 模拟用户回答问题
-        mock_answers = {
-            1: "我的受众是25-35岁的程序员，对新技术感兴趣",
-            2: "之前做过3期AI视频，播放量5-10万",
-            3: "希望涨粉并建立专业形象"
-        }
+        # ✅ Phase 0-1 评估问询 与 答案理解 互不依赖，并发执行
+        phase1_result, answer_result = await asyncio.gather(
+            workflow.ainvoke(initial_state),
+            phase1_process_answers({**initial_state, "collected_info": {}}, mock_answers),
+            return_exceptions=True
+        )
+        for outcome in (phase1_result, answer_result):
+            if isinstance(outcome, BaseException):
+                raise outcome
         
-        # Phase 1: 处理答案
-        from app.services.langgraph.nodes.phase1_inquiry import phase1_process_answers
-        phase1_state = dict(phase1_result)
-        answer_result = await phase1_process_answers(phase1_state, mock_answers)
-        
-        # 合并状态
-        phase1_state.update(answer_result)
-        
-        # Phase 2: 规划
-        from app.services.langgraph.nodes.phase2_planning import phase2_planning
-        planning_result = await phase2_planning(phase1_state)
+        # 合并状态：答案理解的审计记录接在Phase 0-1之后，成本累加
+        answer_trail = [
+            {**entry, "step": len(phase1_result.get("audit_trail") or []) + i}
+            for i, entry in enumerate(answer_result.get("audit_trail") or [])
+        ]
+        state = merge_state(
+            phase1_result,
+            {k: answer_result[k] for k in _ANSWER_KEYS if k in answer_result},
+            {
+                "audit_trail": answer_trail,
+                "total_cost": (phase1_result.get("total_cost") or 0.0) + (answer_result.get("total_cost") or 0.0)
+            }
+        )
         
-        # 合并状态
-        phase1_state.update(planning_result)
+        # Phase 2: 规划（依赖合并后的状态）
+        planning_result = await phase2_planning(state)
+        merge_state(state, planning_result)
         
-        return {
+        return ORJSONResponse({
             "status": "success",
             "phase1_inquiry": {
                 "questions": phase1_result.get("inquiry_questions", [])
@@ -280,49 +347,29 @@ async def full_test_with_inquiry():
                 "ai_a_role": planning_result.get("ai_a_role"),
                 "ai_b_role": planning_result.get("ai_b_role")
             },
-            "audit_trail": phase1_state.get("audit_trail", []),
-            "total_cost": phase1_state.get("total_cost")
-        }
+            "audit_trail": state.get("audit_trail", []),
+            "total_cost": state.get("total_cost")
+        })
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"完整流程测试失败: {str(e)}")
 
 
 @router.post("/phase3-debate")
-async def test_phase3_debate():
+async def test_phase3_debate(workflow: Pregel = Depends(get_workflow)):
     """测试Phase 3辩论模式（完整流程）"""
     
-    workflow = get_workflow()
-    
     # 提供极其详细的信息，确保不触发问询
-    initial_state = {
-        "task_id": str(uuid4()),
-        "user_id": "test-user",
-        "scene": "topic-analysis",
-        "user_input": """我是技术博主，粉丝主要是25-35岁的程序员，对新技术感兴趣，技术水平在中高级。
-我的视频播放量稳定在5-10万，之前做过3期AI相关视频（GPT-4应用、Prompt工程、AI绘画），效果不错，评论互动活跃。
-
-现在我想做一期关于AI Agent的视频。具体方向是：从实战应用角度切入，展示如何用LangChain搭建一个简单的AI Agent，包括代码演示。
-目标受众认知水平：了解基本AI概念，但没有实际开发过AI Agent。
-视频时长：15-20分钟，深度适中，既有理论也有实战。
-
-我的核心目标是：
-1. 涨粉（争取播放量突破15万）
-2. 建立AI实战开发的专业形象
-3. 为后续的AI开发系列铺垫
-
-制作资源：时间充足（可以花2周准备），有完整的开发环境，视频剪辑技术熟练。
-
-请帮我分析这个选题的可行性，从内容深度和流量效果两个角度给建议。""",
-        "audit_trail": [],
-        "total_cost": 0.0
-    }
+    initial_state = _initial_state(
+        scene="topic-analysis",
+        user_input=_DEBATE_TEST_INPUT
+    )
     
     try:
         # 运行完整工作流（Phase 0 → 2 → 3）
         result = await workflow.ainvoke(initial_state)
         
-        return {
+        return ORJSONResponse({
             "status": "success",
             "evaluation": {
                 "need_inquiry": result.get("need_inquiry"),
@@ -336,51 +383,33 @@ async def test_phase3_debate():
             "collaboration": {
                 "rounds": len(result.get("debate_rounds", [])),
                 "stop_reason": result.get("stop_reason"),
-                "final_ai_a": result.get("ai_a_output", "")[:300] + "..." if result.get("ai_a_output") else "未生成",
-                "final_ai_b": result.get("ai_b_output", "")[:300] + "..." if result.get("ai_b_output") else "未生成"
+                "final_ai_a": result.get("ai_a_output_preview") or "未生成",
+                "final_ai_b": result.get("ai_b_output_preview") or "未生成"
             },
             "audit_trail_count": len(result.get("audit_trail", [])),
             "total_cost": result.get("total_cost"),
             "error": result.get("error")
-        }
+        })
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"测试失败: {str(e)}")
 
 
 @router.post("/phase3-review")
-async def test_phase3_review():
+async def test_phase3_review(workflow: Pregel = Depends(get_workflow)):
     """测试Phase 3审查模式（完整流程）"""
     
-    workflow = get_workflow()
-    
     # 提供详细信息
-    initial_state = {
-        "task_id": str(uuid4()),
-        "user_id": "test-user",
-        "scene": "content-creation",
-        "user_input": """帮我写一篇关于AI Agent的科普文章。
-
-目标受众：对AI感兴趣但没有技术背景的普通读者（如产品经理、创业者、学生）
-文章目的：让读者理解AI Agent是什么、能做什么、未来趋势
-核心观点：AI Agent不是遥不可及的技术，而是即将改变工作方式的实用工具
-
-具体要求：
-1. 字数：800-1000字
-2. 结构：什么是AI Agent → 实际应用案例 → 未来展望
-3. 风格：通俗易懂，多用比喻和生活化例子，避免专业术语
-4. 案例：至少2个真实的AI Agent应用场景（如客服、个人助理）
-
-请按照这些要求创作文章。""",
-        "audit_trail": [],
-        "total_cost": 0.0
-    }
+    initial_state = _initial_state(
+        scene="content-creation",
+        user_input=_REVIEW_TEST_INPUT
+    )
     
     try:
         # 运行完整工作流
         result = await workflow.ainvoke(initial_state)
         
-        return {
+        return ORJSONResponse({
             "status": "success",
             "evaluation": {
                 "need_inquiry": result.get("need_inquiry"),
@@ -394,52 +423,32 @@ async def test_phase3_review():
             "collaboration": {
                 "rounds": len(result.get("debate_rounds", [])),
                 "stop_reason": result.get("stop_reason"),
-                "final_content_preview": result.get("ai_a_output", "")[:500] + "..." if result.get("ai_a_output") else "未生成",
-                "final_review_preview": result.get("ai_b_output", "")[:300] + "..." if result.get("ai_b_output") else "未生成"
+                "final_content_preview": result.get("ai_a_output_preview") or "未生成",
+                "final_review_preview": result.get("ai_b_output_preview") or "未生成"
             },
             "audit_trail_count": len(result.get("audit_trail", [])),
             "total_cost": result.get("total_cost"),
             "error": result.get("error")
-        }
+        })
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"测试失败: {str(e)}")
 
 
 @router.post("/full-workflow-debate")
-async def test_full_workflow_debate():
+async def test_full_workflow_debate(workflow: Pregel = Depends(get_workflow)):
     """测试完整工作流：评估→规划→辩论→整合"""
     
-    workflow = get_workflow()
-    
-    initial_state = {
-        "task_id": str(uuid4()),
-        "user_id": "test-user",
-        "scene": "topic-analysis",
-        "user_input": """我是技术博主，粉丝主要是25-35岁的程序员，对新技术感兴趣，技术水平在中高级。
-我的视频播放量稳定在5-10万，之前做过3期AI相关视频（GPT-4应用、Prompt工程、AI绘画），效果不错，评论互动活跃。
-
-现在我想做一期关于AI Agent的视频。具体方向是：从实战应用角度切入，展示如何用LangChain搭建一个简单的AI Agent，包括代码演示。
-目标受众认知水平：了解基本AI概念，但没有实际开发过AI Agent。
-视频时长：15-20分钟，深度适中，既有理论也有实战。
-
-我的核心目标是：
-1. 涨粉（争取播放量突破15万）
-2. 建立AI实战开发的专业形象
-3. 为后续的AI开发系列铺垫
-
-制作资源：时间充足（可以花2周准备），有完整的开发环境，视频剪辑技术熟练。
-
-请帮我分析这个选题的可行性，从内容深度和流量效果两个角度给建议。""",
-        "audit_trail": [],
-        "total_cost": 0.0
-    }
+    initial_state = _initial_state(
+        scene="topic-analysis",
+        user_input=_DEBATE_TEST_INPUT
+    )
     
     try:
         # 运行完整工作流
         result = await workflow.ainvoke(initial_state)
         
-        return {
+        return ORJSONResponse({
             "status": "success",
             "final_output": result.get("final_output"),
             "audit_summary": result.get("audit_summary"),
@@ -448,44 +457,26 @@ async def test_full_workflow_debate():
                 "collaboration_rounds": len(result.get("debate_rounds", [])),
                 "audit_trail_steps": len(result.get("audit_trail", []))
             }
-        }
+        })
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"完整工作流测试失败: {str(e)}")
 
 
 @router.post("/full-workflow-review")
-async def test_full_workflow_review():
+async def test_full_workflow_review(workflow: Pregel = Depends(get_workflow)):
     """测试完整工作流：评估→规划→审查→整合"""
     
-    workflow = get_workflow()
-    
-    initial_state = {
-        "task_id": str(uuid4()),
-        "user_id": "test-user",
-        "scene": "content-creation",
-        "user_input": """帮我写一篇关于AI Agent的科普文章。
-
-目标受众：对AI感兴趣但没有技术背景的普通读者（如产品经理、创业者、学生）
-文章目的：让读者理解AI Agent是什么、能做什么、未来趋势
-核心观点：AI Agent不是遥不可及的技术，而是即将改变工作方式的实用工具
-
-具体要求：
-1. 字数：800-1000字
-2. 结构：什么是AI Agent → 实际应用案例 → 未来展望
-3. 风格：通俗易懂，多用比喻和生活化例子，避免专业术语
-4. 案例：至少2个真实的AI Agent应用场景（如客服、个人助理）
-
-请按照这些要求创作文章。""",
-        "audit_trail": [],
-        "total_cost": 0.0
-    }
+    initial_state = _initial_state(
+        scene="content-creation",
+        user_input=_REVIEW_TEST_INPUT
+    )
     
     try:
         # 运行完整工作流
         result = await workflow.ainvoke(initial_state)
         
-        return {
+        return ORJSONResponse({
             "status": "success",
             "final_output": result.get("final_output"),
             "audit_summary": result.get("audit_summary"),
@@ -494,7 +485,104 @@ async def test_full_workflow_review():
                 "collaboration_rounds": len(result.get("debate_rounds", [])),
                 "audit_trail_steps": len(result.get("audit_trail", []))
             }
-        }
+        })
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"完整工作流测试失败: {str(e)}")
+
+
+# ========== 流式完整工作流 ==========
+
+_STREAM_SCENES: Final = {
+    "debate": ("topic-analysis", _DEBATE_TEST_INPUT),
+    "review": ("content-creation", _REVIEW_TEST_INPUT)
+}
+
+# 每个节点事件中推送的状态字段（完整状态过大，只推送前端关心的部分）
+_STREAM_KEYS: Final = (
+    "need_inquiry", "info_sufficiency", "inquiry_questions", "collaboration_mode",
+    "ai_a_role", "ai_b_role", "current_round", "should_stop", "stop_reason",
+    "final_output", "total_cost", "error"
+)
+
+
+async def _batched(chunks: AsyncIterator[bytes], max_size: int, interval: float) -> AsyncIterator[bytes]:
+    """
+    合并流式分片：攒够 max_size 个或距首个待发分片超过 interval 秒即写出
+    
+    ✅ 生产者单独运行，等待超时不会取消上游生成器；首个分片最多延迟 interval 秒
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    done = object()
+    
+    async def produce():
+        try:
+            async for chunk in chunks:
+                await queue.put(chunk)
+        finally:
+            await queue.put(done)
+    
+    producer = asyncio.create_task(produce())
+    loop = asyncio.get_running_loop()
+    try:
+        finished = False
+        while not finished:
+            item = await queue.get()
+            if item is done:
+                break
+            pending = [item]
+            deadline = loop.time() + interval
+            while len(pending) < max_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is done:
+                    finished = True
+                    break
+                pending.append(item)
+            yield b"".join(pending)
+        await producer  # 传播上游异常
+    finally:
+        producer.cancel()
+
+
+def _sse(event: str, data: dict) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
+@router.post("/full-workflow-stream")
+async def test_full_workflow_stream(
+    mode: Literal["debate", "review"] = "debate",
+    workflow: Pregel = Depends(get_workflow)
+):
+    """
+    流式完整工作流（SSE）：每个节点完成即推送一个事件
+    
+    事件：node（节点产出，含新增的审计记录）→ done / error
+    """
+    scene, user_input = _STREAM_SCENES[mode]
+    initial_state = _initial_state(scene=scene, user_input=user_input)
+    
+    async def events() -> AsyncIterator[bytes]:
+        try:
+            async for step in workflow.astream(initial_state):
+                for node, output in step.items():
+                    if not isinstance(output, dict):
+                        continue
+                    payload = {k: output[k] for k in _STREAM_KEYS if k in output}
+                    payload["node"] = node
+                    payload["audit"] = output.get("audit_trail") or []  # 节点只返回新增条目
+                    yield _sse("node", payload)
+            yield _sse("done", {"status": "success"})
+        except Exception as e:
+            yield _sse("error", {"detail": f"完整工作流测试失败: {str(e)}"})
+    
+    return StreamingResponse(
+        _batched(events(), settings.STREAM_BATCH_SIZE, settings.STREAM_FLUSH_INTERVAL),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,114 @@
+"""
+缓存模块
+USE_REDIS_CACHE=true 时使用Redis（多进程共享），否则使用进程内TTL缓存（单进程部署）
+"""
+import os
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Optional
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# ✅ Redis配置（生产环境启用）
+USE_REDIS = os.getenv("USE_REDIS_CACHE", "false").lower() == "true"
+
+if USE_REDIS:
+    import redis.asyncio as redis
+    redis_client = redis.Redis(
+        host=os.getenv("REDIS_HOST", "localhost"),
+        port=int(os.getenv("REDIS_PORT", 6379))
+    )
+
+
+class TTLCache:
+    """
+    进程内 TTL + LRU 缓存
+
+    - 读取时惰性淘汰过期项
+    - 超过 maxsize 时淘汰最久未使用的项
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            return default
+
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return default
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        self._data[key] = (time.monotonic() + (ttl or self.ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: str):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class JSONCache:
+    """
+    异步JSON缓存（带命名空间）
+
+    - Redis模式：值以orjson序列化，SET EX 过期
+    - 内存模式：直接保存对象（调用方不要修改取出的值）
+    - Redis异常时降级为缓存未命中，不影响主流程
+    """
+
+    def __init__(self, namespace: str, ttl: int = 60, maxsize: int = 1024):
+        self.namespace = namespace
+        self.ttl = ttl
+        if not USE_REDIS:
+            self._local = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    async def get(self, key: str) -> Optional[Any]:
+        if not USE_REDIS:
+            return self._local.get(key)
+
+        try:
+            raw = await redis_client.get(self._key(key))
+            return orjson.loads(raw) if raw is not None else None
+        except Exception as e:
+            logger.warning(f"缓存读取失败: key={self._key(key)}, error={e}")
+            return None
+
+    async def set(self, key: str, value: Any):
+        if not USE_REDIS:
+            self._local.set(key, value)
+            return
+
+        try:
+            await redis_client.set(self._key(key), orjson.dumps(value), ex=self.ttl)
+        except Exception as e:
+            logger.warning(f"缓存写入失败: key={self._key(key)}, error={e}")
+
+    async def delete(self, key: str):
+        if not USE_REDIS:
+            self._local.pop(key)
+            return
+
+        try:
+            await redis_client.delete(self._key(key))
+        except Exception as e:
+            logger.warning(f"缓存删除失败: key={self._key(key)}, error={e}")
@@ -1,5 +1,6 @@
-from pydantic_settings import BaseSettings
-from typing import List
+from functools import lru_cache
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from typing import List, Optional
 
 class Settings(BaseSettings):
     # 应用配置
@@ -14,6 +15,11 @@ class Settings(BaseSettings):
     SUPABASE_KEY: str
     SUPABASE_SERVICE_KEY: str
     
+    # Postgres直连（配置后热路径改用asyncpg连接池；经Supavisor连接时用事务模式端口）
+    SUPABASE_DB_URL: Optional[str] = None
+    DB_POOL_MIN_SIZE: int = 10
+    DB_POOL_MAX_SIZE: int = 50
+    
     # JWT配置
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
@@ -24,6 +30,28 @@ class Settings(BaseSettings):
     MOONSHOT_API_KEY: str
     QWEN_API_KEY: str
     
+    # LLM并发上限（所有AI调用共享，防止触发服务商限流）
+    LLM_MAX_CONCURRENCY: int = 8
+    
+    # LLM共享HTTP连接池（空闲连接保活时间要覆盖一轮协作中其他AI调用的耗时，否则下一轮要重新TLS握手）
+    LLM_MAX_CONNECTIONS: int = 50
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    LLM_KEEPALIVE_EXPIRY: float = 60.0
+    
+    # Phase 3 协作轮次在单个节点内循环执行（关闭后恢复逐轮经条件边自循环，便于单步调试）
+    PHASE3_INLINE_LOOP: bool = True
+    
+    # 测试接口限流（每个用户/IP每分钟最多触发的LLM请求数）
+    LLM_TEST_RATE_LIMIT: int = 5
+    
+    # 批量接口限流（每个用户/IP每分钟最多的批量请求数）与单个子请求超时（秒）
+    BATCH_RATE_LIMIT: int = 30
+    BATCH_SUBREQUEST_TIMEOUT: float = 60.0
+    
+    # 流式输出批量刷新（攒够N个事件或间隔到期即写出一次）
+    STREAM_BATCH_SIZE: int = 8
+    STREAM_FLUSH_INTERVAL: float = 0.05
+    
     # Redis配置
     REDIS_URL: str = "redis://localhost:6379"
     
@@ -35,8 +63,13 @@ class Settings(BaseSettings):
         "http://127.0.0.1:5173"
     ]
     
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+    # ✅ frozen：运行期不允许修改配置
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=True, frozen=True)
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """获取配置（✅ 进程内只读取一次 .env / 环境变量）"""
+    return Settings()
 
-settings = Settings()
+settings = get_settings()
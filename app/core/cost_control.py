@@ -1,6 +1,34 @@
-from typing import Callable
+from typing import Callable, Dict, Optional
+from contextvars import ContextVar
 from fastapi import HTTPException, status
 
+# ✅ 请求级LLM用量累加器（由中间件在请求开始时设置；未设置时记录为空操作）
+_request_usage: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_usage", default=None)
+
+
+def start_usage_tracking() -> Dict[str, float]:
+    """为当前请求上下文创建用量累加器（子任务继承上下文，共享同一个dict）"""
+    usage = {"calls": 0, "tokens": 0, "cost": 0.0}
+    _request_usage.set(usage)
+    return usage
+
+
+def record_usage(tokens: int, cost: float):
+    """累加一次LLM调用的用量到当前请求"""
+    usage = _request_usage.get()
+    if usage is not None:
+        usage["calls"] += 1
+        usage["tokens"] += tokens
+        usage["cost"] += cost
+
+
+# 估算单价（元/1K tokens）
+_ESTIMATE_RATES = {"meta": 0.0015, "ai_a": 0.012, "ai_b": 0.0018}
+
+# ✅ 预先折算为每字符单价：1个中文字符约2个token，输入+输出再×2，即每字符4个token
+_RATE_PER_CHAR = {ai_type: rate * 4 / 1000 for ai_type, rate in _ESTIMATE_RATES.items()}
+
+
 class CostController:
     """成本控制器"""
     
@@ -16,18 +44,8 @@ class CostController:
             )
     
     def estimate_cost(self, input_text: str, ai_type: str = "meta") -> float:
-        """估算成本（粗略估计）"""
-        # 粗略估算：1个中文字符约等于2个token
-        estimated_tokens = len(input_text) * 2 * 2  # 输入+输出
-        
-        if ai_type == "meta":
-            return (estimated_tokens / 1000) * 0.0015
-        elif ai_type == "ai_a":
-            return (estimated_tokens / 1000) * 0.012
-        elif ai_type == "ai_b":
-            return (estimated_tokens / 1000) * 0.0018
-        
-        return 0.0
+        """估算成本（粗略估计；未知 ai_type 返回0）"""
+        return len(input_text) * _RATE_PER_CHAR.get(ai_type, 0.0)
 
 
 # 创建全局成本控制器
@@ -3,6 +3,7 @@
 支持同步和异步Supabase客户端
 """
 import os
+from functools import lru_cache
 from supabase import create_client, Client
 
 # ✅ 配置
@@ -12,12 +13,13 @@ SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 if not SUPABASE_URL or not SUPABASE_KEY:
     raise ValueError("缺少 SUPABASE_URL 或 SUPABASE_KEY 环境变量")
 
-# 同步客户端（默认）
-_supabase_client: Client = None
-
+@lru_cache(maxsize=1)
 def get_supabase() -> Client:
     """
-    获取Supabase客户端（同步版本）
+    获取Supabase客户端（同步版本，进程内单例）
+    
+    ✅ 启动时在 lifespan 中预热，所有路由共享同一个客户端，
+    底层 PostgREST 的 httpx.Client 连接池（TCP/TLS）得以复用
     
     ⚠️ 注意：supabase-py 的默认 Client 内部使用 httpx.Client（同步）
     在异步环境中大量使用会阻塞事件循环
@@ -26,22 +28,15 @@ def get_supabase() -> Client:
     - 短期方案：在线程池中运行（见下方）
     - 长期方案：等待官方 AsyncClient 或使用 PostgREST 直接调用
     """
-    global _supabase_client
-    if _supabase_client is None:
-        _supabase_client = create_client(SUPABASE_URL, SUPABASE_KEY)
-    return _supabase_client
+    return create_client(SUPABASE_URL, SUPABASE_KEY)
 
-# ✅ 异步包装器（短期方案）
+# ✅ 异步包装器（未配置 SUPABASE_DB_URL 时的退路；热路径优先走 app.core.db_pool 的asyncpg连接池）
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
 
-# 线程池
-_executor = ThreadPoolExecutor(max_workers=10)
-
 def run_in_executor(func):
     """
-    装饰器：在线程池中运行同步函数
+    装饰器：在默认线程池中运行同步函数（asyncio.to_thread，不再单独维护线程池）
     
     使用示例：
     @run_in_executor
@@ -53,8 +48,7 @@ def run_in_executor(func):
     """
     @wraps(func)
     async def wrapper(*args, **kwargs):
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(_executor, func, *args, **kwargs)
+        return await asyncio.to_thread(func, *args, **kwargs)
     return wrapper
 
 # ✅ 使用示例（如果需要在task_service中使用）
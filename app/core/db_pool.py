@@ -0,0 +1,58 @@
+"""
+asyncpg 连接池
+配置 SUPABASE_DB_URL 时热路径（配额消耗/回滚、任务查询）直连Postgres，不再经过同步的 supabase-py；
+未配置时返回None，调用方退回 supabase-py + 线程池
+"""
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+import orjson
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_pool = None
+_pool_lock = asyncio.Lock()
+
+
+async def get_pool():
+    """
+    获取连接池（首次调用时创建，进程内单例）；未配置 SUPABASE_DB_URL 时返回None
+
+    ✅ statement_cache_size=0：经 Supavisor/pgbouncer（事务模式）连接时不能使用预编译语句缓存
+    """
+    global _pool
+    if _pool is not None or not settings.SUPABASE_DB_URL:
+        return _pool
+    async with _pool_lock:
+        if _pool is None:
+            import asyncpg
+            _pool = await asyncpg.create_pool(
+                dsn=settings.SUPABASE_DB_URL,
+                min_size=settings.DB_POOL_MIN_SIZE,
+                max_size=settings.DB_POOL_MAX_SIZE,
+                max_inactive_connection_lifetime=300,
+                command_timeout=60,
+                statement_cache_size=0
+            )
+            logger.info("asyncpg连接池已创建")
+    return _pool
+
+
+async def close_pool() -> None:
+    """关闭连接池（应用关闭时调用）"""
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+
+async def fetch_json_row(query: str, *args: Any) -> Optional[Dict[str, Any]]:
+    """
+    执行返回单行 jsonb 的查询并解析为dict（无结果返回None）
+
+    ✅ 查询中用 to_jsonb(row) 序列化，返回值与 PostgREST 的JSON完全一致（UUID/时间均为字符串），调用方无需区分来源
+    """
+    pool = await get_pool()
+    value = await pool.fetchval(query, *args)
+    return orjson.loads(value) if value is not None else None
@@ -3,37 +3,103 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Optional
 from uuid import UUID
 from datetime import datetime
+from weakref import WeakValueDictionary
 from app.models.user import UserResponse
-from app.core.database import get_supabase
-from datetime import datetime
+from app.core.cache import JSONCache, TTLCache
+from app.services.user_service import get_user_service
+from app.core.security import decode_access_token
+import asyncio
+import hashlib
 import os
 
 security = HTTPBearer(auto_error=False)
 
+# ✅ 认证缓存：token摘要 -> 用户ID，用户ID -> 用户行（60秒TTL，配额只需软一致）
+AUTH_CACHE_TTL = 60
+_token_cache = JSONCache("auth", ttl=AUTH_CACHE_TTL, maxsize=10000)
+_user_cache = JSONCache("u", ttl=AUTH_CACHE_TTL, maxsize=10000)
+
+# ✅ 进程内L1：用户ID -> 已构建的UserResponse（命中时连Redis读取和模型校验都省掉；调用方不要修改）
+USER_L1_TTL = 30
+_user_l1 = TTLCache(maxsize=10000, ttl=USER_L1_TTL)
+# 未命中时按用户加锁，同一用户的并发请求只查询一次（锁无人持有时自动回收）
+_user_miss_locks: "WeakValueDictionary[str, asyncio.Lock]" = WeakValueDictionary()
+
+
+async def invalidate_user_cache(user_id: str):
+    """用户数据变化（如配额）后清除缓存"""
+    _user_l1.pop(user_id)
+    await _user_cache.delete(user_id)
+
+
+async def cache_user(user_data: dict):
+    """写入最新的用户行（如消耗配额后返回的行），省去下次查询"""
+    user_id = str(user_data["id"])
+    _user_l1.pop(user_id)
+    await _user_cache.set(user_id, user_data)
+
+
+async def _load_user(user_id: str) -> UserResponse:
+    """按ID获取用户：L1 → 用户行缓存 → 数据库"""
+    user = _user_l1.get(user_id)
+    if user is not None:
+        return user
+    
+    lock = _user_miss_locks.get(user_id)
+    if lock is None:
+        lock = _user_miss_locks[user_id] = asyncio.Lock()
+    
+    async with lock:
+        # 等锁期间其他请求可能已经加载完成
+        user = _user_l1.get(user_id)
+        if user is not None:
+            return user
+        
+        # ✅ 缓存命中时跳过用户表查询
+        user_data = await _user_cache.get(user_id)
+        if user_data is None:
+            user_data = await get_user_service().get_user_by_id(user_id)
+            
+            if not user_data:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="用户不存在"
+                )
+            
+            await _user_cache.set(user_id, user_data)
+        
+        user = UserResponse(**user_data)
+        _user_l1.set(user_id, user)
+        return user
+
+# ✅ 运行环境只读取一次；开发模式测试用户在导入时构建，每次请求直接复用（调用方不要修改）
+ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
+
+_DEV_USER: Optional[UserResponse] = UserResponse(
+    id=UUID("541db2dc-6d6d-46c0-ba95-262f06ad3e9b"),
+    email="test@example.com",
+    name="测试用户",
+    avatar="",
+    subscription_tier="free",
+    tier="free",
+    daily_quota=10,
+    daily_used=0,
+    subscription_status="active",
+    total_tasks=0,
+    total_spent=0.0,
+    created_at=datetime.utcnow(),
+    last_login=datetime.utcnow()
+) if ENVIRONMENT == "development" else None
+
+
 async def get_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
 ) -> UserResponse:
     """获取当前登录用户（开发模式下可跳过认证）"""
     
     # 开发模式：使用测试用户
-    if os.getenv("ENVIRONMENT", "development") == "development":
-        if not credentials or not credentials.credentials:
-            # 返回测试用户
-            return UserResponse(
-                id=UUID("541db2dc-6d6d-46c0-ba95-262f06ad3e9b"),
-                email="test@example.com",
-                name="测试用户",
-                avatar="",
-                subscription_tier="free",
-                tier="free",
-                daily_quota=10,
-                daily_used=0,
-                subscription_status="active",      # ← 补这行
-                total_tasks=0,                     # ← 补这行
-                total_spent=0.0,                   # ← 补这行
-                created_at=datetime.utcnow(),
-                last_login=datetime.utcnow()
-            )
+    if _DEV_USER is not None and not (credentials and credentials.credentials):
+        return _DEV_USER
     
     # 生产模式：验证token
     if not credentials:
@@ -45,30 +111,29 @@ async def get_current_user(
     
     token = credentials.credentials
     
+    # ✅ 本服务签发的JWT（/auth/login、/auth/register）本地验签，验签结果按token缓存到过期，不再请求Supabase Auth
+    payload = decode_access_token(token)
+    if payload is not None and payload.get("sub"):
+        return await _load_user(payload["sub"])
+    
     try:
-        supabase = get_supabase()
-        
-        # 使用Supabase验证token
-        user_response = supabase.auth.get_user(token)
-        if not user_response.user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="无效的认证凭据",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        
-        user_id = user_response.user.id
-        
-        # 查询用户信息
-        result = supabase.table("users").select("*").eq("id", user_id).single().execute()
+        user_service = get_user_service()
+        token_key = hashlib.sha256(token.encode()).hexdigest()
         
-        if not result.data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="用户不存在"
-            )
+        # ✅ 缓存命中时跳过Supabase Auth验证
+        user_id = await _token_cache.get(token_key)
+        if user_id is None:
+            # 使用Supabase验证token
+            user_id = await user_service.get_auth_user_id(token)
+            if not user_id:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="无效的认证凭据",
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
+            await _token_cache.set(token_key, user_id)
         
-        return UserResponse(**result.data)
+        return await _load_user(user_id)
         
     except HTTPException:
         raise
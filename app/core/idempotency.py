@@ -0,0 +1,141 @@
+"""
+幂等键处理
+客户端在 Idempotency-Key 头中携带同一个键重试时，直接回放首次请求的响应，不再重复扣配额、建任务
+同一个键配上不同的请求体视为客户端错误（422），不回放
+USE_REDIS_CACHE=true 时记录保存在Redis（多进程共享），否则进程内保存
+"""
+import hashlib
+import logging
+from typing import Any, Dict, Optional
+import orjson
+from fastapi import Depends, Header, HTTPException, Request, status
+from fastapi.responses import ORJSONResponse
+from app.core import cache
+from app.core.cache import TTLCache
+from app.core.dependencies import get_current_active_user
+from app.models.user import UserResponse
+
+logger = logging.getLogger(__name__)
+
+# 幂等记录保留时间（秒）：覆盖客户端/网关的重试窗口
+IDEMPOTENCY_TTL = 600
+
+
+_local_records = TTLCache(maxsize=10000, ttl=IDEMPOTENCY_TTL)
+
+
+class IdempotentRequest:
+    """
+    一次带幂等键的请求
+
+    - replay 不为None：相同键的请求已完成，路由直接返回它
+    - 否则路由正常处理，成功后调用 complete 保存响应；路由在 finally 中调用 release，
+      未 complete 的请求（失败、被取消）删除占位值，允许客户端用同一个键重试
+    - 请求未带幂等键时 complete/release 均为空操作
+    """
+
+    def __init__(self, key: Optional[str] = None, replay: Optional[ORJSONResponse] = None, fingerprint: str = ""):
+        self.key = key
+        self.replay = replay
+        self.fingerprint = fingerprint  # 请求体摘要，随记录保存
+        self._settled = False
+
+    async def complete(self, body: Any, status_code: int) -> None:
+        """保存最终响应（覆盖占位值）"""
+        if self.key is None or self._settled:
+            return
+        self._settled = True
+        record = {"fp": self.fingerprint, "status_code": status_code, "body": body}
+        if not cache.USE_REDIS:
+            _local_records.set(self.key, record)
+            return
+        try:
+            await cache.redis_client.set(self.key, orjson.dumps(record), ex=IDEMPOTENCY_TTL)
+        except Exception as e:
+            logger.warning(f"幂等记录写入失败: key={self.key}, error={e}")
+
+    async def release(self) -> None:
+        """删除占位值（请求失败/被取消，不缓存错误响应）；已 complete 或已释放时为空操作"""
+        if self.key is None or self._settled:
+            return
+        self._settled = True
+        if not cache.USE_REDIS:
+            _local_records.pop(self.key)
+            return
+        try:
+            await cache.redis_client.delete(self.key)
+        except Exception as e:
+            logger.warning(f"幂等记录删除失败: key={self.key}, error={e}")
+
+
+def _replay(record: Dict[str, Any]) -> ORJSONResponse:
+    return ORJSONResponse(
+        record["body"],
+        status_code=record["status_code"],
+        headers={"Idempotent-Replayed": "true"}
+    )
+
+
+def _mismatch() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        detail="Idempotency-Key 已用于内容不同的请求，请为新请求使用新的键"
+    )
+
+
+def _resolve(record: Dict[str, Any], fingerprint: str) -> IdempotentRequest:
+    """已有记录：请求体不一致 → 422；首个请求未完成 → 409；否则回放"""
+    if record.get("fp") != fingerprint:
+        raise _mismatch()
+    if record.get("pending"):
+        raise _in_progress()
+    return IdempotentRequest(replay=_replay(record))
+
+
+def _in_progress() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="相同请求正在处理中，请稍后重试",
+        headers={"Retry-After": "1"}
+    )
+
+
+async def idempotency(
+    request: Request,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    current_user: UserResponse = Depends(get_current_active_user)
+) -> IdempotentRequest:
+    """
+    FastAPI依赖：抢占幂等键（SET NX + 过期时间）
+
+    ✅ 键按 用户 + 路径 + Idempotency-Key 摘要区分，不同用户/接口之间互不影响
+    ✅ 记录中保存请求体摘要，同一个键配不同请求体时返回422，而不是回放无关的响应
+    ✅ Redis异常时降级为不做幂等处理，不影响主流程
+    """
+    if not idempotency_key:
+        return IdempotentRequest()
+
+    digest = hashlib.sha256(f"{current_user.id}:{request.url.path}:{idempotency_key}".encode()).hexdigest()[:32]
+    key = f"idem:{digest}"
+    fingerprint = hashlib.sha256(await request.body()).hexdigest()
+    pending = {"fp": fingerprint, "pending": True}
+
+    if not cache.USE_REDIS:
+        record = _local_records.get(key)
+        if record is None:
+            _local_records.set(key, pending)
+            return IdempotentRequest(key, fingerprint=fingerprint)
+        return _resolve(record, fingerprint)
+
+    try:
+        if await cache.redis_client.set(key, orjson.dumps(pending), nx=True, ex=IDEMPOTENCY_TTL):
+            return IdempotentRequest(key, fingerprint=fingerprint)
+        raw = await cache.redis_client.get(key)
+    except Exception as e:
+        logger.warning(f"幂等键检查失败: key={key}, error={e}")
+        return IdempotentRequest()
+
+    if raw is None:
+        # 首个请求刚失败释放了键：本次按新请求处理（不再抢占，交给客户端下次重试）
+        return IdempotentRequest()
+    return _resolve(orjson.loads(raw), fingerprint)
@@ -0,0 +1,69 @@
+"""
+限流模块
+固定窗口计数：USE_REDIS_CACHE=true 时使用Redis（多进程共享），否则进程内计数
+"""
+import time
+from typing import Dict, Tuple
+from fastapi import Request, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials
+from app.core import cache
+from app.core.dependencies import get_current_user
+
+
+class RateLimiter:
+    """
+    固定窗口限流器（FastAPI依赖）
+
+    - Bearer token 验证通过时按用户ID区分，否则（无token/无效token）按客户端IP
+      （不能按token原文区分：每次换一个随机token就能拿到新的计数窗口）
+    - 超限返回 429 + Retry-After
+    """
+
+    MAX_TRACKED_KEYS = 10000
+
+    def __init__(self, times: int, seconds: int = 60, namespace: str = "rl"):
+        self.times = times
+        self.seconds = seconds
+        self.namespace = namespace
+        self._windows: Dict[str, Tuple[int, int]] = {}  # key -> (窗口编号, 计数)
+
+    async def _identify(self, request: Request) -> str:
+        scheme, _, token = request.headers.get("authorization", "").partition(" ")
+        if scheme.lower() == "bearer" and token:
+            try:
+                # ✅ 与业务接口同一套验证（带token缓存）
+                user = await get_current_user(HTTPAuthorizationCredentials(scheme=scheme, credentials=token))
+                return f"u:{user.id}"
+            except HTTPException:
+                pass
+        return "ip:" + (request.client.host if request.client else "unknown")
+
+    async def _hit(self, key: str, window: int) -> int:
+        if cache.USE_REDIS:
+            redis_key = f"{self.namespace}:{key}:{window}"
+            # ✅ 创建计数与设置过期在同一个事务中完成，不会留下没有TTL的计数
+            async with cache.redis_client.pipeline(transaction=True) as pipe:
+                pipe.set(redis_key, 0, nx=True, ex=self.seconds)
+                pipe.incr(redis_key)
+                _, count = await pipe.execute()
+            return count
+
+        # ✅ 防止内存无限增长：超过上限时丢弃过期窗口
+        if len(self._windows) > self.MAX_TRACKED_KEYS:
+            self._windows = {k: v for k, v in self._windows.items() if v[0] == window}
+
+        current_window, count = self._windows.get(key, (window, 0))
+        count = count + 1 if current_window == window else 1
+        self._windows[key] = (window, count)
+        return count
+
+    async def __call__(self, request: Request):
+        window = int(time.time() // self.seconds)
+        count = await self._hit(await self._identify(request), window)
+
+        if count > self.times:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="请求过于频繁，请稍后重试",
+                headers={"Retry-After": str(self.seconds)}
+            )
@@ -0,0 +1,34 @@
+"""
+路由扩展
+ORJSONRoute：请求体用orjson解析（C实现），替代Starlette默认的标准库json
+"""
+from typing import Any, Callable, Coroutine
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+import orjson
+
+
+class ORJSONRequest(Request):
+    """用orjson解析JSON请求体的Request"""
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            # orjson.JSONDecodeError 是 json.JSONDecodeError 的子类，FastAPI照常返回422
+            self._json = orjson.loads(await self.body())
+        return self._json
+
+
+class ORJSONRoute(APIRoute):
+    """
+    路由类：请求体以orjson解析
+
+    用法：APIRouter(route_class=ORJSONRoute)
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        original_handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            return await original_handler(ORJSONRequest(request.scope, request.receive))
+
+        return route_handler
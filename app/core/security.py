@@ -1,18 +1,50 @@
 from datetime import datetime, timedelta
 from typing import Optional
-from jose import JWTError, jwt
+import jwt
+import asyncio
+import base64
+import hashlib
+import time
 import bcrypt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
 from app.core.config import settings
+from app.core.cache import TTLCache
+
+# ✅ 新密码统一用Argon2id（C实现，计算期间释放GIL；参数取OWASP推荐的 19MiB / 2轮 / 单线程）
+_argon2 = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1)
+
+_ARGON2_PREFIX = "$argon2"
+
+def _prehash(password: str) -> bytes:
+    """
+    SHA-256预哈希（base64编码，固定44字节）
+    
+    ✅ bcrypt只取前72字节：预哈希后长密码不再被截断，也不含bcrypt不接受的NUL字节
+    """
+    return base64.b64encode(hashlib.sha256(password.encode('utf-8')).digest())
 
 def verify_password(plain_password: str, hashed: str) -> bool:
-    """验证密码"""
-    return bcrypt.checkpw(plain_password.encode()[:72], hashed.encode())
+    """验证密码（按哈希前缀区分：$argon2 为Argon2，其余为已有的bcrypt哈希）"""
+    if hashed.startswith(_ARGON2_PREFIX):
+        try:
+            return _argon2.verify(hashed, plain_password)
+        except (VerificationError, InvalidHashError):
+            return False
+    return bcrypt.checkpw(_prehash(plain_password), hashed.encode())
 
 def get_password_hash(password: str) -> str:
-    """加密密码"""
-    pwd_bytes = password.encode('utf-8')[:72]          # 硬性截断
-    salt = bcrypt.gensalt()
-    return bcrypt.hashpw(pwd_bytes, salt).decode()
+    """加密密码（Argon2无72字节限制，不需要预哈希；bcrypt只用于验证已有哈希）"""
+    return _argon2.hash(password)
+
+# ✅ bcrypt/Argon2每次都是几十到几百毫秒的CPU计算，异步接口中放到线程执行，避免阻塞事件循环
+async def verify_password_async(plain_password: str, hashed: str) -> bool:
+    """验证密码（异步）"""
+    return await asyncio.to_thread(verify_password, plain_password, hashed)
+
+async def get_password_hash_async(password: str) -> str:
+    """加密密码（异步）"""
+    return await asyncio.to_thread(get_password_hash, password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """创建访问令牌"""
@@ -26,10 +58,19 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
+# ✅ 已验证令牌的解码结果：令牌在过期前内容不变，同一令牌的后续请求跳过签名校验
+# 每项的TTL就是令牌剩余有效期，过期后自动失效；校验失败的令牌不缓存
+_decoded_tokens = TTLCache(maxsize=10000, ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
 def decode_access_token(token: str) -> Optional[dict]:
-    """解码访问令牌"""
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
-    except JWTError:
-        return None
+    """解码访问令牌（无效或已过期返回None；返回副本，调用方可以修改）"""
+    payload = _decoded_tokens.get(token)
+    if payload is None:
+        try:
+            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        except jwt.PyJWTError:
+            return None
+        remaining = payload["exp"] - time.time() if "exp" in payload else None
+        if remaining is None or remaining > 0:
+            _decoded_tokens.set(token, payload, ttl=remaining)
+    return dict(payload)
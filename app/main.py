@@ -1,29 +1,79 @@
 from dotenv import load_dotenv
 load_dotenv()  # 加载环境变量
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.core.database import get_supabase
+from app.core.db_pool import get_pool, close_pool
+from app.core.cost_control import start_usage_tracking
+from app.services.langgraph.workflow import get_workflow
+from app.services.ai_client import close_http_client
+from app.services.ai_manager import get_ai_manager
+from app.services.ai_batcher import USE_LLM_BATCHER, get_llm_batcher
 from socketio import ASGIApp
 from fastapi import Request
 import time
+import logging
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    应用生命周期
+    
+    ✅ 启动时预热共享资源（避免首个请求承担客户端构建开销）
+    """
+    app.state.supabase = get_supabase()
+    await get_pool()  # 未配置 SUPABASE_DB_URL 时不创建
+    app.state.workflow = get_workflow()
+    app.state.ai_manager = get_ai_manager()
+    if USE_LLM_BATCHER:
+        get_llm_batcher().start()
+    yield
+    if USE_LLM_BATCHER:
+        await get_llm_batcher().stop()
+    # ✅ 关闭时释放AI调用的共享连接池
+    await close_http_client()
+    await close_pool()
+
 
 # 创建FastAPI应用
 app = FastAPI(
     title=settings.APP_NAME,
     description="多AI协作决策助手API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse  # ✅ orjson序列化（C实现）
 )
 
-# ===== 万能日志（临时调试）=====
+# ===== 请求日志 =====
+# ✅ DEBUG级别才输出（生产环境为INFO，热路径上只剩一次级别判断）
+logging.basicConfig(level=logging.INFO)
+http_logger = logging.getLogger("http")
+http_logger.setLevel(logging.DEBUG if settings.DEBUG else logging.INFO)
+
 @app.middleware("http")
 async def log_every_request(request: Request, call_next):
-    start = time.time()
-    print(f"[DEBUG] {request.method} {request.url}")
+    # ✅ 请求级LLM用量累加器始终开启（与日志级别无关），请求结束时汇总一次
+    usage = start_usage_tracking()
+    start = time.perf_counter()
     response = await call_next(request)
-    print(f"[DEBUG] {request.method} {request.url}  status={response.status_code}  duration={time.time()-start:.3f}s")
+    
+    if usage["calls"]:
+        http_logger.info(
+            "%s %s llm_calls=%d llm_tokens=%d llm_cost=%.4f",
+            request.method, request.url.path, usage["calls"], usage["tokens"], usage["cost"]
+        )
+    if http_logger.isEnabledFor(logging.DEBUG):
+        http_logger.debug(
+            "%s %s status=%s duration=%.3fs",
+            request.method, request.url.path, response.status_code, time.perf_counter() - start
+        )
     return response
-# ===== 万能日志结束 =====
+# ===== 请求日志结束 =====
 
 # CORS配置
 app.add_middleware(
@@ -49,15 +99,11 @@ async def health_check():
     return {"status": "ok"}
 
 # 导入路由
-from app.api import test, auth, users, ai_test, workflow_test, tasks
-
-# 注册路由
-app.include_router(test.router, prefix="/api")
-app.include_router(auth.router, prefix="/api")
-app.include_router(users.router, prefix="/api")
-app.include_router(ai_test.router, prefix="/api")
-app.include_router(workflow_test.router, prefix="/api")
-app.include_router(tasks.router, prefix="/api")
+from app.api import test, auth, users, ai_test, workflow_test, tasks, batch
+
+# 注册路由（✅ 每个模块只注册一次）
+for module in (test, auth, users, ai_test, workflow_test, tasks, batch):
+    app.include_router(module.router, prefix="/api")
 
 # 集成Socket.IO（必须在路由注册之后）
 from app.services.socket_manager import socket_manager
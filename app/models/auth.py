@@ -1,11 +1,15 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
 
 class UserRegister(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+    
     email: EmailStr
     password: str
     name: str
 
 class UserLogin(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+    
     email: EmailStr
     password: str
 
@@ -1,11 +1,15 @@
-from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from pydantic import BaseModel, ConfigDict
+from typing import Optional, Dict, Any, Literal
 from datetime import datetime
 from uuid import UUID
 
 class TaskCreate(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+    
     scene: str
     user_input: str
+    # 显式指定协作模式（不指定时由规划AI在 debate/review 中选择；成本翻倍的 both 只能由此开启）
+    collaboration_mode: Optional[Literal["debate", "review", "both"]] = None
 
 class TaskResponse(BaseModel):
     id: UUID
@@ -0,0 +1,154 @@
+"""
+LLM请求微批处理
+USE_LLM_BATCHER=true 时启用：时间窗口内的并发请求合并调度，完全相同的请求只调用一次服务商
+"""
+import os
+import asyncio
+import logging
+from contextlib import suppress
+from typing import Any, Dict, List, Optional, Set, Tuple
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# ✅ 默认关闭（相同请求会拿到同一份结果，temperature>0 时失去随机性）
+USE_LLM_BATCHER = os.getenv("USE_LLM_BATCHER", "false").lower() == "true"
+
+
+class LLMBatcher:
+    """
+    动态批处理器（参考 DynBatcher）
+
+    - chat 调用提交 (payload, Future) 到有界队列，队列满时调用方等待（背压）
+    - 后台任务每 max_delay 秒或攒够 max_batch 个请求时取出一批
+    - 同一批内 (服务商, 模型, messages, 参数) 完全相同的请求合并为一次调用，结果分发给所有等待者
+      （只有仍在等待的第一个等待者的结果带成本/用量，其余为0并标记 coalesced；等待者全部取消时取消调用）
+    - OpenAI兼容接口不支持多prompt批量，不同请求以并发调用代替
+    """
+
+    def __init__(self, max_batch: int = 8, max_delay: float = 0.05, max_queue: int = 256):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self._worker: Optional[asyncio.Task] = None
+        self._inflight: Set[asyncio.Task] = set()  # 持有引用，防止调用任务被GC
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    def start(self):
+        """启动后台调度任务（在lifespan中调用）"""
+        if not self.running:
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """停止调度并等待已发出的调用完成"""
+        if self._worker is not None:
+            self._worker.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._worker
+            self._worker = None
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+
+    async def submit(self, client, messages: List[Dict[str, str]], **kwargs) -> Dict[str, Any]:
+        """提交一次chat请求并等待结果；未启动时直接调用"""
+        if not self.running:
+            return await client._chat(messages, **kwargs)
+
+        key = (
+            client.name,
+            client.model,
+            orjson.dumps(messages),
+            orjson.dumps(kwargs, option=orjson.OPT_SORT_KEYS)
+        )
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((key, client, messages, kwargs, future))
+        return await future
+
+    async def _collect(self) -> List[Tuple]:
+        """取出一批请求：等到第一个请求后，最多再等 max_delay 秒或凑满 max_batch"""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_delay
+
+        while len(batch) < self.max_batch:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+
+            # 合并完全相同的请求
+            groups: Dict[Tuple, Tuple[Any, List, Dict, List[asyncio.Future]]] = {}
+            for key, client, messages, kwargs, future in batch:
+                if key in groups:
+                    groups[key][3].append(future)
+                else:
+                    groups[key] = (client, messages, kwargs, [future])
+
+            if len(groups) < len(batch):
+                logger.debug(f"LLM批处理合并: {len(batch)} 个请求 -> {len(groups)} 次调用")
+
+            # ✅ 不在调度循环里等待服务商响应，避免阻塞下一批
+            for client, messages, kwargs, futures in groups.values():
+                task = asyncio.create_task(self._execute(client, messages, kwargs, futures))
+                self._inflight.add(task)
+                task.add_done_callback(self._inflight.discard)
+
+    @staticmethod
+    async def _execute(client, messages: List[Dict[str, str]], kwargs: Dict[str, Any], futures: List[asyncio.Future]):
+        if all(future.done() for future in futures):
+            return  # 排队期间等待者都已取消，不再调用服务商
+
+        # ✅ 所有等待者都取消后取消这次调用，不再为没人要的结果付费
+        task = asyncio.current_task()
+
+        def _on_waiter_done(_):
+            if all(future.cancelled() for future in futures):
+                task.cancel()
+
+        for future in futures:
+            future.add_done_callback(_on_waiter_done)
+
+        try:
+            result = await client._chat(messages, **kwargs)
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        except BaseException:
+            # ✅ 调用被取消（如 stop）时同时取消等待者，不让它们永远挂起
+            for future in futures:
+                future.cancel()
+            raise
+
+        # ✅ 服务商只调用了一次：仍在等待的第一个等待者承担成本，其余拿到成本/用量为0的副本，各任务累计成本时不会重复计算
+        waiting = [future for future in futures if not future.done()]
+        if not waiting:
+            return
+        first, *duplicates = waiting
+        first.set_result(result)
+        for future in duplicates:
+            future.set_result({
+                **result,
+                "tokens": {"prompt": 0, "completion": 0, "total": 0},
+                "cost": 0.0,
+                "coalesced": True
+            })
+
+# 创建全局批处理器实例
+llm_batcher = LLMBatcher()
+
+def get_llm_batcher() -> LLMBatcher:
+    """获取LLM批处理器实例"""
+    return llm_batcher
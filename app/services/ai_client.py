@@ -1,13 +1,75 @@
-from typing import List, Dict, Any, Optional
-from openai import OpenAI
+from typing import List, Dict, Any, Optional, Callable
+from functools import lru_cache
+from openai import AsyncOpenAI
 from app.core.config import settings
+from app.core.cost_control import record_usage
+from app.services.ai_batcher import USE_LLM_BATCHER, get_llm_batcher
+from app.services.langgraph.nodes._jsonutil import extract_json
+import httpx
+import importlib.util
+import orjson
 import time
 
+# ✅ 所有AI客户端共享一个HTTP连接池（复用TCP/TLS连接，避免每个客户端各建一个池）
+_http_client: Optional[httpx.AsyncClient] = None
+
+# LLM请求超时（秒）与SDK自动重试次数
+LLM_TIMEOUT = 30.0
+LLM_MAX_RETRIES = 2
+
+# ✅ HTTP/2：同一服务商的并发请求复用一条连接（需要 h2，即 httpx[http2]；未安装时退回HTTP/1.1）
+HTTP2_ENABLED = importlib.util.find_spec("h2") is not None
+
+def get_http_client() -> httpx.AsyncClient:
+    """获取共享HTTP客户端（延迟初始化）"""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            http2=HTTP2_ENABLED,
+            timeout=LLM_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=settings.LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+                # ✅ httpx默认空闲5秒即断开；LLM单次调用常超过5秒，其间空闲的连接会被回收
+                keepalive_expiry=settings.LLM_KEEPALIVE_EXPIRY
+            )
+        )
+    return _http_client
+
+async def close_http_client():
+    """关闭共享HTTP客户端（应用关闭时调用）"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+def _is_valid_json(text: str) -> bool:
+    try:
+        orjson.loads(text)
+        return True
+    except orjson.JSONDecodeError:
+        return False
+
+
+def _estimate_tokens(text: str) -> int:
+    """粗略估算token数：非ASCII字符（中文）约1 token/字，ASCII约4字符/token"""
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    return non_ascii + (len(text) - non_ascii + 3) // 4
+
+
 class AIClient:
     """AI客户端基类"""
     
     def __init__(self, api_key: str, base_url: str, model: str, name: str):
-        self.client = OpenAI(api_key=api_key, base_url=base_url)
+        # ✅ 异步客户端：LLM往返期间不阻塞事件循环，可与其他请求/调用并发
+        self.client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            timeout=LLM_TIMEOUT,
+            max_retries=LLM_MAX_RETRIES,
+            http_client=get_http_client()
+        )
         self.model = model
         self.name = name
         self.total_tokens = 0
@@ -19,18 +81,35 @@ class AIClient:
         temperature: float = 0.7,
         max_tokens: Optional[int] = None
     ) -> Dict[str, Any]:
-        """发送聊天请求"""
+        """发送聊天请求（启用批处理时经由LLMBatcher调度）"""
+        if USE_LLM_BATCHER:
+            result = await get_llm_batcher().submit(self, messages, temperature=temperature, max_tokens=max_tokens)
+        else:
+            result = await self._chat(messages, temperature=temperature, max_tokens=max_tokens)
+        
+        # ✅ 在调用方上下文中累计当前请求用量（批处理时 _chat 运行在后台任务里，看不到请求的累加器）
+        if not result.get("coalesced"):
+            record_usage(result["tokens"]["total"], result["cost"])
+        return result
+    
+    async def _chat(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """实际调用服务商接口"""
         try:
-            start_time = time.time()
+            start_time = time.perf_counter()
             
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=messages,
                 temperature=temperature,
                 max_tokens=max_tokens
             )
             
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
             
             # 提取响应
             content = response.choices[0].message.content
@@ -39,7 +118,7 @@ class AIClient:
             # 计算成本
             cost = self._calculate_cost(usage.prompt_tokens, usage.completion_tokens)
             
-            # 更新统计
+            # 更新实例累计（当前请求累计由 chat 记录）
             self.total_tokens += usage.total_tokens
             self.total_cost += cost
             
@@ -59,6 +138,113 @@ class AIClient:
         except Exception as e:
             raise Exception(f"{self.name} 调用失败: {str(e)}")
     
+    async def chat_stream(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        on_delta: Optional[Callable[[str, List[str]], Optional[str]]] = None
+    ) -> Dict[str, Any]:
+        """
+        流式请求：每收到一段文本调用 on_delta(本段文本, 已收到的全部片段)
+        
+        on_delta 返回非None的字符串时立即断开流，并以该字符串作为最终 content（用于提前截取结果）
+        ✅ 返回结构与 chat() 相同
+        注：流式请求不经过LLMBatcher；提前断开时服务商不返回usage，tokens按字符数估算
+        """
+        try:
+            start_time = time.perf_counter()
+            
+            stream = await self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True
+            )
+            
+            parts: List[str] = []
+            final_content: Optional[str] = None
+            chunk_count = 0
+            usage = None
+            try:
+                async for chunk in stream:
+                    # 部分服务商（如DeepSeek）在最后一个chunk附带usage，Moonshot放在choice里
+                    usage = getattr(chunk, "usage", None) or usage
+                    if not chunk.choices:
+                        continue
+                    usage = getattr(chunk.choices[0], "usage", None) or usage
+                    delta = chunk.choices[0].delta.content
+                    if not delta:
+                        continue
+                    parts.append(delta)
+                    chunk_count += 1
+                    if on_delta is not None:
+                        final_content = on_delta(delta, parts)
+                        if final_content is not None:
+                            break
+            finally:
+                await stream.close()
+            
+            duration = time.perf_counter() - start_time
+            content = final_content if final_content is not None else "".join(parts)
+            
+            if isinstance(usage, dict):
+                prompt_tokens, completion_tokens = usage["prompt_tokens"], usage["completion_tokens"]
+            elif usage is not None:
+                prompt_tokens, completion_tokens = usage.prompt_tokens, usage.completion_tokens
+            else:
+                # 每个chunk约一个token；prompt按字符数估算
+                prompt_tokens = sum(_estimate_tokens(m.get("content") or "") for m in messages)
+                completion_tokens = chunk_count
+            total_tokens = prompt_tokens + completion_tokens
+            
+            # 计算成本
+            cost = self._calculate_cost(prompt_tokens, completion_tokens)
+            
+            # 更新统计（实例累计 + 当前请求累计）
+            self.total_tokens += total_tokens
+            self.total_cost += cost
+            record_usage(total_tokens, cost)
+            
+            return {
+                "content": content,
+                "tokens": {
+                    "prompt": prompt_tokens,
+                    "completion": completion_tokens,
+                    "total": total_tokens
+                },
+                "cost": cost,
+                "duration": duration,
+                "model": self.model,
+                "ai_name": self.name
+            }
+            
+        except Exception as e:
+            raise Exception(f"{self.name} 调用失败: {str(e)}")
+    
+    async def chat_json(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        流式请求JSON结果：第一个完整的JSON对象一闭合就断开流，省去模型在JSON之后的多余输出
+        
+        ✅ 返回结构与 chat() 相同（content 为截取到的JSON文本）
+        """
+        def stop_at_json(delta: str, parts: List[str]) -> Optional[str]:
+            # 只有出现右括号时才可能闭合，避免每个chunk都扫描
+            if "}" not in delta:
+                return None
+            json_text = extract_json("".join(parts))
+            if json_text is not None and _is_valid_json(json_text):
+                return json_text
+            return None
+        
+        return await self.chat_stream(messages, temperature=temperature, max_tokens=max_tokens, on_delta=stop_at_json)
+    
     def _calculate_cost(self, prompt_tokens: int, completion_tokens: int) -> float:
         """计算成本（需要子类实现具体定价）"""
         raise NotImplementedError("子类必须实现此方法")
@@ -130,4 +316,21 @@ class QwenClient(AIClient):
         """
         input_cost = (prompt_tokens / 1000) * 0.0008
         output_cost = (completion_tokens / 1000) * 0.002
-        return input_cost + output_cost
\ No newline at end of file
+        return input_cost + output_cost
+
+
+# ✅ 客户端单例（每个服务商只构建一次，共享连接池）
+@lru_cache(maxsize=1)
+def get_deepseek_client() -> DeepSeekClient:
+    """获取DeepSeek客户端单例"""
+    return DeepSeekClient()
+
+@lru_cache(maxsize=1)
+def get_moonshot_client() -> MoonshotClient:
+    """获取Moonshot客户端单例"""
+    return MoonshotClient()
+
+@lru_cache(maxsize=1)
+def get_qwen_client() -> QwenClient:
+    """获取Qwen客户端单例"""
+    return QwenClient()
@@ -12,6 +12,7 @@ import os
 from typing import List, Dict, Any, Optional
 import time
 import asyncio
+import random
 from functools import wraps
 
 # 版本开关配置
@@ -82,8 +83,9 @@ def retry_on_connection_error(max_retries: int = 3, delay: float = 1.0):
                 except Exception as e:
                     last_exception = e
                     if attempt < max_retries:
-                        wait_time = delay * (2 ** attempt)  # 指数退避
-                        print(f"[RETRY] 第{attempt + 1}次重试，等待{wait_time}秒: {str(e)}")
+                        # 指数退避 + 全抖动（下限0.1秒）
+                        wait_time = max(random.uniform(0, delay * (2 ** attempt)), 0.1)
+                        print(f"[RETRY] 第{attempt + 1}次重试，等待{wait_time:.2f}秒: {str(e)}")
                         await asyncio.sleep(wait_time)
                         metrics.increment_retry()
                     else:
@@ -1,8 +1,10 @@
 from typing import List, Dict, Any, Optional
-from openai import OpenAI
+from openai import AsyncOpenAI
 from app.core.config import settings
+from app.services.ai_client import get_http_client
 import time
 import asyncio
+import random
 import httpx
 from functools import wraps
 import logging
@@ -21,7 +23,8 @@ def retry_on_connection_error(max_retries: int = 3, delay: float = 1.0):
                 except (httpx.RemoteProtocolError, httpx.ConnectError, httpx.ReadTimeout) as e:
                     last_exception = e
                     if attempt < max_retries - 1:
-                        wait_time = delay * (2 ** attempt)  # 指数退避
+                        # ✅ 全抖动指数退避：多个worker同时被限流时不会在同一时刻集中重试；下限0.1秒
+                        wait_time = max(random.uniform(0, delay * (2 ** attempt)), 0.1)
                         logger.warning(
                             f"AI服务连接失败，{wait_time:.1f}秒后重试 (尝试 {attempt + 1}/{max_retries}): {str(e)}"
                         )
@@ -36,6 +39,85 @@ def retry_on_connection_error(max_retries: int = 3, delay: float = 1.0):
         return wrapper
     return decorator
 
+class CircuitOpenError(Exception):
+    """断路器打开时快速失败（不发起请求，也不进入重试退避）"""
+
+
+class CircuitBreaker:
+    """
+    按服务商共享的断路器
+
+    - closed：正常放行；连续失败 fail_max 次后转为 open
+    - open：直接抛 CircuitOpenError；冷却 reset_timeout 秒后转为 half_open
+    - half_open：只放行一个探测请求，成功则 closed，失败则重新 open
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, fail_max: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self.fail_counter = 0
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def current_state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._trial_in_flight = False
+        return self._state
+
+    def before_call(self) -> None:
+        """请求前检查：open 或 half_open 探测中时抛 CircuitOpenError"""
+        state = self.current_state
+        if state == self.OPEN or (state == self.HALF_OPEN and self._trial_in_flight):
+            raise CircuitOpenError(f"{self.name} 断路器已打开，暂停调用")
+        if state == self.HALF_OPEN:
+            self._trial_in_flight = True
+
+    def record_success(self) -> None:
+        self.fail_counter = 0
+        self._state = self.CLOSED
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.fail_counter += 1
+        if self._state == self.HALF_OPEN or self.fail_counter >= self.fail_max:
+            self._open()
+
+    def release_trial(self) -> None:
+        """探测请求未得出结果（如被取消）：交还探测名额，下一个请求重新探测"""
+        self._trial_in_flight = False
+
+    def reset(self) -> None:
+        self.record_success()
+
+    def _open(self) -> None:
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._trial_in_flight = False
+        logger.warning(f"{self.name} 断路器打开，{self.reset_timeout:.0f}秒内快速失败")
+        # 延迟导入：ai_client_compat 在模块加载时导入本模块
+        from app.services.ai_client_compat import metrics
+        metrics.increment_circuit_breaker()
+
+
+# ✅ 断路器按服务商名共享（同一服务商的多个客户端实例看到同一个状态）
+_breakers: Dict[str, CircuitBreaker] = {}
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """获取服务商对应的断路器"""
+    breaker = _breakers.get(name)
+    if breaker is None:
+        breaker = _breakers[name] = CircuitBreaker(name)
+    return breaker
+
+
 class AIClient:
     """AI客户端基类（带重试机制）"""
     
@@ -48,17 +130,20 @@ class AIClient:
             pool=30.0      # 连接池超时
         )
         
-        self.client = OpenAI(
+        # ✅ 异步客户端 + 与 ai_client 共用同一个HTTP连接池（HTTP/2、keep-alive），
+        #    不再每个客户端各建一个同步池，也不再在事件循环里阻塞等待LLM响应
+        self.client = AsyncOpenAI(
             api_key=api_key, 
             base_url=base_url,
-            timeout=timeout_config,
-            max_retries=0  # 禁用OpenAI内置重试，使用自定义重试
+            timeout=timeout_config,  # 按请求传给共享连接池，覆盖其默认超时
+            max_retries=0,  # 禁用OpenAI内置重试，使用自定义重试
+            http_client=get_http_client()
         )
         self.model = model
         self.name = name
         self.total_tokens = 0
         self.total_cost = 0.0
-        self.failure_count = 0  # 失败计数器（用于断路器）
+        self.breaker = get_breaker(name)
     
     @retry_on_connection_error(max_retries=3, delay=1.0)
     async def chat(
@@ -67,11 +152,12 @@ class AIClient:
         temperature: float = 0.7,
         max_tokens: Optional[int] = None
     ) -> Dict[str, Any]:
-        """发送聊天请求（带重试机制）"""
+        """发送聊天请求（带重试机制；断路器打开时直接抛 CircuitOpenError）"""
+        self.breaker.before_call()
         try:
             start_time = time.time()
             
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=messages,
                 temperature=temperature,
@@ -80,8 +166,7 @@ class AIClient:
             
             duration = time.time() - start_time
             
-            # 重置失败计数器（成功调用）
-            self.failure_count = 0
+            self.breaker.record_success()
             
             # 提取响应
             content = response.choices[0].message.content
@@ -112,14 +197,17 @@ class AIClient:
             }
             
         except Exception as e:
-            # 增加失败计数器
-            self.failure_count += 1
-            logger.error(f"{self.name} 调用失败 (失败次数: {self.failure_count}): {str(e)}")
+            self.breaker.record_failure()
+            logger.error(f"{self.name} 调用失败 (连续失败次数: {self.breaker.fail_counter}): {str(e)}")
             raise Exception(f"{self.name} 调用失败: {str(e)}")
+        except BaseException:
+            # 取消（超时/客户端断开/call_first取消落选调用）不计为失败，但半开状态下必须交还探测名额，否则断路器永远拒绝
+            self.breaker.release_trial()
+            raise
     
     def is_circuit_open(self) -> bool:
-        """检查断路器是否打开（连续失败次数过多）"""
-        return self.failure_count >= 5  # 连续失败5次后打开断路器
+        """检查断路器是否打开（冷却结束进入半开后返回False，放行探测请求）"""
+        return self.breaker.current_state == CircuitBreaker.OPEN
     
     def _calculate_cost(self, prompt_tokens: int, completion_tokens: int) -> float:
         """计算成本（需要子类实现具体定价）"""
@@ -129,7 +217,7 @@ class AIClient:
         """重置统计信息"""
         self.total_tokens = 0
         self.total_cost = 0.0
-        self.failure_count = 0
+        self.breaker.reset()
 
 
 class DeepSeekClient(AIClient):
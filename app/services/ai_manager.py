@@ -1,25 +1,64 @@
 from typing import Dict, List, Any
-from app.services.ai_client import DeepSeekClient, MoonshotClient, QwenClient
+from functools import lru_cache
+import asyncio
+from app.core.config import settings
+from app.services.ai_client import get_deepseek_client, get_moonshot_client, get_qwen_client
 
 class AIManager:
-    """AI客户端管理器"""
+    """
+    AI客户端管理器
+    
+    ✅ 三个客户端在首次访问时才构建（只用到其中一个时不会构建另外两个）
+    """
     
     def __init__(self):
-        self.meta_ai = DeepSeekClient()  # 元认知AI
-        self.ai_a = MoonshotClient()     # AI-A：深度分析
-        self.ai_b = QwenClient()         # AI-B：流量视角
+        # ✅ 全局并发上限：并行调用（asyncio.gather）时不超过服务商限流
+        self._semaphore = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+    
+    @property
+    def meta_ai(self):
+        """元认知AI"""
+        return get_deepseek_client()
+    
+    @property
+    def ai_a(self):
+        """AI-A：深度分析"""
+        return get_moonshot_client()
+    
+    @property
+    def ai_b(self):
+        """AI-B：流量视角"""
+        return get_qwen_client()
     
     async def call_meta_ai(self, messages: List[Dict[str, str]], **kwargs) -> Dict[str, Any]:
         """调用元认知AI"""
-        return await self.meta_ai.chat(messages, **kwargs)
+        async with self._semaphore:
+            return await self.meta_ai.chat(messages, **kwargs)
+    
+    async def call_meta_ai_json(self, messages: List[Dict[str, str]], **kwargs) -> Dict[str, Any]:
+        """调用元认知AI（只需要JSON结果时使用：流式接收，JSON闭合即断开）"""
+        async with self._semaphore:
+            return await self.meta_ai.chat_json(messages, **kwargs)
     
     async def call_ai_a(self, messages: List[Dict[str, str]], **kwargs) -> Dict[str, Any]:
         """调用AI-A（深度分析）"""
-        return await self.ai_a.chat(messages, **kwargs)
+        async with self._semaphore:
+            return await self.ai_a.chat(messages, **kwargs)
     
     async def call_ai_b(self, messages: List[Dict[str, str]], **kwargs) -> Dict[str, Any]:
         """调用AI-B（流量视角）"""
-        return await self.ai_b.chat(messages, **kwargs)
+        async with self._semaphore:
+            return await self.ai_b.chat(messages, **kwargs)
+    
+    async def call_ai_a_stream(self, messages: List[Dict[str, str]], **kwargs) -> Dict[str, Any]:
+        """流式调用AI-A（kwargs可带 on_delta 回调，见 AIClient.chat_stream）"""
+        async with self._semaphore:
+            return await self.ai_a.chat_stream(messages, **kwargs)
+    
+    async def call_ai_b_stream(self, messages: List[Dict[str, str]], **kwargs) -> Dict[str, Any]:
+        """流式调用AI-B（kwargs可带 on_delta 回调）"""
+        async with self._semaphore:
+            return await self.ai_b.chat_stream(messages, **kwargs)
     
     def get_total_cost(self) -> float:
         """获取总成本"""
@@ -57,9 +96,8 @@ class AIManager:
         self.ai_b.reset_stats()
 
 
-# 创建全局AI管理器实例
-ai_manager = AIManager()
-
+# ✅ 全局AI管理器实例（首次调用时创建，不在导入时构建）
+@lru_cache(maxsize=1)
 def get_ai_manager() -> AIManager:
     """获取AI管理器实例"""
-    return ai_manager
\ No newline at end of file
+    return AIManager()
\ No newline at end of file
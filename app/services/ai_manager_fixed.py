@@ -1,4 +1,5 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+from functools import lru_cache
 from app.services.ai_client_fixed import DeepSeekClient, MoonshotClient, QwenClient
 import logging
 
@@ -8,9 +9,31 @@ class AIManager:
     """AI客户端管理器（带故障转移）"""
     
     def __init__(self):
-        self.meta_ai = DeepSeekClient()  # 元认知AI
-        self.ai_a = MoonshotClient()     # AI-A：深度分析
-        self.ai_b = QwenClient()         # AI-B：流量视角
+        # ✅ 客户端在首次访问时才构建
+        self._meta_ai: Optional[DeepSeekClient] = None
+        self._ai_a: Optional[MoonshotClient] = None
+        self._ai_b: Optional[QwenClient] = None
+    
+    @property
+    def meta_ai(self) -> DeepSeekClient:
+        """元认知AI"""
+        if self._meta_ai is None:
+            self._meta_ai = DeepSeekClient()
+        return self._meta_ai
+    
+    @property
+    def ai_a(self) -> MoonshotClient:
+        """AI-A：深度分析"""
+        if self._ai_a is None:
+            self._ai_a = MoonshotClient()
+        return self._ai_a
+    
+    @property
+    def ai_b(self) -> QwenClient:
+        """AI-B：流量视角"""
+        if self._ai_b is None:
+            self._ai_b = QwenClient()
+        return self._ai_b
     
     async def call_meta_ai(self, messages: List[Dict[str, str]], **kwargs) -> Dict[str, Any]:
         """调用元认知AI（带故障转移）"""
@@ -87,22 +110,25 @@ class AIManager:
                 "name": self.meta_ai.name,
                 "tokens": self.meta_ai.total_tokens,
                 "cost": self.meta_ai.total_cost,
-                "failure_count": self.meta_ai.failure_count,
-                "circuit_open": self.meta_ai.is_circuit_open()
+                "failure_count": self.meta_ai.breaker.fail_counter,
+                "circuit_open": self.meta_ai.is_circuit_open(),
+                "circuit_state": self.meta_ai.breaker.current_state
             },
             "ai_a": {
                 "name": self.ai_a.name,
                 "tokens": self.ai_a.total_tokens,
                 "cost": self.ai_a.total_cost,
-                "failure_count": self.ai_a.failure_count,
-                "circuit_open": self.ai_a.is_circuit_open()
+                "failure_count": self.ai_a.breaker.fail_counter,
+                "circuit_open": self.ai_a.is_circuit_open(),
+                "circuit_state": self.ai_a.breaker.current_state
             },
             "ai_b": {
                 "name": self.ai_b.name,
                 "tokens": self.ai_b.total_tokens,
                 "cost": self.ai_b.total_cost,
-                "failure_count": self.ai_b.failure_count,
-                "circuit_open": self.ai_b.is_circuit_open()
+                "failure_count": self.ai_b.breaker.fail_counter,
+                "circuit_open": self.ai_b.is_circuit_open(),
+                "circuit_state": self.ai_b.breaker.current_state
             },
             "total_cost": self.get_total_cost()
         }
@@ -114,9 +140,8 @@ class AIManager:
         self.ai_b.reset_stats()
 
 
-# 创建全局AI管理器实例
-ai_manager = AIManager()
-
+# 全局AI管理器实例（首次调用时创建）
+@lru_cache(maxsize=1)
 def get_ai_manager() -> AIManager:
     """获取AI管理器实例"""
-    return ai_manager
+    return AIManager()
@@ -0,0 +1,44 @@
+"""
+审计条目构建
+各阶段节点统一通过 build_audit_entry 生成审计记录；条目仍是普通dict（直接写入audit_trails表、随接口返回）
+"""
+from typing import Any, Dict
+import sys
+
+# 截断省略号（单字符U+2026，比"..."少占两个字符）
+ELLIPSIS = "…"
+
+
+def truncate(text: str, limit: int) -> str:
+    """超长才截断并加省略号；不超长时直接返回原字符串，不产生新对象"""
+    return text[:limit] + ELLIPSIS if len(text) > limit else text
+
+
+def build_audit_entry(
+    step: int,
+    phase: str,
+    actor: str,
+    action: str,
+    input: str,
+    output: str,
+    reasoning: str = "",
+    tokens_used: int = 0,
+    cost: float = 0.0
+) -> Dict[str, Any]:
+    """
+    构建一条审计记录
+
+    ✅ phase/actor/action 取值只有十几种，intern后所有条目共享同一个字符串对象，
+       长辩论中不再每条都各持一份拷贝（如从数据库/缓存反序列化回来的状态）
+    """
+    return {
+        "step": step,
+        "phase": sys.intern(phase),
+        "actor": sys.intern(actor),
+        "action": sys.intern(action),
+        "input": input,
+        "output": output,
+        "reasoning": reasoning,
+        "tokens_used": tokens_used,
+        "cost": cost
+    }
@@ -0,0 +1,48 @@
+"""
+评估结果缓存
+相同 (scene, user_input) 的Phase 0评估、相同回答的Phase 1答案理解直接复用结果，跳过LLM调用
+键基于规范化后的文本：全角/半角、大小写、空白差异不影响命中
+"""
+from typing import Any, Dict, Optional
+import hashlib
+import unicodedata
+import orjson
+from app.core.cache import JSONCache
+
+EVAL_CACHE_TTL = 3600
+
+_evaluation_cache = JSONCache("eval:phase0", ttl=EVAL_CACHE_TTL, maxsize=10000)
+_answers_cache = JSONCache("eval:answers", ttl=EVAL_CACHE_TTL, maxsize=10000)
+
+
+def _normalize(text: str) -> str:
+    """NFKC（全角转半角）+ casefold + 合并空白；只影响缓存键，不改变送给LLM的原文"""
+    return " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+
+
+def _digest(*parts: str) -> str:
+    return hashlib.sha256("\x00".join(parts).encode()).hexdigest()
+
+
+def _answers_key(scene: str, answers: Dict[int, str]) -> str:
+    # 按问题编号排序，保证键与回答顺序无关
+    normalized = sorted((str(k), _normalize(v)) for k, v in answers.items())
+    return _digest(scene, orjson.dumps(normalized).decode())
+
+
+async def get_evaluation(scene: str, user_input: str) -> Optional[Dict[str, Any]]:
+    """读取Phase 0评估结果（返回值只读，不要修改）"""
+    return await _evaluation_cache.get(_digest(scene, _normalize(user_input)))
+
+
+async def set_evaluation(scene: str, user_input: str, evaluation_data: Dict[str, Any]):
+    await _evaluation_cache.set(_digest(scene, _normalize(user_input)), evaluation_data)
+
+
+async def get_understanding(scene: str, answers: Dict[int, str]) -> Optional[Dict[str, Any]]:
+    """读取答案理解结果（返回值只读，不要修改）"""
+    return await _answers_cache.get(_answers_key(scene, answers))
+
+
+async def set_understanding(scene: str, answers: Dict[int, str], understanding_data: Dict[str, Any]):
+    await _answers_cache.set(_answers_key(scene, answers), understanding_data)
@@ -0,0 +1,114 @@
+"""
+差异/新信息快速预判
+用字符二元组余弦相似度先判断"明显相同"的情况，命中时跳过元认知AI调用；其余情况仍交给LLM判断
+"""
+from typing import Any, Dict, List, Optional
+from collections import Counter
+import math
+
+try:
+    # ✅ 可选依赖（requirements-optional.txt）：C实现的编辑距离相似度，长文本比较比纯Python快一个数量级
+    from rapidfuzz import fuzz
+except ImportError:
+    fuzz = None
+
+# 相似度不低于该阈值视为"基本相同"（只短路这一侧：两段独立生成的分析字面相似度本来就不高，低相似度不代表真有分歧）
+SIMILAR_THRESHOLD = 0.85
+
+# 两条核心主张相似度不低于该阈值视为同一主张；主张重合度（Jaccard）不低于 CLAIMS_AGREE_THRESHOLD 视为观点一致
+CLAIM_MATCH_THRESHOLD = 0.6
+CLAIMS_AGREE_THRESHOLD = 0.8
+
+# 新信息判断：双方本轮与上一轮相似度都不低于该阈值视为无新信息
+# （只短路这一侧：新写的一段反驳与上一轮字面相似度本来就低，低相似度不代表真有新观点）
+NOVELTY_SAME_THRESHOLD = 0.9
+
+
+def _bigrams(text: str) -> Counter:
+    text = "".join(text.split())
+    return Counter(text[i:i + 2] for i in range(len(text) - 1))
+
+
+def text_similarity(a: str, b: str) -> float:
+    """字符二元组余弦相似度，0-1（中文按字切分即可，无需分词）"""
+    # ✅ 完全相同直接返回（str比较先比长度，再逐字节memcmp，比先哈希再比较更省）
+    if a == b:
+        return 1.0 if a else 0.0
+    va, vb = _bigrams(a), _bigrams(b)
+    if not va or not vb:
+        return 0.0
+    if len(va) > len(vb):
+        va, vb = vb, va
+    dot = sum(count * vb[gram] for gram, count in va.items())
+    norm = math.sqrt(sum(c * c for c in va.values())) * math.sqrt(sum(c * c for c in vb.values()))
+    return dot / norm
+
+
+def edit_similarity(a: str, b: str) -> float:
+    """
+    编辑距离相似度，0-1（装了rapidfuzz时用 fuzz.ratio，否则退回 text_similarity）
+    
+    中文文本没有空格分词，token_set_ratio 会把整段当成一个词，所以用字符级的 ratio
+    """
+    if fuzz is None:
+        return text_similarity(a, b)
+    return fuzz.ratio(a, b) / 100
+
+
+def fast_divergence(ai_a_output: str, ai_b_output: str) -> Optional[Dict[str, Any]]:
+    """双方输出几乎相同时直接判定无分歧；否则返回None，交给 _check_divergence"""
+    similarity = text_similarity(ai_a_output, ai_b_output)
+    if similarity < SIMILAR_THRESHOLD:
+        return None
+    return {
+        "has_significant_divergence": False,
+        "divergence_points": [],
+        "reason": "双方输出完全一致，无需辩论" if ai_a_output == ai_b_output else f"双方输出高度相似（相似度{similarity:.2f}），无需辩论",
+        "tokens_used": 0,
+        "cost": 0.0
+    }
+
+
+def fast_claims_divergence(claims_a: List[str], claims_b: List[str]) -> Optional[Dict[str, Any]]:
+    """
+    双方核心主张基本重合时直接判定无分歧；任一方未给出主张或重合度不足时返回None，交给 _check_divergence
+    
+    主张不重合不等于有分歧（两个角色本来就从不同视角出发，结论可能互补），所以同样只短路"一致"这一侧
+    """
+    if not claims_a or not claims_b:
+        return None
+    unmatched_b = list(claims_b)
+    matched = 0
+    for claim in claims_a:
+        best = max(unmatched_b, key=lambda other: text_similarity(claim, other), default=None)
+        if best is not None and text_similarity(claim, best) >= CLAIM_MATCH_THRESHOLD:
+            unmatched_b.remove(best)
+            matched += 1
+    overlap = matched / (len(claims_a) + len(claims_b) - matched)
+    if overlap < CLAIMS_AGREE_THRESHOLD:
+        return None
+    return {
+        "has_significant_divergence": False,
+        "divergence_points": [],
+        "reason": f"双方核心主张基本重合（重合度{overlap:.2f}），无需辩论",
+        "tokens_used": 0,
+        "cost": 0.0
+    }
+
+
+def fast_novelty(debate_history: List[Dict], new_ai_a: str, new_ai_b: str) -> Optional[Dict[str, Any]]:
+    """双方本轮输出都与各自上一轮几乎相同时直接判定无新信息；否则返回None，交给 _check_novelty"""
+    if not isinstance(debate_history, list) or not debate_history:
+        return None
+    last = debate_history[-1]
+    sim_a = edit_similarity(new_ai_a, last.get("ai_a", ""))
+    sim_b = edit_similarity(new_ai_b, last.get("ai_b", ""))
+    if min(sim_a, sim_b) >= NOVELTY_SAME_THRESHOLD:
+        return {
+            "has_novelty": False,
+            "new_points": [],
+            "reason": f"双方本轮输出与上一轮高度相似（相似度{min(sim_a, sim_b):.2f}），观点已收敛",
+            "tokens_used": 0,
+            "cost": 0.0
+        }
+    return None
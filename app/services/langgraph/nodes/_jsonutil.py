@@ -0,0 +1,107 @@
+"""
+LLM响应JSON提取
+单次正向扫描找出第一个完整的JSON对象（跳过字符串内的括号与转义），替代 re.search(r'\{.*\}', ..., re.DOTALL)
+各阶段节点统一通过 parse_json_response 解析，扫描失败时才退回预编译的正则
+元认知判断类调用用 tolerant_json_parse：额外容忍代码围栏、尾逗号，失败返回None并计数
+"""
+from typing import Any, Dict, Optional
+from collections import Counter
+import logging
+import re
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# 兜底：从第一个 { 到最后一个 }（模块级预编译，所有节点共用）
+_JSON_PATTERN = re.compile(r"\{.*\}", re.DOTALL)
+
+# Markdown代码围栏（```json ... ```）
+_FENCE_PATTERN = re.compile(r"^\s*```[a-zA-Z0-9]*\s*|\s*```\s*$")
+# 尾逗号：`,` 后紧跟 } 或 ]
+_TRAILING_COMMA_PATTERN = re.compile(r",(\s*[}\]])")
+
+# ✅ 解析失败计数（按调用方标签），长期偏高说明对应prompt的输出格式不稳定
+_parse_failures: Counter = Counter()
+
+
+def extract_json(text: str) -> Optional[str]:
+    """
+    返回 text 中第一个括号配平的 {...} 片段；没有完整对象时返回 None
+    
+    ✅ O(n) 无回溯；AI在JSON前后附加说明文字时也能正确截取
+    """
+    start = text.find("{")
+    if start < 0:
+        return None
+
+    depth = 0
+    in_string = False
+    escape = False
+
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+
+    return None
+
+
+def extract_json_regex(text: str) -> Optional[str]:
+    """正则兜底提取（贪婪匹配第一个 { 到最后一个 }）"""
+    match = _JSON_PATTERN.search(text)
+    return match.group() if match else None
+
+
+def dumps_str(obj: Any, option: int = 0) -> str:
+    """orjson序列化为str（原样输出UTF-8中文，相当于 json.dumps(..., ensure_ascii=False)）"""
+    return orjson.dumps(obj, option=option).decode()
+
+
+def parse_json_response(content: str) -> Any:
+    """
+    解析LLM返回的JSON：先用括号扫描截取，失败再用正则兜底，都没有则按原文解析
+    
+    解析失败抛出 orjson.JSONDecodeError（ValueError子类），由调用方决定降级策略
+    注：不做结果缓存，调用方会在返回的dict上写入tokens/cost等字段
+    """
+    return orjson.loads(extract_json(content) or extract_json_regex(content) or content)
+
+
+def tolerant_json_parse(content: str, label: str = "unknown") -> Optional[Dict[str, Any]]:
+    """
+    容错解析：去掉代码围栏后按 parse_json_response 解析，失败时修复尾逗号再试一次
+    
+    仍失败或结果不是对象时返回None（调用方返回默认判断），并按 label 计入解析失败次数
+    """
+    text = _FENCE_PATTERN.sub("", content)
+    try:
+        data = parse_json_response(text)
+    except ValueError:
+        candidate = extract_json(text) or extract_json_regex(text)
+        try:
+            data = orjson.loads(_TRAILING_COMMA_PATTERN.sub(r"\1", candidate)) if candidate else None
+        except ValueError:
+            data = None
+    if isinstance(data, dict):
+        return data
+    _parse_failures[label] += 1
+    logger.warning("JSON解析失败: label=%s, 累计%d次", label, _parse_failures[label])
+    return None
+
+
+def get_parse_failure_counts() -> Dict[str, int]:
+    """获取各调用方的JSON解析失败次数"""
+    return dict(_parse_failures)
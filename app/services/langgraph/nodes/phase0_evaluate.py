@@ -1,33 +1,21 @@
 from typing import Dict, Any
 from app.services.langgraph.state import JexAgentState
+from app.services.langgraph.audit import build_audit_entry, truncate
 from app.services.ai_manager import get_ai_manager
-import json
-import re
+from app.services.langgraph.nodes._eval_cache import get_evaluation, set_evaluation
+from app.services.langgraph.nodes._jsonutil import dumps_str, parse_json_response
 
-async def phase0_evaluate(state: JexAgentState) -> Dict[str, Any]:
-    """
-    Phase 0: 智能评估节点
-    
-    功能：
-    1. 分析用户输入
-    2. 评估信息充足度
-    3. 判断是否需要问询
-    4. 识别缺失的关键信息
-    """
-    
-    ai_manager = get_ai_manager()
-    
-    # 构建评估Prompt
-    evaluation_prompt = f"""你是一个元认知AI，负责评估用户提供的信息是否充足。
+# ✅ Prompt模板（模块级常量，调用时只做format填充）
+_EVALUATION_PROMPT = """你是一个元认知AI，负责评估用户提供的信息是否充足。
 
-**任务场景：** {state['scene']}
+**任务场景：** {scene}
 
 **用户输入：**
-{state['user_input']}
+{user_input}
 
 **你的任务：**
 1. 分析用户已经提供了哪些信息
-2. 评估对于"{state['scene']}"这个场景，还缺少哪些**关键**信息
+2. 评估对于"{scene}"这个场景，还缺少哪些**关键**信息
 3. 判断是否需要向用户提问
 
 **评估标准：**
@@ -49,35 +37,59 @@ async def phase0_evaluate(state: JexAgentState) -> Dict[str, Any]:
 
 只返回JSON，不要其他内容。
 """
+
+async def phase0_evaluate(state: JexAgentState) -> Dict[str, Any]:
+    """
+    Phase 0: 智能评估节点
+    
+    功能：
+    1. 分析用户输入
+    2. 评估信息充足度
+    3. 判断是否需要问询
+    4. 识别缺失的关键信息
+    """
+    
+    ai_manager = get_ai_manager()
+    
+    # 构建评估Prompt
+    evaluation_prompt = _EVALUATION_PROMPT.format(
+        scene=state['scene'],
+        user_input=state['user_input']
+    )
     
     messages = [{"role": "user", "content": evaluation_prompt}]
     
     try:
-        # 调用元认知AI
-        result = await ai_manager.call_meta_ai(messages, temperature=0.3)
-        
-        # 解析JSON响应
-        content = result["content"].strip()
+        # ✅ 相同输入直接复用评估结果，跳过LLM调用
+        evaluation_data = await get_evaluation(state['scene'], state['user_input'])
+        cache_hit = evaluation_data is not None
         
-        # 提取JSON（如果AI返回了额外文本）
-        json_match = re.search(r'\{.*\}', content, re.DOTALL)
-        if json_match:
-            evaluation_data = json.loads(json_match.group())
+        if cache_hit:
+            result = {"tokens": {"total": 0}, "cost": 0.0}
         else:
-            evaluation_data = json.loads(content)
+            # 调用元认知AI
+            result = await ai_manager.call_meta_ai_json(messages, temperature=0.3)
+            
+            # 解析JSON响应
+            content = result["content"].strip()
+            
+            # 提取JSON（如果AI返回了额外文本）
+            evaluation_data = parse_json_response(content)
+            
+            await set_evaluation(state['scene'], state['user_input'], evaluation_data)
         
         # 记录审计轨迹
-        audit_entry = {
-            "step": 0,
-            "phase": "评估",
-            "actor": "元认知AI",
-            "action": "评估信息充足度",
-            "input": state['user_input'][:200] + "...",
-            "output": json.dumps(evaluation_data, ensure_ascii=False),
-            "reasoning": evaluation_data.get("reason", ""),
-            "tokens_used": result["tokens"]["total"],
-            "cost": result["cost"]
-        }
+        audit_entry = build_audit_entry(
+            step=0,
+            phase="评估",
+            actor="元认知AI",
+            action="评估信息充足度（缓存命中）" if cache_hit else "评估信息充足度",
+            input=truncate(state['user_input'], 200),
+            output=dumps_str(evaluation_data),
+            reasoning=evaluation_data.get("reason", ""),
+            tokens_used=result["tokens"]["total"],
+            cost=result["cost"]
+        )
         
         # 更新状态
         return {
@@ -85,7 +97,7 @@ async def phase0_evaluate(state: JexAgentState) -> Dict[str, Any]:
             "provided_info": evaluation_data.get("provided_info", {}),
             "missing_info": evaluation_data.get("missing_critical_info", []),
             "info_sufficiency": evaluation_data.get("info_sufficiency", 0.5),
-            "audit_trail": state.get("audit_trail", []) + [audit_entry],
+            "audit_trail": [audit_entry],  # ✅ 只返回新增条目，由reducer拼接
             "total_cost": state.get("total_cost", 0.0) + result["cost"]
         }
         
@@ -1,35 +1,15 @@
 from typing import Dict, Any
 from app.services.langgraph.state import JexAgentState
+from app.services.langgraph.audit import build_audit_entry
 from app.services.ai_manager import get_ai_manager
-import json
-import re
+from app.services.langgraph.nodes._jsonutil import dumps_str, parse_json_response
+import orjson
 
-async def phase2_planning(state: JexAgentState) -> Dict[str, Any]:
-    """
-    Phase 2: 任务规划节点
-    
-    功能：
-    1. 分析完整信息（用户输入 + 收集的信息）
-    2. 决定任务类型
-    3. 选择协作模式（辩论 or 审查）
-    4. 分配AI角色
-    """
-    
-    ai_manager = get_ai_manager()
-    
-    # 整合完整信息
-    complete_info = {
-        "用户原始输入": state['user_input'],
-        "场景": state['scene'],
-        "已提供信息": state.get('provided_info', {}),
-        "收集的信息": state.get('collected_info', {})
-    }
-    
-    # 构建规划Prompt
-    planning_prompt = f"""你是一个元认知AI，负责规划多AI协作策略。
+# ✅ Prompt模板（模块级常量，调用时只做format填充）
+_PLANNING_PROMPT = """你是一个元认知AI，负责规划多AI协作策略。
 
 **完整信息：**
-{json.dumps(complete_info, ensure_ascii=False, indent=2)}
+{complete_info}
 
 **你的任务：**
 基于以上信息，制定最优的协作策略。
@@ -63,6 +43,32 @@ async def phase2_planning(state: JexAgentState) -> Dict[str, Any]:
 
 只返回JSON，不要其他内容。
 """
+
+async def phase2_planning(state: JexAgentState) -> Dict[str, Any]:
+    """
+    Phase 2: 任务规划节点
+    
+    功能：
+    1. 分析完整信息（用户输入 + 收集的信息）
+    2. 决定任务类型
+    3. 选择协作模式（辩论 or 审查）
+    4. 分配AI角色
+    """
+    
+    ai_manager = get_ai_manager()
+    
+    # 整合完整信息
+    complete_info = {
+        "用户原始输入": state['user_input'],
+        "场景": state['scene'],
+        "已提供信息": state.get('provided_info', {}),
+        "收集的信息": state.get('collected_info', {})
+    }
+    
+    # 构建规划Prompt
+    planning_prompt = _PLANNING_PROMPT.format(
+        complete_info=dumps_str(complete_info, option=orjson.OPT_INDENT_2)
+    )
     
     messages = [{"role": "user", "content": planning_prompt}]
     
@@ -72,34 +78,35 @@ async def phase2_planning(state: JexAgentState) -> Dict[str, Any]:
         
         # 解析JSON响应
         content = result["content"].strip()
-        json_match = re.search(r'\{.*\}', content, re.DOTALL)
-        if json_match:
-            planning_data = json.loads(json_match.group())
-        else:
-            planning_data = json.loads(content)
+        planning_data = parse_json_response(content)
         
         # 记录审计轨迹
-        audit_entry = {
-            "step": len(state.get("audit_trail", [])),
-            "phase": "规划",
-            "actor": "元认知AI",
-            "action": "制定协作策略",
-            "input": f"场景: {state['scene']}",
-            "output": json.dumps(planning_data, ensure_ascii=False),
-            "reasoning": planning_data.get("reasoning", ""),
-            "tokens_used": result["tokens"]["total"],
-            "cost": result["cost"]
-        }
+        audit_entry = build_audit_entry(
+            step=len(state.get("audit_trail", [])),
+            phase="规划",
+            actor="元认知AI",
+            action="制定协作策略",
+            input=f"场景: {state['scene']}",
+            output=dumps_str(planning_data),
+            reasoning=planning_data.get("reasoning", ""),
+            tokens_used=result["tokens"]["total"],
+            cost=result["cost"]
+        )
+        
+        # ✅ 调用方显式指定的模式优先；规划AI只在 debate/review 中选择（both 成本翻倍，必须由调用方开启）
+        collaboration_mode = state.get("requested_mode")
+        if not collaboration_mode:
+            collaboration_mode = "review" if planning_data.get("collaboration_mode") == "review" else "debate"
         
         return {
             "task_type": planning_data.get("task_type", "未分类任务"),
-            "collaboration_mode": planning_data.get("collaboration_mode", "debate"),
+            "collaboration_mode": collaboration_mode,
             "ai_a_role": planning_data.get("ai_a_role", "深度分析"),
             "ai_b_role": planning_data.get("ai_b_role", "实用建议"),
             "max_rounds": planning_data.get("max_rounds", 3),
             "current_round": 0,
             "should_stop": False,
-            "audit_trail": state.get("audit_trail", []) + [audit_entry],
+            "audit_trail": [audit_entry],  # ✅ 只返回新增条目，由reducer拼接
             "total_cost": state.get("total_cost", 0.0) + result["cost"]
         }
         
@@ -108,7 +115,7 @@ async def phase2_planning(state: JexAgentState) -> Dict[str, Any]:
         return {
             "error": f"Phase 2规划失败: {str(e)}，使用默认策略",
             "task_type": "通用分析",
-            "collaboration_mode": "debate",
+            "collaboration_mode": state.get("requested_mode") or "debate",
             "ai_a_role": "从深度和专业性角度分析",
             "ai_b_role": "从实用性和可操作性角度分析",
             "max_rounds": 3,
@@ -1,9 +1,234 @@
-from typing import Dict, Any, List
-from app.services.langgraph.state import JexAgentState
+from typing import Dict, Any, List, Optional
+from app.services.langgraph.state import JexAgentState, merge_state
+from app.services.langgraph.audit import build_audit_entry, truncate
 from app.services.ai_manager import get_ai_manager
-import json
+from app.services.langgraph.nodes._jsonutil import dumps_str, tolerant_json_parse
+from app.services.langgraph.nodes._fast_divergence import fast_divergence, fast_claims_divergence, fast_novelty
+import asyncio
+import orjson
 import re
 
+# 输出预览长度（接口直接返回预览字段，不再在响应中切片全文）
+PREVIEW_CHARS = 500
+# 审计条目中输出摘要 / 引用对方观点的长度
+AUDIT_CHARS = 200
+QUOTE_CHARS = 100
+
+def _preview(text: str) -> str:
+    """生成输出预览"""
+    return truncate(text, PREVIEW_CHARS)
+
+# 辩论回应末尾的新观点自评标记
+_NOVELTY_TAG = "【新观点】"
+_NOVELTY_TAG_RE = re.compile(r"\**\s*" + _NOVELTY_TAG + r"\s*(有|无)\s*\**\s*$")  # 兼容markdown加粗
+
+# 首轮分析开头的核心主张块（用于预判分歧），以分析标记结束；流式接收时主张块一结束即可提前判断
+_CLAIMS_TAG = "【核心主张】"
+_ANALYSIS_TAG = "【分析】"
+_CLAIM_LINE_RE = re.compile(r"^\s*(?:[-*•]\s+|\d+[.、]\s*)(.+?)\s*$")
+
+# 审查反馈末尾的问题严重度自评标记
+_SEVERITY_TAG = "【问题严重度】"
+_SEVERITY_TAG_RE = re.compile(r"\**\s*" + _SEVERITY_TAG + r"\s*(严重|中等|轻微|无问题)\s*\**\s*$")
+
+# ✅ Prompt模板（模块级常量，调用时只做format填充）
+_ANALYSIS_A_PROMPT = """{context}
+
+**你的角色：** {role}
+
+**你的任务：** 
+基于你的角色定位，从你的专业视角给出深入分析和建议。
+
+**要求：**
+1. 保持客观和专业
+2. 提供具体的论据和例子
+3. 长度控制在300-500字
+4. 先单独一行写"{claims_tag}"，下面逐行列出不超过3条核心结论（每条以"- "开头），然后单独一行写"{analysis_tag}"，再写完整分析
+
+请开始你的分析：
+"""
+
+_ANALYSIS_B_PROMPT = """{context}
+
+**你的角色：** {role}
+
+**你的任务：** 
+基于你的角色定位，从你的专业视角给出分析和建议。
+
+**要求：**
+1. 保持客观和实用
+2. 提供具体的论据和例子
+3. 长度控制在300-500字
+4. 先单独一行写"{claims_tag}"，下面逐行列出不超过3条核心结论（每条以"- "开头），然后单独一行写"{analysis_tag}"，再写完整分析
+
+请开始你的分析：
+"""
+
+_DIVERGENCE_PROMPT = """你是元认知AI，负责判断两个AI的观点差异。
+
+**AI-A的观点：**
+{ai_a_output}
+
+**AI-B的观点：**
+{ai_b_output}
+
+**你的任务：**
+判断这两个观点是否有显著差异，是否需要启动辩论。
+
+**判断标准：**
+- 如果观点基本一致，只是表达方式不同 → 无需辩论
+- 如果有明显的分歧点、不同的建议方向 → 需要辩论
+
+**请以JSON格式返回：**
+{{
+  "has_significant_divergence": true/false,
+  "divergence_points": ["分歧点1", "分歧点2"],
+  "reason": "判断理由"
+}}
+
+只返回JSON，不要其他内容。
+"""
+
+_DEBATE_PROMPT = """{context}
+
+**你的角色：** {role}
+
+**{opponent_name}的观点：**
+{opponent_view}
+
+**你的任务：**
+针对{opponent_name}的观点，提出你的回应：
+1. 如果你认同，说明为什么认同，并补充观点
+2. 如果你不认同，说明理由，并提出你的观点
+3. 保持客观和建设性
+
+**要求：**
+- 聚焦核心分歧点
+- 提供新的论据或视角
+- 避免重复之前的观点
+- 长度控制在200-300字
+- 回应的最后单独一行标注本轮是否提出了之前没有的论据或视角：{novelty_tag}有 或 {novelty_tag}无
+
+请开始你的回应：
+"""
+
+_NOVELTY_PROMPT = """你是元认知AI，负责判断辩论是否产生了新信息。
+
+**之前的辩论记录：**
+{history}
+
+**本轮AI-A的观点：**
+{new_ai_a}
+
+**本轮AI-B的观点：**
+{new_ai_b}
+
+**你的任务：**
+判断本轮辩论是否提出了新的观点、论据或视角。
+
+**判断标准：**
+- 如果只是重复之前的观点，换个说法 → 无新信息
+- 如果提出了新的论据、案例、视角 → 有新信息
+- 如果双方观点开始趋同 → 无新信息，可以终止
+
+**请以JSON格式返回：**
+{{
+  "has_novelty": true/false,
+  "new_points": ["新观点1", "新观点2"],
+  "reason": "判断理由"
+}}
+
+只返回JSON，不要其他内容。
+"""
+
+_GENERATE_PROMPT = """{context}
+
+**你的角色：** {role}
+
+**你的任务：** 
+基于用户需求，生成高质量的内容。
+
+**要求：**
+1. 内容完整、结构清晰
+2. 符合用户的具体要求
+3. 保持专业和准确
+
+请生成内容：
+"""
+
+_REVIEW_PROMPT = """{context}
+
+**你的角色：** {role}
+
+**待审查的内容：**
+{content}
+
+**你的任务：** 
+审查以上内容，找出问题和不足，提出改进建议。
+
+**审查维度：**
+1. 准确性：是否有事实错误或误导性内容
+2. 完整性：是否遗漏了重要信息
+3. 可读性：表达是否清晰、易懂
+4. 吸引力：是否能吸引目标受众
+
+**要求：**
+- 不要重写内容，只指出问题
+- 提供具体的改进建议
+- 如果内容很好，也要明确指出
+- 审查的最后单独一行标注问题严重度：{severity_tag}严重 / {severity_tag}中等 / {severity_tag}轻微 / {severity_tag}无问题
+
+请开始审查：
+"""
+
+_IMPROVEMENT_CHECK_PROMPT = """你是元认知AI，负责判断内容是否需要改进。
+
+**原始内容（预览）：**
+{content_preview}
+
+**审查反馈：**
+{review}
+
+**你的任务：**
+判断审查反馈中指出的问题是否严重，是否需要改进。
+
+**判断标准：**
+- 如果有严重问题（事实错误、重大遗漏） → 必须改进
+- 如果只是小问题或优化建议 → 可以接受，无需改进
+- 如果审查者认为内容已经很好 → 无需改进
+
+**请以JSON格式返回：**
+{{
+  "needs_improvement": true/false,
+  "severity": "严重/中等/轻微/无问题",
+  "key_issues": ["问题1", "问题2"],
+  "reason": "判断理由"
+}}
+
+只返回JSON，不要其他内容。
+"""
+
+_IMPROVE_PROMPT = """{context}
+
+**你的角色：** {role}
+
+**你之前生成的内容：**
+{original}
+
+**审查反馈：**
+{feedback}
+
+**你的任务：** 
+根据审查反馈，改进你的内容。
+
+**要求：**
+1. 针对性解决指出的问题
+2. 保留好的部分
+3. 整体保持连贯性
+
+请提供改进后的内容：
+"""
+
 async def phase3_debate_mode(state: JexAgentState) -> Dict[str, Any]:
     """
     Phase 3: 辩论模式协作
@@ -16,78 +241,115 @@ async def phase3_debate_mode(state: JexAgentState) -> Dict[str, Any]:
     5. 持续辩论直到收敛或达到最大轮次
     """
     
-    # 确保 debate_rounds 是列表
-    if not isinstance(state.get("debate_rounds"), list):
-        state["debate_rounds"] = []
+    # ✅ 本轮多次用到的状态字段先绑定为局部变量
+    current_round = state.get("current_round", 0)
+    max_rounds = state.get("max_rounds", 3)
+    prev_total = state.get("total_cost", 0.0)
+    base_step = len(state.get("audit_trail", []))
+    debate_rounds = state.get("debate_rounds")
+    if not isinstance(debate_rounds, list):
+        debate_rounds = []
     
     ai_manager = get_ai_manager()
     
-    # 构建完整上下文
-    context = _build_context(state)
+    # 构建完整上下文（✅ 首轮构建后随状态传递，输入信息未变化时后续轮次直接复用）
+    context, context_cache = _get_context(state)
     
     # 第1轮：AI-A和AI-B独立分析
-    if state.get("current_round", 0) == 0:
-        # AI-A分析
-        ai_a_result = await _call_ai_a(context, state, ai_manager)
+    if current_round == 0:
+        # ✅ AI-A / AI-B 独立分析互不依赖，并发流式调用（耗时取两者最大值）
+        # ✅ TaskGroup：任一方失败立即取消另一方，不再为用不上的结果继续付费
+        loop = asyncio.get_running_loop()
+        claims_a, claims_b = loop.create_future(), loop.create_future()
+        divergence_check_task = None
+        try:
+            async with asyncio.TaskGroup() as tg:
+                ai_a_task = tg.create_task(_call_ai_a(context, state, ai_manager, claims_a))
+                ai_b_task = tg.create_task(_call_ai_b(context, state, ai_manager, claims_b))
+                
+                # ✅ 双方核心主张一输出完就开始判断分歧，与正文剩余部分的生成重叠
+                key_claims_a, key_claims_b = await asyncio.gather(claims_a, claims_b)
+                divergence_check = fast_claims_divergence(key_claims_a, key_claims_b)
+                if divergence_check is None and key_claims_a and key_claims_b:
+                    divergence_check_task = asyncio.create_task(_check_divergence(
+                        _format_claims(key_claims_a),
+                        _format_claims(key_claims_b),
+                        ai_manager
+                    ))
+        except BaseException as error:
+            if divergence_check_task is not None:
+                divergence_check_task.cancel()
+            raise _first_error(error) from None
+        ai_a_result, ai_b_result = ai_a_task.result(), ai_b_task.result()
         
-        # AI-B分析
-        ai_b_result = await _call_ai_b(context, state, ai_manager)
+        # 判断差异（✅ 双方输出几乎相同、或核心主张基本重合时本地直接判定，省去一次元认知AI调用）
+        if divergence_check is None:
+            divergence_check = fast_divergence(ai_a_result["content"], ai_b_result["content"])
+            if divergence_check is not None and divergence_check_task is not None:
+                divergence_check_task.cancel()
+                divergence_check_task = None
         
-        # 判断差异
-        divergence_check = await _check_divergence(
-            ai_a_result["content"],
-            ai_b_result["content"],
-            ai_manager
-        )
+        # ✅ 仍需元认知AI判断时先发出请求，等待期间准备审计摘要与预览
+        if divergence_check is None and divergence_check_task is None:
+            divergence_check_task = asyncio.create_task(_check_divergence(
+                ai_a_result["content"],
+                ai_b_result["content"],
+                ai_manager
+            ))
+        
+        # 审计摘要与返回预览各切片一次，后续审计条目和各返回分支直接复用
+        ai_a_audit = truncate(ai_a_result["content"], AUDIT_CHARS)
+        ai_b_audit = truncate(ai_b_result["content"], AUDIT_CHARS)
+        ai_a_preview = _preview(ai_a_result["content"])
+        ai_b_preview = _preview(ai_b_result["content"])
+        
+        if divergence_check_task is not None:
+            divergence_check = await divergence_check_task
         
-        # 初始化辩论记录
-        debate_rounds = [{
+        # 本轮记录（只返回新增一条，由reducer追加到已有记录后）
+        new_round = {
             "round": 1,
             "ai_a": ai_a_result["content"],
             "ai_b": ai_b_result["content"],
             "divergence": divergence_check
-        }]
-        
-        # 更新审计轨迹
-        audit_trail = state.get("audit_trail", [])
-        audit_trail.extend([
-            {
-                "step": len(audit_trail),
-                "phase": "协作",
-                "actor": "Kimi",
-                "action": "独立分析",
-                "input": f"角色: {state['ai_a_role']}",
-                "output": ai_a_result["content"][:200] + "...",
-                "reasoning": "从深度和专业性角度分析",
-                "tokens_used": ai_a_result["tokens"]["total"],
-                "cost": ai_a_result["cost"]
-            },
-            {
-                "step": len(audit_trail) + 1,
-                "phase": "协作",
-                "actor": "Qwen",
-                "action": "独立分析",
-                "input": f"角色: {state['ai_b_role']}",
-                "output": ai_b_result["content"][:200] + "...",
-                "reasoning": "从实用和传播角度分析",
-                "tokens_used": ai_b_result["tokens"]["total"],
-                "cost": ai_b_result["cost"]
-            },
-            {
-                "step": len(audit_trail) + 2,
-                "phase": "协作",
-                "actor": "元认知AI",
-                "action": "判断差异",
-                "input": "比较AI-A和AI-B的观点",
-                "output": json.dumps(divergence_check, ensure_ascii=False),
-                "reasoning": divergence_check.get("reason", ""),
-                "tokens_used": divergence_check.get("tokens_used", 0),
-                "cost": divergence_check.get("cost", 0.0)
-            }
-        ])
+        }
+        
+        # 更新审计轨迹（✅ 只返回本轮新增条目，由reducer拼接到已有轨迹后）
+        new_entries = [
+            _audit(
+                step=base_step,
+                actor="Kimi",
+                action="独立分析",
+                input=f"角色: {state['ai_a_role']}",
+                output=ai_a_audit,
+                reasoning="从深度和专业性角度分析",
+                tokens_used=ai_a_result["tokens"]["total"],
+                cost=ai_a_result["cost"]
+            ),
+            _audit(
+                step=base_step + 1,
+                actor="Qwen",
+                action="独立分析",
+                input=f"角色: {state['ai_b_role']}",
+                output=ai_b_audit,
+                reasoning="从实用和传播角度分析",
+                tokens_used=ai_b_result["tokens"]["total"],
+                cost=ai_b_result["cost"]
+            ),
+            _audit(
+                step=base_step + 2,
+                actor="元认知AI",
+                action="判断差异",
+                input="比较AI-A和AI-B的观点",
+                output=dumps_str(divergence_check),
+                reasoning=divergence_check.get("reason", ""),
+                tokens_used=divergence_check.get("tokens_used", 0),
+                cost=divergence_check.get("cost", 0.0)
+            )
+        ]
         
         total_cost = (
-            state.get("total_cost", 0.0) + 
+            prev_total + 
             ai_a_result["cost"] + 
             ai_b_result["cost"] + 
             divergence_check.get("cost", 0.0)
@@ -97,106 +359,114 @@ async def phase3_debate_mode(state: JexAgentState) -> Dict[str, Any]:
         if divergence_check.get("has_significant_divergence", False):
             # 需要辩论，但不在这里继续，而是返回状态让工作流决定
             return {
-                "ai_a_output": ai_a_result["content"],
-                "ai_b_output": ai_b_result["content"],
-                "debate_rounds": debate_rounds,
+                "ai_a_output": new_round["ai_a"],
+                "ai_b_output": new_round["ai_b"],
+                "ai_a_output_preview": ai_a_preview,
+                "ai_b_output_preview": ai_b_preview,
+                "debate_rounds": [new_round],
                 "current_round": 1,
                 "should_stop": False,
-                "audit_trail": audit_trail,
+                "audit_trail": new_entries,
+                "cached_context": context_cache,
                 "total_cost": total_cost
             }
         else:
             # 观点一致，无需辩论，直接结束
             return {
-                "ai_a_output": ai_a_result["content"],
-                "ai_b_output": ai_b_result["content"],
-                "debate_rounds": debate_rounds,
+                "ai_a_output": new_round["ai_a"],
+                "ai_b_output": new_round["ai_b"],
+                "ai_a_output_preview": ai_a_preview,
+                "ai_b_output_preview": ai_b_preview,
+                "debate_rounds": [new_round],
                 "current_round": 1,
                 "should_stop": True,
                 "stop_reason": "观点趋于一致，无需辩论",
-                "audit_trail": audit_trail,
+                "audit_trail": new_entries,
+                "cached_context": context_cache,
                 "total_cost": total_cost
             }
     
     else:
         # 后续辩论轮次
-        current_round = state.get("current_round", 1)
+        ai_a_output, ai_b_output = state["ai_a_output"], state["ai_b_output"]
         
-        # AI-A针对AI-B的观点反驳
-        ai_a_debate = await _debate_response(
-            context,
-            state,
-            "ai_a",
-            state["ai_b_output"],
-            ai_manager
+        # ✅ 双方都只针对上一轮对方的观点反驳，本轮互不依赖，并发调用（任一方失败即取消另一方）
+        ai_a_debate, ai_b_debate = await _run_concurrently(
+            # AI-A针对AI-B的观点反驳
+            _debate_response(context, state, "ai_a", ai_b_output, ai_manager),
+            # AI-B针对AI-A的观点反驳
+            _debate_response(context, state, "ai_b", ai_a_output, ai_manager)
         )
         
-        # AI-B针对AI-A的观点反驳
-        ai_b_debate = await _debate_response(
-            context,
-            state,
-            "ai_b",
-            state["ai_a_output"],
-            ai_manager
+        # 判断是否有新信息（✅ 双方自评均无新观点、或输出与上一轮几乎相同时直接判定收敛，省去一次元认知AI调用）
+        novelty_check = (
+            _novelty_from_self_tags(ai_a_debate, ai_b_debate)
+            or fast_novelty(debate_rounds, ai_a_debate["content"], ai_b_debate["content"])
         )
         
-        # 判断是否有新信息
-        novelty_check = await _check_novelty(
-            state.get("debate_rounds", []),
-            ai_a_debate["content"],
-            ai_b_debate["content"],
-            ai_manager
-        )
+        # ✅ 仍需元认知AI判断时先发出请求，等待期间准备审计摘要与预览
+        novelty_check_task = None
+        if novelty_check is None:
+            novelty_check_task = asyncio.create_task(_check_novelty(
+                debate_rounds,
+                ai_a_debate["content"],
+                ai_b_debate["content"],
+                ai_manager
+            ))
         
-        # 记录本轮辩论
-        debate_rounds = state.get("debate_rounds", [])
-        debate_rounds.append({
+        # 审计摘要与返回预览各切片一次，后续审计条目和各返回分支直接复用
+        ai_a_audit = truncate(ai_a_debate["content"], AUDIT_CHARS)
+        ai_b_audit = truncate(ai_b_debate["content"], AUDIT_CHARS)
+        ai_a_preview = _preview(ai_a_debate["content"])
+        ai_b_preview = _preview(ai_b_debate["content"])
+        
+        if novelty_check_task is not None:
+            novelty_check = await novelty_check_task
+        
+        # 记录本轮辩论（只返回新增一条，由reducer追加）
+        new_round = {
             "round": current_round + 1,
             "ai_a": ai_a_debate["content"],
             "ai_b": ai_b_debate["content"],
             "novelty": novelty_check
-        })
-        
-        # 更新审计轨迹
-        audit_trail = state.get("audit_trail", [])
-        audit_trail.extend([
-            {
-                "step": len(audit_trail),
-                "phase": "协作",
-                "actor": "Kimi",
-                "action": f"辩论第{current_round + 1}轮",
-                "input": f"针对Qwen的观点: {state['ai_b_output'][:100]}...",
-                "output": ai_a_debate["content"][:200] + "...",
-                "reasoning": "提出反驳或补充观点",
-                "tokens_used": ai_a_debate["tokens"]["total"],
-                "cost": ai_a_debate["cost"]
-            },
-            {
-                "step": len(audit_trail) + 1,
-                "phase": "协作",
-                "actor": "Qwen",
-                "action": f"辩论第{current_round + 1}轮",
-                "input": f"针对Kimi的观点: {state['ai_a_output'][:100]}...",
-                "output": ai_b_debate["content"][:200] + "...",
-                "reasoning": "提出反驳或补充观点",
-                "tokens_used": ai_b_debate["tokens"]["total"],
-                "cost": ai_b_debate["cost"]
-            },
-            {
-                "step": len(audit_trail) + 2,
-                "phase": "协作",
-                "actor": "元认知AI",
-                "action": "检测信息增量",
-                "input": "分析本轮辩论是否有新观点",
-                "output": json.dumps(novelty_check, ensure_ascii=False),
-                "reasoning": novelty_check.get("reason", ""),
-                "tokens_used": novelty_check.get("tokens_used", 0),
-                "cost": novelty_check.get("cost", 0.0)
-            }
-        ])
+        }
+        
+        # 更新审计轨迹（✅ 只返回本轮新增条目，由reducer拼接到已有轨迹后）
+        new_entries = [
+            _audit(
+                step=base_step,
+                actor="Kimi",
+                action=f"辩论第{current_round + 1}轮",
+                input=f"针对Qwen的观点: {truncate(ai_b_output, QUOTE_CHARS)}",
+                output=ai_a_audit,
+                reasoning="提出反驳或补充观点",
+                tokens_used=ai_a_debate["tokens"]["total"],
+                cost=ai_a_debate["cost"]
+            ),
+            _audit(
+                step=base_step + 1,
+                actor="Qwen",
+                action=f"辩论第{current_round + 1}轮",
+                input=f"针对Kimi的观点: {truncate(ai_a_output, QUOTE_CHARS)}",
+                output=ai_b_audit,
+                reasoning="提出反驳或补充观点",
+                tokens_used=ai_b_debate["tokens"]["total"],
+                cost=ai_b_debate["cost"]
+            ),
+            _audit(
+                step=base_step + 2,
+                actor="元认知AI",
+                action="检测信息增量",
+                input="分析本轮辩论是否有新观点",
+                output=dumps_str(novelty_check),
+                reasoning=novelty_check.get("reason", ""),
+                tokens_used=novelty_check.get("tokens_used", 0),
+                cost=novelty_check.get("cost", 0.0)
+            )
+        ]
         
         total_cost = (
-            state.get("total_cost", 0.0) + 
+            prev_total + 
             ai_a_debate["cost"] + 
             ai_b_debate["cost"] + 
             novelty_check.get("cost", 0.0)
@@ -205,7 +475,7 @@ async def phase3_debate_mode(state: JexAgentState) -> Dict[str, Any]:
         # 判断是否应该停止
         should_stop = (
             not novelty_check.get("has_novelty", True) or
-            current_round + 1 >= state.get("max_rounds", 3)
+            current_round + 1 >= max_rounds
         )
         
         stop_reason = None
@@ -213,22 +483,161 @@ async def phase3_debate_mode(state: JexAgentState) -> Dict[str, Any]:
             if not novelty_check.get("has_novelty", True):
                 stop_reason = "无新信息增量，观点已收敛"
             else:
-                stop_reason = f"达到最大轮次限制({state.get('max_rounds', 3)}轮)"
+                stop_reason = f"达到最大轮次限制({max_rounds}轮)"
         
         return {
-            "ai_a_output": ai_a_debate["content"],
-            "ai_b_output": ai_b_debate["content"],
-            "debate_rounds": debate_rounds,
+            "ai_a_output": new_round["ai_a"],
+            "ai_b_output": new_round["ai_b"],
+            "ai_a_output_preview": ai_a_preview,
+            "ai_b_output_preview": ai_b_preview,
+            "debate_rounds": [new_round],
             "current_round": current_round + 1,
             "should_stop": should_stop,
             "stop_reason": stop_reason,
-            "audit_trail": audit_trail,
+            "audit_trail": new_entries,
+            "cached_context": context_cache,
             "total_cost": total_cost
         }
 
 
+async def _run_rounds(round_fn, state: JexAgentState) -> Dict[str, Any]:
+    """
+    在一个节点内连续执行协作轮次，直到 should_stop 或达到最大轮次，只向LangGraph返回一次
+    
+    ✅ 省去每轮一次的条件边调度与状态快照；返回值是各轮更新的合并结果（audit_trail按reducer拼接成本节点新增条目）
+    """
+    local_state = dict(state)
+    update: Dict[str, Any] = {}
+    while True:
+        round_update = await round_fn(local_state)
+        merge_state(local_state, round_update)
+        merge_state(update, round_update)
+        if local_state.get("should_stop") or local_state.get("current_round", 0) >= local_state.get("max_rounds", 3):
+            return update
+
+
+async def phase3_debate_mode_loop(state: JexAgentState) -> Dict[str, Any]:
+    """Phase 3: 辩论模式协作（节点内完成全部轮次）"""
+    return await _run_rounds(phase3_debate_mode, state)
+
+
+async def phase3_review_mode_loop(state: JexAgentState) -> Dict[str, Any]:
+    """Phase 3: 审查模式协作（节点内完成全部轮次）"""
+    return await _run_rounds(phase3_review_mode, state)
+
+
+async def phase3_both_mode(state: JexAgentState) -> Dict[str, Any]:
+    """
+    Phase 3: 辩论 + 审查两种模式并发协作
+    
+    ✅ 两种模式各自在独立的状态副本上跑完全部轮次（耗时取两者最大值），再由 _merge_collab 合并
+    """
+    debate_update, review_update = await _run_concurrently(
+        phase3_debate_mode_loop(state),
+        phase3_review_mode_loop(state)
+    )
+    return _merge_collab(state, debate_update, review_update)
+
+
+def _merge_collab(state: JexAgentState, debate_update: Dict[str, Any], review_update: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    合并两种模式的结果：辩论结果沿用原字段，审查结果放入 review_result
+    
+    两边都从同一份状态出发，审计条目的step会重叠，审查部分顺延编号；成本按各自增量累加
+    """
+    base_cost = state.get("total_cost") or 0.0
+    debate_entries = debate_update.get("audit_trail") or []
+    review_entries = review_update.get("audit_trail") or []
+    next_step = len(state.get("audit_trail") or []) + len(debate_entries)
+    review_entries = [{**entry, "step": next_step + i} for i, entry in enumerate(review_entries)]
+    
+    stop_reasons = [
+        f"{label}：{update['stop_reason']}"
+        for label, update in (("辩论", debate_update), ("审查", review_update))
+        if update.get("stop_reason")
+    ]
+    
+    return {
+        **debate_update,
+        "review_result": {
+            "content": review_update.get("ai_a_output", ""),
+            "review": review_update.get("ai_b_output", ""),
+            "content_preview": review_update.get("ai_a_output_preview", ""),
+            "review_preview": review_update.get("ai_b_output_preview", ""),
+            "rounds": review_update.get("debate_rounds", [])
+        },
+        "current_round": max(debate_update.get("current_round", 0), review_update.get("current_round", 0)),
+        "should_stop": True,
+        "stop_reason": "；".join(stop_reasons) or None,
+        "audit_trail": debate_entries + review_entries,
+        "total_cost": (debate_update.get("total_cost", base_cost) - base_cost) + (review_update.get("total_cost", base_cost) - base_cost) + base_cost
+    }
+
+
 # ========== 辅助函数 ==========
 
+def _first_error(error: BaseException) -> BaseException:
+    """TaskGroup抛出的异常组取第一个子异常（调用方按普通异常处理、拼接错误信息），其他异常原样返回"""
+    while isinstance(error, BaseExceptionGroup):
+        error = error.exceptions[0]
+    return error
+
+
+async def _run_concurrently(*coros) -> List[Any]:
+    """
+    并发执行并按顺序返回结果
+    
+    ✅ 与 asyncio.gather 不同：任一调用失败时立即取消其余调用（不再为用不上的LLM结果付费），并抛出该异常本身
+    """
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(coro) for coro in coros]
+    except BaseExceptionGroup as group:
+        raise _first_error(group) from None
+    return [task.result() for task in tasks]
+
+
+def _context_fingerprint(state: JexAgentState) -> int:
+    """
+    上下文输入的指纹：场景/需求按值，provided_info/collected_info 按对象身份（节点更新它们时总是返回新dict）
+
+    ⚠️ 按 id() 判断依赖这两个dict从不被就地修改：任何代码原地增删改其中的键（长度不变时）都会让缓存的上下文过期而不被察觉，
+       更新时必须构建新dict（如 {**old, **new}）
+    """
+    provided_info = state.get('provided_info')
+    collected_info = state.get('collected_info')
+    return hash((
+        state['scene'],
+        state['user_input'],
+        id(provided_info), len(provided_info or ()),
+        id(collected_info), len(collected_info or ())
+    ))
+
+
+def _get_context(state: JexAgentState):
+    """返回 (上下文文本, 缓存条目)；指纹与状态中缓存一致时直接复用，否则重新构建"""
+    fingerprint = _context_fingerprint(state)
+    cached = state.get("cached_context")
+    if cached and cached.get("fingerprint") == fingerprint:
+        return cached["text"], cached
+    text = _build_context(state)
+    return text, {"fingerprint": fingerprint, "text": text}
+
+
+def _audit(
+    step: int,
+    actor: str,
+    action: str,
+    input: str,
+    output: str,
+    reasoning: str,
+    tokens_used: int,
+    cost: float
+) -> Dict[str, Any]:
+    """协作阶段的审计条目（phase固定为"协作"）"""
+    return build_audit_entry(step, "协作", actor, action, input, output, reasoning, tokens_used, cost)
+
+
 def _build_context(state: JexAgentState) -> str:
     """构建完整上下文"""
     context_parts = [
@@ -237,98 +646,108 @@ def _build_context(state: JexAgentState) -> str:
     ]
     
     if state.get('provided_info'):
-        context_parts.append(f"**已提供信息：** {json.dumps(state['provided_info'], ensure_ascii=False)}")
+        context_parts.append(f"**已提供信息：** {dumps_str(state['provided_info'])}")
     
     if state.get('collected_info'):
-        context_parts.append(f"**收集的信息：** {json.dumps(state['collected_info'], ensure_ascii=False)}")
+        context_parts.append(f"**收集的信息：** {dumps_str(state['collected_info'])}")
     
     return "\n\n".join(context_parts)
 
 
-async def _call_ai_a(context: str, state: JexAgentState, ai_manager) -> Dict[str, Any]:
+async def _call_ai_a(context: str, state: JexAgentState, ai_manager, claims_ready: Optional[asyncio.Future] = None) -> Dict[str, Any]:
     """调用AI-A（Kimi）"""
-    prompt = f"""{context}
-
-**你的角色：** {state['ai_a_role']}
-
-**你的任务：** 
-基于你的角色定位，从你的专业视角给出深入分析和建议。
-
-**要求：**
-1. 保持客观和专业
-2. 提供具体的论据和例子
-3. 长度控制在300-500字
-
-请开始你的分析：
-"""
+    prompt = _ANALYSIS_A_PROMPT.format(
+        context=context,
+        role=state['ai_a_role'],
+        claims_tag=_CLAIMS_TAG,
+        analysis_tag=_ANALYSIS_TAG
+    )
     
     messages = [{"role": "user", "content": prompt}]
-    return await ai_manager.call_ai_a(messages, temperature=0.7)
+    return _with_claims(await _stream_with_claims(ai_manager.call_ai_a_stream, messages, claims_ready))
 
 
-async def _call_ai_b(context: str, state: JexAgentState, ai_manager) -> Dict[str, Any]:
+async def _call_ai_b(context: str, state: JexAgentState, ai_manager, claims_ready: Optional[asyncio.Future] = None) -> Dict[str, Any]:
     """调用AI-B（Qwen）"""
-    prompt = f"""{context}
-
-**你的角色：** {state['ai_b_role']}
-
-**你的任务：** 
-基于你的角色定位，从你的专业视角给出分析和建议。
-
-**要求：**
-1. 保持客观和实用
-2. 提供具体的论据和例子
-3. 长度控制在300-500字
-
-请开始你的分析：
-"""
+    prompt = _ANALYSIS_B_PROMPT.format(
+        context=context,
+        role=state['ai_b_role'],
+        claims_tag=_CLAIMS_TAG,
+        analysis_tag=_ANALYSIS_TAG
+    )
     
     messages = [{"role": "user", "content": prompt}]
-    return await ai_manager.call_ai_b(messages, temperature=0.7)
-
-
-async def _check_divergence(ai_a_output: str, ai_b_output: str, ai_manager) -> Dict[str, Any]:
-    """检查AI-A和AI-B的观点差异"""
-    prompt = f"""你是元认知AI，负责判断两个AI的观点差异。
+    return _with_claims(await _stream_with_claims(ai_manager.call_ai_b_stream, messages, claims_ready))
 
-**AI-A的观点：**
-{ai_a_output}
 
-**AI-B的观点：**
-{ai_b_output}
+async def _stream_with_claims(call_stream, messages: List[Dict[str, str]], claims_ready: Optional[asyncio.Future]) -> Dict[str, Any]:
+    """
+    流式调用；收到分析标记（主张块结束）时把解析出的核心主张写入 claims_ready
+    
+    claims_ready 一定会被完成：流结束仍未出现标记（或调用失败）时写入空列表
+    """
+    def on_delta(delta: str, parts: List[str]) -> None:
+        # 标记以"】"结尾，只有本段含"】"时才拼接检查
+        if claims_ready is None or claims_ready.done() or "】" not in delta:
+            return None
+        text = "".join(parts)
+        index = text.find(_ANALYSIS_TAG)
+        if index >= 0:
+            claims_ready.set_result(_parse_claims(text[:index]))
+        return None
+    
+    try:
+        return await call_stream(messages, temperature=0.7, on_delta=on_delta)
+    finally:
+        if claims_ready is not None and not claims_ready.done():
+            claims_ready.set_result([])
+
+
+def _parse_claims(text: str) -> List[str]:
+    """从核心主张块中逐行提取主张（块前没有主张标记时返回空列表）"""
+    index = text.find(_CLAIMS_TAG)
+    if index < 0:
+        return []
+    claims = []
+    for line in text[index + len(_CLAIMS_TAG):].splitlines():
+        match = _CLAIM_LINE_RE.match(line)
+        if match:
+            claims.append(match.group(1))
+    return claims
+
+
+def _with_claims(result: Dict[str, Any]) -> Dict[str, Any]:
+    """剥离核心主张块，正文不带该块进入后续轮次和输出；未按格式给出时 key_claims 为空"""
+    content = result["content"]
+    index = content.find(_CLAIMS_TAG)
+    if index < 0:
+        return {**result, "key_claims": []}
+    end = content.find(_ANALYSIS_TAG, index)
+    if end < 0:
+        # 没有分析标记：主张块一直到结尾（模型把主张写在了最后）
+        claims_block, body = content[index:], content[:index]
+    else:
+        claims_block, body = content[index:end], content[:index] + content[end + len(_ANALYSIS_TAG):]
+    body = body.strip().strip("*#").strip()
+    return {**result, "content": body, "key_claims": _parse_claims(claims_block)}
 
-**你的任务：**
-判断这两个观点是否有显著差异，是否需要启动辩论。
 
-**判断标准：**
-- 如果观点基本一致，只是表达方式不同 → 无需辩论
-- 如果有明显的分歧点、不同的建议方向 → 需要辩论
+def _format_claims(claims: List[str]) -> str:
+    return "\n".join(f"- {claim}" for claim in claims)
 
-**请以JSON格式返回：**
-{{
-  "has_significant_divergence": true/false,
-  "divergence_points": ["分歧点1", "分歧点2"],
-  "reason": "判断理由"
-}}
 
-只返回JSON，不要其他内容。
-"""
+async def _check_divergence(ai_a_output: str, ai_b_output: str, ai_manager) -> Dict[str, Any]:
+    """检查AI-A和AI-B的观点差异"""
+    prompt = _DIVERGENCE_PROMPT.format(
+        ai_a_output=ai_a_output,
+        ai_b_output=ai_b_output
+    )
     
     messages = [{"role": "user", "content": prompt}]
-    result = await ai_manager.call_meta_ai(messages, temperature=0.3)
+    result = await ai_manager.call_meta_ai_json(messages, temperature=0.3)
     
-    try:
-        content = result["content"].strip()
-        json_match = re.search(r'\{.*\}', content, re.DOTALL)
-        if json_match:
-            data = json.loads(json_match.group())
-        else:
-            data = json.loads(content)
-        
-        data["tokens_used"] = result["tokens"]["total"]
-        data["cost"] = result["cost"]
-        return data
-    except:
+    data = tolerant_json_parse(result["content"], label="divergence")
+    if data is None:
         return {
             "has_significant_divergence": True,
             "divergence_points": ["无法判断"],
@@ -336,6 +755,10 @@ async def _check_divergence(ai_a_output: str, ai_b_output: str, ai_manager) -> D
             "tokens_used": result["tokens"]["total"],
             "cost": result["cost"]
         }
+    
+    data["tokens_used"] = result["tokens"]["total"]
+    data["cost"] = result["cost"]
+    return data
 
 
 async def _debate_response(context: str, state: JexAgentState, ai_type: str, opponent_view: str, ai_manager) -> Dict[str, Any]:
@@ -343,34 +766,49 @@ async def _debate_response(context: str, state: JexAgentState, ai_type: str, opp
     role = state['ai_a_role'] if ai_type == "ai_a" else state['ai_b_role']
     opponent_name = "AI-B" if ai_type == "ai_a" else "AI-A"
     
-    prompt = f"""{context}
-
-**你的角色：** {role}
-
-**{opponent_name}的观点：**
-{opponent_view}
-
-**你的任务：**
-针对{opponent_name}的观点，提出你的回应：
-1. 如果你认同，说明为什么认同，并补充观点
-2. 如果你不认同，说明理由，并提出你的观点
-3. 保持客观和建设性
-
-**要求：**
-- 聚焦核心分歧点
-- 提供新的论据或视角
-- 避免重复之前的观点
-- 长度控制在200-300字
-
-请开始你的回应：
-"""
+    prompt = _DEBATE_PROMPT.format(
+        context=context,
+        role=role,
+        opponent_name=opponent_name,
+        opponent_view=opponent_view,
+        novelty_tag=_NOVELTY_TAG
+    )
     
     messages = [{"role": "user", "content": prompt}]
     
     if ai_type == "ai_a":
-        return await ai_manager.call_ai_a(messages, temperature=0.7)
+        result = await ai_manager.call_ai_a(messages, temperature=0.7)
     else:
-        return await ai_manager.call_ai_b(messages, temperature=0.7)
+        result = await ai_manager.call_ai_b(messages, temperature=0.7)
+    
+    # 剥离自评标记，正文不带标记进入后续轮次和输出
+    content, self_novelty = _split_novelty_tag(result["content"])
+    return {**result, "content": content, "self_novelty": self_novelty}
+
+
+def _split_novelty_tag(content: str):
+    """拆出末尾的自评标记，返回 (正文, True/False/None)；未标注时为None"""
+    match = _NOVELTY_TAG_RE.search(content)
+    if not match:
+        return content, None
+    return content[:match.start()].rstrip(), match.group(1) == "有"
+
+
+def _novelty_from_self_tags(ai_a_debate: Dict[str, Any], ai_b_debate: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    双方都自评"无新观点"时直接给出判定；否则返回None，交给元认知AI判断
+    
+    自评"有"可能偏乐观，所以只采信"无"
+    """
+    if ai_a_debate.get("self_novelty") is False and ai_b_debate.get("self_novelty") is False:
+        return {
+            "has_novelty": False,
+            "new_points": [],
+            "reason": "双方自评本轮无新观点",
+            "tokens_used": 0,
+            "cost": 0.0
+        }
+    return None
 
 
 async def _check_novelty(debate_history: List[Dict], new_ai_a: str, new_ai_b: str, ai_manager) -> Dict[str, Any]:
@@ -379,50 +817,19 @@ async def _check_novelty(debate_history: List[Dict], new_ai_a: str, new_ai_b: st
     if not isinstance(debate_history, list):
         debate_history = []
     
-    prompt = f"""你是元认知AI，负责判断辩论是否产生了新信息。
-
-**之前的辩论记录：**
-{json.dumps(debate_history[-2:], ensure_ascii=False, indent=2) if len(debate_history) > 0 else "无"}
-
-**本轮AI-A的观点：**
-{new_ai_a}
-
-**本轮AI-B的观点：**
-{new_ai_b}
-
-**你的任务：**
-判断本轮辩论是否提出了新的观点、论据或视角。
-
-**判断标准：**
-- 如果只是重复之前的观点，换个说法 → 无新信息
-- 如果提出了新的论据、案例、视角 → 有新信息
-- 如果双方观点开始趋同 → 无新信息，可以终止
-
-**请以JSON格式返回：**
-{{
-  "has_novelty": true/false,
-  "new_points": ["新观点1", "新观点2"],
-  "reason": "判断理由"
-}}
-
-只返回JSON，不要其他内容。
-"""
+    history = dumps_str(debate_history[-2:], option=orjson.OPT_INDENT_2) if debate_history else "无"
+    
+    prompt = _NOVELTY_PROMPT.format(
+        history=history,
+        new_ai_a=new_ai_a,
+        new_ai_b=new_ai_b
+    )
     
     messages = [{"role": "user", "content": prompt}]
-    result = await ai_manager.call_meta_ai(messages, temperature=0.3)
+    result = await ai_manager.call_meta_ai_json(messages, temperature=0.3)
     
-    try:
-        content = result["content"].strip()
-        json_match = re.search(r'\{.*\}', content, re.DOTALL)
-        if json_match:
-            data = json.loads(json_match.group())
-        else:
-            data = json.loads(content)
-        
-        data["tokens_used"] = result["tokens"]["total"]
-        data["cost"] = result["cost"]
-        return data
-    except:
+    data = tolerant_json_parse(result["content"], label="novelty")
+    if data is None:
         return {
             "has_novelty": False,
             "new_points": [],
@@ -430,6 +837,10 @@ async def _check_novelty(debate_history: List[Dict], new_ai_a: str, new_ai_b: st
             "tokens_used": result["tokens"]["total"],
             "cost": result["cost"]
         }
+    
+    data["tokens_used"] = result["tokens"]["total"]
+    data["cost"] = result["cost"]
+    return data
 async def phase3_review_mode(state: JexAgentState) -> Dict[str, Any]:
     """
     Phase 3: 审查模式协作
@@ -442,11 +853,17 @@ async def phase3_review_mode(state: JexAgentState) -> Dict[str, Any]:
     5. 重复直到质量达标或达到最大轮次
     """
     
+    # ✅ 本轮多次用到的状态字段先绑定为局部变量
+    current_round = state.get("current_round", 0)
+    max_rounds = state.get("max_rounds", 3)
+    prev_total = state.get("total_cost", 0.0)
+    base_step = len(state.get("audit_trail", []))
+    
     ai_manager = get_ai_manager()
-    context = _build_context(state)
+    context, context_cache = _get_context(state)  # ✅ 输入信息未变化时复用上一轮构建的上下文
     
     # 第1轮：AI-A生成初稿
-    if state.get("current_round", 0) == 0:
+    if current_round == 0:
         # AI-A生成内容
         ai_a_result = await _generate_content(context, state, ai_manager)
         
@@ -458,63 +875,74 @@ async def phase3_review_mode(state: JexAgentState) -> Dict[str, Any]:
             ai_manager
         )
         
-        # 判断是否需要改进
-        improvement_check = await _check_need_improvement(
-            ai_a_result["content"],
-            ai_b_result["content"],
-            ai_manager
-        )
+        # 判断是否需要改进（✅ 审查者自评严重/无问题时直接判定，省去一次元认知AI调用）
+        improvement_check = _improvement_from_self_severity(ai_b_result)
+        
+        # 审计摘要与返回预览各切片一次，判断请求、审计条目和各返回分支直接复用
+        ai_a_preview = _preview(ai_a_result["content"])
+        ai_b_preview = _preview(ai_b_result["content"])
+        
+        # ✅ 仍需元认知AI判断时先发出请求，等待期间准备审计摘要
+        improvement_check_task = None
+        if improvement_check is None:
+            improvement_check_task = asyncio.create_task(_check_need_improvement(
+                ai_a_preview,
+                ai_b_result["content"],
+                ai_manager
+            ))
+        
+        ai_a_audit = truncate(ai_a_result["content"], AUDIT_CHARS)
+        ai_b_audit = truncate(ai_b_result["content"], AUDIT_CHARS)
+        
+        if improvement_check_task is not None:
+            improvement_check = await improvement_check_task
         
-        # 初始化辩论记录（复用debate_rounds字段）
-        debate_rounds = [{
+        # 本轮记录（复用debate_rounds字段，只返回新增一条，由reducer追加）
+        new_round = {
             "round": 1,
             "ai_a_action": "生成初稿",
             "ai_a": ai_a_result["content"],
             "ai_b_action": "审查反馈",
             "ai_b": ai_b_result["content"],
             "improvement_check": improvement_check
-        }]
-        
-        # 更新审计轨迹
-        audit_trail = state.get("audit_trail", [])
-        audit_trail.extend([
-            {
-                "step": len(audit_trail),
-                "phase": "协作",
-                "actor": "Kimi",
-                "action": "生成内容初稿",
-                "input": f"角色: {state['ai_a_role']}",
-                "output": ai_a_result["content"][:200] + "...",
-                "reasoning": "基于需求生成内容",
-                "tokens_used": ai_a_result["tokens"]["total"],
-                "cost": ai_a_result["cost"]
-            },
-            {
-                "step": len(audit_trail) + 1,
-                "phase": "协作",
-                "actor": "Qwen",
-                "action": "审查内容",
-                "input": f"审查初稿（{len(ai_a_result['content'])}字）",
-                "output": ai_b_result["content"][:200] + "...",
-                "reasoning": "识别问题并提出改进建议",
-                "tokens_used": ai_b_result["tokens"]["total"],
-                "cost": ai_b_result["cost"]
-            },
-            {
-                "step": len(audit_trail) + 2,
-                "phase": "协作",
-                "actor": "元认知AI",
-                "action": "判断是否需要改进",
-                "input": "分析审查反馈的严重程度",
-                "output": json.dumps(improvement_check, ensure_ascii=False),
-                "reasoning": improvement_check.get("reason", ""),
-                "tokens_used": improvement_check.get("tokens_used", 0),
-                "cost": improvement_check.get("cost", 0.0)
-            }
-        ])
+        }
+        
+        # 更新审计轨迹（✅ 只返回本轮新增条目，由reducer拼接到已有轨迹后）
+        new_entries = [
+            _audit(
+                step=base_step,
+                actor="Kimi",
+                action="生成内容初稿",
+                input=f"角色: {state['ai_a_role']}",
+                output=ai_a_audit,
+                reasoning="基于需求生成内容",
+                tokens_used=ai_a_result["tokens"]["total"],
+                cost=ai_a_result["cost"]
+            ),
+            _audit(
+                step=base_step + 1,
+                actor="Qwen",
+                action="审查内容",
+                input=f"审查初稿（{len(ai_a_result['content'])}字）",
+                output=ai_b_audit,
+                reasoning="识别问题并提出改进建议",
+                tokens_used=ai_b_result["tokens"]["total"],
+                cost=ai_b_result["cost"]
+            ),
+            _audit(
+                step=base_step + 2,
+                actor="元认知AI",
+                action="判断是否需要改进",
+                input="分析审查反馈的严重程度",
+                output=dumps_str(improvement_check),
+                reasoning=improvement_check.get("reason", ""),
+                tokens_used=improvement_check.get("tokens_used", 0),
+                cost=improvement_check.get("cost", 0.0)
+            )
+        ]
         
         total_cost = (
-            state.get("total_cost", 0.0) + 
+            prev_total + 
             ai_a_result["cost"] + 
             ai_b_result["cost"] + 
             improvement_check.get("cost", 0.0)
@@ -523,36 +951,42 @@ async def phase3_review_mode(state: JexAgentState) -> Dict[str, Any]:
         # 判断是否需要改进
         if improvement_check.get("needs_improvement", False):
             return {
-                "ai_a_output": ai_a_result["content"],
-                "ai_b_output": ai_b_result["content"],
-                "debate_rounds": debate_rounds,
+                "ai_a_output": new_round["ai_a"],
+                "ai_b_output": new_round["ai_b"],
+                "ai_a_output_preview": ai_a_preview,
+                "ai_b_output_preview": ai_b_preview,
+                "debate_rounds": [new_round],
                 "current_round": 1,
                 "should_stop": False,
-                "audit_trail": audit_trail,
+                "audit_trail": new_entries,
+                "cached_context": context_cache,
                 "total_cost": total_cost
             }
         else:
             return {
-                "ai_a_output": ai_a_result["content"],
-                "ai_b_output": ai_b_result["content"],
-                "debate_rounds": debate_rounds,
+                "ai_a_output": new_round["ai_a"],
+                "ai_b_output": new_round["ai_b"],
+                "ai_a_output_preview": ai_a_preview,
+                "ai_b_output_preview": ai_b_preview,
+                "debate_rounds": [new_round],
                 "current_round": 1,
                 "should_stop": True,
                 "stop_reason": "内容质量已达标，无需改进",
-                "audit_trail": audit_trail,
+                "audit_trail": new_entries,
+                "cached_context": context_cache,
                 "total_cost": total_cost
             }
     
     else:
         # 改进轮次
-        current_round = state.get("current_round", 1)
+        ai_a_output, ai_b_output = state["ai_a_output"], state["ai_b_output"]
         
         # AI-A根据反馈改进
         ai_a_improved = await _improve_content(
             context,
             state,
-            state["ai_a_output"],
-            state["ai_b_output"],
+            ai_a_output,
+            ai_b_output,
             ai_manager
         )
         
@@ -564,64 +998,74 @@ async def phase3_review_mode(state: JexAgentState) -> Dict[str, Any]:
             ai_manager
         )
         
-        # 判断质量
-        improvement_check = await _check_need_improvement(
-            ai_a_improved["content"],
-            ai_b_review["content"],
-            ai_manager
-        )
+        # 判断质量（✅ 审查者自评严重/无问题时直接判定）
+        improvement_check = _improvement_from_self_severity(ai_b_review)
+        
+        # 审计摘要与返回预览各切片一次，判断请求、审计条目和各返回分支直接复用
+        ai_a_preview = _preview(ai_a_improved["content"])
+        ai_b_preview = _preview(ai_b_review["content"])
         
-        # 记录本轮
-        debate_rounds = state.get("debate_rounds", [])
-        debate_rounds.append({
+        # ✅ 仍需元认知AI判断时先发出请求，等待期间准备审计摘要
+        improvement_check_task = None
+        if improvement_check is None:
+            improvement_check_task = asyncio.create_task(_check_need_improvement(
+                ai_a_preview,
+                ai_b_review["content"],
+                ai_manager
+            ))
+        
+        ai_a_audit = truncate(ai_a_improved["content"], AUDIT_CHARS)
+        ai_b_audit = truncate(ai_b_review["content"], AUDIT_CHARS)
+        
+        if improvement_check_task is not None:
+            improvement_check = await improvement_check_task
+        
+        # 记录本轮（只返回新增一条，由reducer追加）
+        new_round = {
             "round": current_round + 1,
             "ai_a_action": "改进内容",
             "ai_a": ai_a_improved["content"],
             "ai_b_action": "再次审查",
             "ai_b": ai_b_review["content"],
             "improvement_check": improvement_check
-        })
-        
-        # 更新审计轨迹
-        audit_trail = state.get("audit_trail", [])
-        audit_trail.extend([
-            {
-                "step": len(audit_trail),
-                "phase": "协作",
-                "actor": "Kimi",
-                "action": f"改进第{current_round + 1}轮",
-                "input": f"基于反馈: {state['ai_b_output'][:100]}...",
-                "output": ai_a_improved["content"][:200] + "...",
-                "reasoning": "根据审查建议优化内容",
-                "tokens_used": ai_a_improved["tokens"]["total"],
-                "cost": ai_a_improved["cost"]
-            },
-            {
-                "step": len(audit_trail) + 1,
-                "phase": "协作",
-                "actor": "Qwen",
-                "action": f"审查第{current_round + 1}轮",
-                "input": f"审查改进后的内容",
-                "output": ai_b_review["content"][:200] + "...",
-                "reasoning": "评估改进效果",
-                "tokens_used": ai_b_review["tokens"]["total"],
-                "cost": ai_b_review["cost"]
-            },
-            {
-                "step": len(audit_trail) + 2,
-                "phase": "协作",
-                "actor": "元认知AI",
-                "action": "质量判断",
-                "input": "判断是否达标",
-                "output": json.dumps(improvement_check, ensure_ascii=False),
-                "reasoning": improvement_check.get("reason", ""),
-                "tokens_used": improvement_check.get("tokens_used", 0),
-                "cost": improvement_check.get("cost", 0.0)
-            }
-        ])
+        }
+        
+        # 更新审计轨迹（✅ 只返回本轮新增条目，由reducer拼接到已有轨迹后）
+        new_entries = [
+            _audit(
+                step=base_step,
+                actor="Kimi",
+                action=f"改进第{current_round + 1}轮",
+                input=f"基于反馈: {truncate(ai_b_output, QUOTE_CHARS)}",
+                output=ai_a_audit,
+                reasoning="根据审查建议优化内容",
+                tokens_used=ai_a_improved["tokens"]["total"],
+                cost=ai_a_improved["cost"]
+            ),
+            _audit(
+                step=base_step + 1,
+                actor="Qwen",
+                action=f"审查第{current_round + 1}轮",
+                input=f"审查改进后的内容",
+                output=ai_b_audit,
+                reasoning="评估改进效果",
+                tokens_used=ai_b_review["tokens"]["total"],
+                cost=ai_b_review["cost"]
+            ),
+            _audit(
+                step=base_step + 2,
+                actor="元认知AI",
+                action="质量判断",
+                input="判断是否达标",
+                output=dumps_str(improvement_check),
+                reasoning=improvement_check.get("reason", ""),
+                tokens_used=improvement_check.get("tokens_used", 0),
+                cost=improvement_check.get("cost", 0.0)
+            )
+        ]
         
         total_cost = (
-            state.get("total_cost", 0.0) + 
+            prev_total + 
             ai_a_improved["cost"] + 
             ai_b_review["cost"] + 
             improvement_check.get("cost", 0.0)
@@ -630,7 +1074,7 @@ async def phase3_review_mode(state: JexAgentState) -> Dict[str, Any]:
         # 判断是否应该停止
         should_stop = (
             not improvement_check.get("needs_improvement", False) or
-            current_round + 1 >= state.get("max_rounds", 3)
+            current_round + 1 >= max_rounds
         )
         
         stop_reason = None
@@ -638,16 +1082,19 @@ async def phase3_review_mode(state: JexAgentState) -> Dict[str, Any]:
             if not improvement_check.get("needs_improvement", False):
                 stop_reason = "内容质量已达标"
             else:
-                stop_reason = f"达到最大改进轮次({state.get('max_rounds', 3)}轮)"
+                stop_reason = f"达到最大改进轮次({max_rounds}轮)"
         
         return {
-            "ai_a_output": ai_a_improved["content"],
-            "ai_b_output": ai_b_review["content"],
-            "debate_rounds": debate_rounds,
+            "ai_a_output": new_round["ai_a"],
+            "ai_b_output": new_round["ai_b"],
+            "ai_a_output_preview": ai_a_preview,
+            "ai_b_output_preview": ai_b_preview,
+            "debate_rounds": [new_round],
             "current_round": current_round + 1,
             "should_stop": should_stop,
             "stop_reason": stop_reason,
-            "audit_trail": audit_trail,
+            "audit_trail": new_entries,
+            "cached_context": context_cache,
             "total_cost": total_cost
         }
 
@@ -656,20 +1103,10 @@ async def phase3_review_mode(state: JexAgentState) -> Dict[str, Any]:
 
 async def _generate_content(context: str, state: JexAgentState, ai_manager) -> Dict[str, Any]:
     """AI-A生成内容"""
-    prompt = f"""{context}
-
-**你的角色：** {state['ai_a_role']}
-
-**你的任务：** 
-基于用户需求，生成高质量的内容。
-
-**要求：**
-1. 内容完整、结构清晰
-2. 符合用户的具体要求
-3. 保持专业和准确
-
-请生成内容：
-"""
+    prompt = _GENERATE_PROMPT.format(
+        context=context,
+        role=state['ai_a_role']
+    )
     
     messages = [{"role": "user", "content": prompt}]
     return await ai_manager.call_ai_a(messages, temperature=0.7, max_tokens=2000)
@@ -677,78 +1114,52 @@ async def _generate_content(context: str, state: JexAgentState, ai_manager) -> D
 
 async def _review_content(context: str, state: JexAgentState, content: str, ai_manager) -> Dict[str, Any]:
     """AI-B审查内容"""
-    prompt = f"""{context}
-
-**你的角色：** {state['ai_b_role']}
-
-**待审查的内容：**
-{content}
-
-**你的任务：** 
-审查以上内容，找出问题和不足，提出改进建议。
-
-**审查维度：**
-1. 准确性：是否有事实错误或误导性内容
-2. 完整性：是否遗漏了重要信息
-3. 可读性：表达是否清晰、易懂
-4. 吸引力：是否能吸引目标受众
-
-**要求：**
-- 不要重写内容，只指出问题
-- 提供具体的改进建议
-- 如果内容很好，也要明确指出
-
-请开始审查：
-"""
+    prompt = _REVIEW_PROMPT.format(
+        context=context,
+        role=state['ai_b_role'],
+        content=content,
+        severity_tag=_SEVERITY_TAG
+    )
     
     messages = [{"role": "user", "content": prompt}]
-    return await ai_manager.call_ai_b(messages, temperature=0.6)
-
-
-async def _check_need_improvement(content: str, review: str, ai_manager) -> Dict[str, Any]:
-    """判断是否需要改进"""
-    prompt = f"""你是元认知AI，负责判断内容是否需要改进。
-
-**原始内容：**
-{content[:500]}...
-
-**审查反馈：**
-{review}
-
-**你的任务：**
-判断审查反馈中指出的问题是否严重，是否需要改进。
-
-**判断标准：**
-- 如果有严重问题（事实错误、重大遗漏） → 必须改进
-- 如果只是小问题或优化建议 → 可以接受，无需改进
-- 如果审查者认为内容已经很好 → 无需改进
+    result = await ai_manager.call_ai_b(messages, temperature=0.6)
+    
+    # 剥离严重度标记，正文不带标记进入改进轮次和输出
+    match = _SEVERITY_TAG_RE.search(result["content"])
+    if not match:
+        return {**result, "self_severity": None}
+    return {**result, "content": result["content"][:match.start()].rstrip(), "self_severity": match.group(1)}
 
-**请以JSON格式返回：**
-{{
-  "needs_improvement": true/false,
-  "severity": "严重/中等/轻微/无问题",
-  "key_issues": ["问题1", "问题2"],
-  "reason": "判断理由"
-}}
 
-只返回JSON，不要其他内容。
-"""
+def _improvement_from_self_severity(review: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    审查者自评"严重"或"无问题"时直接给出判定；中等/轻微/未标注时返回None，交给元认知AI判断
+    """
+    severity = review.get("self_severity")
+    if severity not in ("严重", "无问题"):
+        return None
+    return {
+        "needs_improvement": severity == "严重",
+        "severity": severity,
+        "key_issues": [],
+        "reason": f"审查者自评问题严重度：{severity}",
+        "tokens_used": 0,
+        "cost": 0.0
+    }
+
+
+async def _check_need_improvement(content_preview: str, review: str, ai_manager) -> Dict[str, Any]:
+    """判断是否需要改进（content_preview 由调用方传入已截好的预览，与返回值中的预览共用）"""
+    prompt = _IMPROVEMENT_CHECK_PROMPT.format(
+        content_preview=content_preview,
+        review=review
+    )
     
     messages = [{"role": "user", "content": prompt}]
     result = await ai_manager.call_meta_ai(messages, temperature=0.3)
     
-    try:
-        content = result["content"].strip()
-        json_match = re.search(r'\{.*\}', content, re.DOTALL)
-        if json_match:
-            data = json.loads(json_match.group())
-        else:
-            data = json.loads(content)
-        
-        data["tokens_used"] = result["tokens"]["total"]
-        data["cost"] = result["cost"]
-        return data
-    except:
+    data = tolerant_json_parse(result["content"], label="improvement")
+    if data is None:
         return {
             "needs_improvement": False,
             "severity": "无法判断",
@@ -757,30 +1168,20 @@ async def _check_need_improvement(content: str, review: str, ai_manager) -> Dict
             "tokens_used": result["tokens"]["total"],
             "cost": result["cost"]
         }
+    
+    data["tokens_used"] = result["tokens"]["total"]
+    data["cost"] = result["cost"]
+    return data
 
 
 async def _improve_content(context: str, state: JexAgentState, original: str, feedback: str, ai_manager) -> Dict[str, Any]:
     """AI-A改进内容"""
-    prompt = f"""{context}
-
-**你的角色：** {state['ai_a_role']}
-
-**你之前生成的内容：**
-{original}
-
-**审查反馈：**
-{feedback}
-
-**你的任务：** 
-根据审查反馈，改进你的内容。
-
-**要求：**
-1. 针对性解决指出的问题
-2. 保留好的部分
-3. 整体保持连贯性
-
-请提供改进后的内容：
-"""
+    prompt = _IMPROVE_PROMPT.format(
+        context=context,
+        role=state['ai_a_role'],
+        original=original,
+        feedback=feedback
+    )
     
     messages = [{"role": "user", "content": prompt}]
     return await ai_manager.call_ai_a(messages, temperature=0.7, max_tokens=2000)
@@ -1,30 +1,12 @@
 from typing import Dict, Any, List
 from app.services.langgraph.state import JexAgentState
+from app.services.langgraph.audit import build_audit_entry
 from app.services.ai_manager import get_ai_manager
-import json
-import re
+from app.services.langgraph.nodes._jsonutil import dumps_str, parse_json_response
+import orjson
 
-async def phase5_integration(state: JexAgentState) -> Dict[str, Any]:
-    """
-    Phase 5: 智能整合输出节点
-    
-    功能：
-    1. 整合多AI观点
-    2. 生成执行摘要（TL;DR）
-    3. 生成确定性建议
-    4. 生成假设性建议
-    5. 标注分歧点
-    6. 生成勾子（邀请深度定制）
-    7. 整理审计轨迹
-    """
-    
-    ai_manager = get_ai_manager()
-    
-    # 构建完整上下文
-    context = _build_integration_context(state)
-    
-    # 构建整合Prompt
-    integration_prompt = f"""{context}
+# ✅ Prompt模板（模块级常量，调用时只做format填充）
+_INTEGRATION_PROMPT = """{context}
 
 **你的任务：**
 作为元认知AI，整合以上所有信息，生成一份完整的分析报告。
@@ -75,6 +57,30 @@ async def phase5_integration(state: JexAgentState) -> Dict[str, Any]:
 
 **只返回JSON，不要其他内容。**
 """
+
+async def phase5_integration(state: JexAgentState) -> Dict[str, Any]:
+    """
+    Phase 5: 智能整合输出节点
+    
+    功能：
+    1. 整合多AI观点
+    2. 生成执行摘要（TL;DR）
+    3. 生成确定性建议
+    4. 生成假设性建议
+    5. 标注分歧点
+    6. 生成勾子（邀请深度定制）
+    7. 整理审计轨迹
+    """
+    
+    ai_manager = get_ai_manager()
+    
+    # 构建完整上下文
+    context = _build_integration_context(state)
+    
+    # 构建整合Prompt
+    integration_prompt = _INTEGRATION_PROMPT.format(
+        context=context
+    )
     
     messages = [{"role": "user", "content": integration_prompt}]
     
@@ -86,32 +92,29 @@ async def phase5_integration(state: JexAgentState) -> Dict[str, Any]:
         content = result["content"].strip()
         
         # 提取JSON
-        json_match = re.search(r'\{.*\}', content, re.DOTALL)
-        if json_match:
-            output_data = json.loads(json_match.group())
-        else:
-            output_data = json.loads(content)
+        output_data = parse_json_response(content)
         
         # 记录审计轨迹
-        audit_entry = {
-            "step": len(state.get("audit_trail", [])),
-            "phase": "整合",
-            "actor": "元认知AI",
-            "action": "生成综合报告",
-            "input": f"整合{len(state.get('debate_rounds', []))}轮协作结果",
-            "output": "生成了完整的结构化报告",
-            "reasoning": "综合多AI观点，输出最终建议",
-            "tokens_used": result["tokens"]["total"],
-            "cost": result["cost"]
-        }
+        audit_entry = build_audit_entry(
+            step=len(state.get("audit_trail", [])),
+            phase="整合",
+            actor="元认知AI",
+            action="生成综合报告",
+            input=f"整合{len(state.get('debate_rounds', []))}轮协作结果",
+            output="生成了完整的结构化报告",
+            reasoning="综合多AI观点，输出最终建议",
+            tokens_used=result["tokens"]["total"],
+            cost=result["cost"]
+        )
         
         # 生成审计轨迹摘要
         audit_summary = _generate_audit_summary(state.get("audit_trail", []))
         
         return {
             "final_output": {**output_data, "audit_summary": audit_summary},
-            "audit_trail": state.get("audit_trail", []) + [audit_entry],
-            "total_cost": state.get("total_cost", 0.0) + result["cost"]
+            "audit_trail": [audit_entry],  # ✅ 只返回新增条目，由reducer拼接
+            "total_cost": state.get("total_cost", 0.0) + result["cost"],
+            "cached_context": None  # 协作阶段的上下文缓存只在Phase 3内使用，不带入最终状态
         }
         
     except Exception as e:
@@ -119,8 +122,8 @@ async def phase5_integration(state: JexAgentState) -> Dict[str, Any]:
         return {
             "error": f"Phase 5整合失败: {str(e)}",
             "final_output": _generate_fallback_output(state),
-            "audit_trail": state.get("audit_trail", []),
-            "total_cost": state.get("total_cost", 0.0)
+            "total_cost": state.get("total_cost", 0.0),
+            "cached_context": None
         }
 
 
@@ -135,10 +138,10 @@ def _build_integration_context(state: JexAgentState) -> str:
     
     # 添加收集的信息
     if state.get('provided_info'):
-        context_parts.append(f"**用户提供的信息：**\n{json.dumps(state['provided_info'], ensure_ascii=False, indent=2)}")
+        context_parts.append(f"**用户提供的信息：**\n{dumps_str(state['provided_info'], option=orjson.OPT_INDENT_2)}")
     
     if state.get('collected_info'):
-        context_parts.append(f"**问询收集的信息：**\n{json.dumps(state['collected_info'], ensure_ascii=False, indent=2)}")
+        context_parts.append(f"**问询收集的信息：**\n{dumps_str(state['collected_info'], option=orjson.OPT_INDENT_2)}")
     
     # 添加任务规划
     context_parts.append(f"\n**协作策略：**")
@@ -150,7 +153,7 @@ def _build_integration_context(state: JexAgentState) -> str:
     # 添加协作结果
     context_parts.append(f"\n**AI协作结果：**")
     
-    if state.get('collaboration_mode') == 'debate':
+    if state.get('collaboration_mode') in ('debate', 'both'):
         context_parts.append(f"\n**AI-A的最终观点：**\n{state.get('ai_a_output', '无')}")
         context_parts.append(f"\n**AI-B的最终观点：**\n{state.get('ai_b_output', '无')}")
         
@@ -169,6 +172,12 @@ def _build_integration_context(state: JexAgentState) -> str:
         debate_rounds = state.get('debate_rounds', [])
         context_parts.append(f"\n**改进轮次：** {len(debate_rounds)}轮")
     
+    if state.get('collaboration_mode') == 'both':
+        review_result = state.get('review_result') or {}
+        context_parts.append(f"\n**审查模式最终内容：**\n{review_result.get('content') or '无'}")
+        context_parts.append(f"\n**审查模式最终审查意见：**\n{review_result.get('review') or '无'}")
+        context_parts.append(f"\n**改进轮次：** {len(review_result.get('rounds', []))}轮")
+    
     # 添加停止原因
     if state.get('stop_reason'):
         context_parts.append(f"\n**协作终止原因：** {state['stop_reason']}")
@@ -1,5 +1,6 @@
-from typing import TypedDict, List, Dict, Any, Optional
+from typing import TypedDict, List, Dict, Any, Optional, Annotated
 from uuid import UUID
+import operator
 
 class JexAgentState(TypedDict):
     """JexAgent工作流状态"""
@@ -23,14 +24,19 @@ class JexAgentState(TypedDict):
     
     # ========== Phase 2: 规划 ==========
     task_type: str  # 任务类型
-    collaboration_mode: str  # 协作模式: 'debate' | 'review'
+    requested_mode: Optional[str]  # 调用方显式指定的协作模式（'both' 只能由此开启）
+    collaboration_mode: str  # 协作模式: 'debate' | 'review' | 'both'
     ai_a_role: str  # AI-A的角色定义
     ai_b_role: str  # AI-B的角色定义
     
     # ========== Phase 3: 协作 ==========
-    ai_a_output: str  # AI-A的输出
-    ai_b_output: str  # AI-B的输出
-    debate_rounds: List[Dict[str, Any]]  # 辩论轮次记录
+    ai_a_output: str  # AI-A的输出（与 debate_rounds[-1]["ai_a"] 是同一个字符串对象，不另存副本）
+    ai_b_output: str  # AI-B的输出（同上，对应 debate_rounds[-1]["ai_b"]）
+    ai_a_output_preview: str  # AI-A输出预览（前500字，接口直接返回）
+    ai_b_output_preview: str  # AI-B输出预览（前500字）
+    debate_rounds: Annotated[List[Dict[str, Any]], operator.add]  # 辩论轮次记录（节点只返回本轮新增记录，由reducer拼接）
+    review_result: Dict[str, Any]  # 'both'模式下审查模式的结果 {content, review, content_preview, review_preview, rounds}
+    cached_context: Optional[Dict[str, Any]]  # 协作上下文缓存 {fingerprint, text}（输入信息不变时各轮复用；Phase 5清空，不带入最终状态）
     
     # ========== Phase 4: 监控 ==========
     current_round: int  # 当前轮次
@@ -42,6 +48,31 @@ class JexAgentState(TypedDict):
     final_output: Dict[str, Any]  # 最终输出
     
     # ========== 通用 ==========
-    audit_trail: List[Dict[str, Any]]  # 审计轨迹
+    audit_trail: Annotated[List[Dict[str, Any]], operator.add]  # 审计轨迹（节点只返回新增条目，由reducer拼接）
     total_cost: float  # 总成本
-    error: Optional[str]  # 错误信息
\ No newline at end of file
+    error: Optional[str]  # 错误信息
+
+
+# ✅ 带reducer的字段（Annotated元数据），直接调用节点时按LangGraph同样的规则合并
+_REDUCERS = {
+    name: typ.__metadata__[0]
+    for name, typ in JexAgentState.__annotations__.items()
+    if hasattr(typ, "__metadata__")
+}
+
+
+def merge_state(state: Dict[str, Any], *updates: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    把节点返回的更新就地合并进 state 并返回 state
+    
+    ✅ 不复制整份状态（状态携带完整辩论历史时，dict(state) 每次都要复制所有键）
+    ✅ audit_trail 等带reducer的字段与已有值拼接，而不是被节点返回的增量覆盖
+    """
+    for update in updates:
+        for key, value in update.items():
+            reducer = _REDUCERS.get(key)
+            if reducer is not None and state.get(key) is not None:
+                state[key] = reducer(state[key], value)
+            else:
+                state[key] = value
+    return state
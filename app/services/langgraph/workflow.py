@@ -1,13 +1,27 @@
+from functools import lru_cache
+from typing import Any, Optional, Tuple
 from langgraph.graph import StateGraph, END
+from langgraph.pregel import Pregel
 from app.services.langgraph.state import JexAgentState
 from app.services.langgraph.nodes.phase0_evaluate import phase0_evaluate
 from app.services.langgraph.nodes.phase1_inquiry import phase1_generate_inquiry
 from app.services.langgraph.nodes.phase2_planning import phase2_planning
-from app.services.langgraph.nodes.phase3_collaboration import phase3_debate_mode, phase3_review_mode
+from app.services.langgraph.nodes.phase3_collaboration import (
+    phase3_debate_mode,
+    phase3_review_mode,
+    phase3_debate_mode_loop,
+    phase3_review_mode_loop,
+    phase3_both_mode
+)
+from app.core.config import settings
 from app.services.langgraph.nodes.phase5_integration import phase5_integration
 
-def create_workflow():
-    """创建LangGraph工作流"""
+def create_workflow(inline_loop: Optional[bool] = None) -> Pregel:
+    """
+    创建LangGraph工作流
+    
+    inline_loop: 协作轮次是否在节点内循环，None时取 settings.PHASE3_INLINE_LOOP
+    """
     
     # 创建状态图
     workflow = StateGraph(JexAgentState)
@@ -16,8 +30,12 @@ def create_workflow():
     workflow.add_node("evaluate", phase0_evaluate)
     workflow.add_node("generate_inquiry", phase1_generate_inquiry)
     workflow.add_node("planning", phase2_planning)
-    workflow.add_node("debate_collaborate", phase3_debate_mode)
-    workflow.add_node("review_collaborate", phase3_review_mode)
+    # ✅ 默认协作轮次在节点内循环完成；关闭 PHASE3_INLINE_LOOP 时逐轮经条件边自循环
+    if inline_loop is None:
+        inline_loop = settings.PHASE3_INLINE_LOOP
+    workflow.add_node("debate_collaborate", phase3_debate_mode_loop if inline_loop else phase3_debate_mode)
+    workflow.add_node("review_collaborate", phase3_review_mode_loop if inline_loop else phase3_review_mode)
+    workflow.add_node("both_collaborate", phase3_both_mode)
     workflow.add_node("integration", phase5_integration)
     
     # 设置入口
@@ -44,7 +62,10 @@ def create_workflow():
     
     # Phase 2 → Phase 3（根据协作模式选择）
     def choose_collaboration_mode(state: JexAgentState) -> str:
-        mode = state.get("collaboration_mode", "debate")
+        # ✅ 调用方显式指定的模式优先；both 只能由调用方开启，不采纳规划结果中的 both
+        if state.get("requested_mode") == "both":
+            return "both"
+        mode = state.get("requested_mode") or state.get("collaboration_mode", "debate")
         if mode == "review":
             return "review"
         else:
@@ -55,38 +76,44 @@ def create_workflow():
         choose_collaboration_mode,
         {
             "debate": "debate_collaborate",
-            "review": "review_collaborate"
+            "review": "review_collaborate",
+            "both": "both_collaborate"
         }
     )
     
-    # Phase 3 → 检查是否继续协作或进入整合
-    def should_continue_collaboration(state: JexAgentState) -> str:
-        if state.get("should_stop", False):
-            return "integrate"
-        else:
-            # 继续协作
-            if state.get("collaboration_mode") == "review":
-                return "review"
+    # Phase 3 → Phase 5（双模式节点内部已跑完两种模式的全部轮次）
+    workflow.add_edge("both_collaborate", "integration")
+    if inline_loop:
+        workflow.add_edge("debate_collaborate", "integration")
+        workflow.add_edge("review_collaborate", "integration")
+    else:
+        def should_continue_collaboration(state: JexAgentState) -> str:
+            if state.get("should_stop", False):
+                return "integrate"
             else:
-                return "debate"
+                # 继续协作
+                if state.get("collaboration_mode") == "review":
+                    return "review"
+                else:
+                    return "debate"
     
-    workflow.add_conditional_edges(
-        "debate_collaborate",
-        should_continue_collaboration,
-        {
-            "debate": "debate_collaborate",
-            "integrate": "integration"
-        }
-    )
+        workflow.add_conditional_edges(
+            "debate_collaborate",
+            should_continue_collaboration,
+            {
+                "debate": "debate_collaborate",
+                "integrate": "integration"
+            }
+        )
     
-    workflow.add_conditional_edges(
-        "review_collaborate",
-        should_continue_collaboration,
-        {
-            "review": "review_collaborate",
-            "integrate": "integration"
-        }
-    )
+        workflow.add_conditional_edges(
+            "review_collaborate",
+            should_continue_collaboration,
+            {
+                "review": "review_collaborate",
+                "integrate": "integration"
+            }
+        )
     
     # Phase 5 → END
     workflow.add_edge("integration", END)
@@ -94,9 +121,18 @@ def create_workflow():
     return workflow.compile()
 
 
-# 创建工作流实例
-workflow = create_workflow()
+# ⚠️ workflow.compile() 是整个流程中最重的一步（校验图结构、构建通道与调度表），绝不能在请求路径上执行：
+#    编译结果一律经 get_compiled_workflow 缓存，默认图在启动时由lifespan预热
+@lru_cache(maxsize=8)
+def get_compiled_workflow(config_key: Tuple[Tuple[str, Any], ...] = ()) -> Pregel:
+    """
+    按配置键获取编译好的工作流（每种配置进程内只编译一次）
+    
+    config_key 为 create_workflow 参数覆盖组成的元组（需可哈希），如 (("inline_loop", False),)
+    """
+    return create_workflow(**dict(config_key))
+
 
-def get_workflow():
-    """获取工作流实例"""
-    return workflow
\ No newline at end of file
+def get_workflow() -> Pregel:
+    """获取默认工作流（✅ 不带参数：作为FastAPI依赖使用时，参数会被解析成查询参数）"""
+    return get_compiled_workflow()
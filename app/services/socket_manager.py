@@ -193,16 +193,42 @@ class SocketManager:
         else:
             print(f"[WS] ⚠️  No active connections for {task_id}, progress cached")
 
-    async def get_full_progress(self, task_id: str) -> List[Dict]:
-        """获取任务完整进度历史"""
+    async def get_progress_since(self, task_id: str, since_seq: Optional[int] = None) -> List[Dict]:
+        """
+        获取任务进度历史中 sequence_id > since_seq 的部分（since_seq为None时返回完整历史）
+
+        ✅ 轮询方带上已收到的最后一个序列号，只取增量，不再每次回放整段历史
+        """
         if USE_REDIS:
-            # Redis LRANGE
-            items = await redis_client.lrange(f"progress:{task_id}", 0, -1)
-            return [json.loads(item) for item in reversed(items)]
+            key = f"progress:{task_id}"
+            if since_seq is None:
+                items = await redis_client.lrange(key, 0, -1)
+            else:
+                # 序列号连续递增、列表头部最新：最新序列号与since之差即需要读取的条数
+                latest = await redis_client.get(f"seq:{task_id}")
+                count = int(latest or 0) - since_seq
+                if count <= 0:
+                    return []
+                items = await redis_client.lrange(key, 0, count - 1)
+            progress = [json.loads(item) for item in reversed(items)]
         else:
-            if task_id in _progress_cache:
-                return list(_progress_cache[task_id])
-            return []
+            cached = _progress_cache.get(task_id)
+            if not cached:
+                return []
+            if since_seq is None:
+                return list(cached)
+            # 从尾部（最新）向前取，遇到已收到的序列号即停止
+            progress = []
+            for item in reversed(cached):
+                if item["sequence_id"] <= since_seq:
+                    break
+                progress.append(item)
+            progress.reverse()
+            return progress
+
+        if since_seq is not None:
+            progress = [item for item in progress if item["sequence_id"] > since_seq]
+        return progress
 
     async def emit_ai_message(self, task_id: str, actor: str, content: str):
         """推送AI消息"""
@@ -1,15 +1,19 @@
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Literal
 from uuid import uuid4
 from datetime import datetime
-from app.core.database import get_supabase
+from app.core.database import get_supabase, run_in_executor
+from app.core.db_pool import get_pool, fetch_json_row
 from app.services.langgraph.workflow import get_workflow
 from app.services.langgraph.nodes.phase1_inquiry import phase1_process_answers
+from app.services.langgraph.state import merge_state
 import asyncio
 import os
 import hashlib
 from contextlib import suppress
 from pydantic import BaseModel, Field, validator
-import traceback
+import logging
+
+logger = logging.getLogger(__name__)
 
 # ✅ Redis配置（多进程安全）
 USE_REDIS_LOCK = os.getenv("USE_REDIS_LOCK", "false").lower() == "true"
@@ -59,6 +63,7 @@ class IntermediateStateSchema(BaseModel):
     missing_info: List[str] = Field(default_factory=list)
     audit_trail: List[dict] = Field(default_factory=list)
     total_cost: float = Field(default=0.0, ge=0, le=1000)
+    requested_mode: Optional[Literal["debate", "review", "both"]] = None
     
     @validator('total_cost')
     def validate_cost(cls, v):
@@ -177,47 +182,60 @@ class TaskService:
         try:
             exc = task.exception()
             if exc:
-                print(f"[TASK] ❌ 任务异常退出: {task_id}")
-                print(f"[TASK] 异常类型: {type(exc).__name__}")
-                print(f"[TASK] 异常信息: {str(exc)}")
-                traceback.print_exception(type(exc), exc, exc.__traceback__)
+                # ✅ logging按级别惰性格式化堆栈，不同步写stderr
+                logger.error(f"[TASK] ❌ 任务异常退出: {task_id}", exc_info=exc)
                 
                 # ✅ 可选：发送告警通知
                 # asyncio.create_task(self._send_alert(task_id, exc))
         except Exception as e:
             print(f"[TASK] ❌ 检查任务异常时出错: {e}")
     
-    async def create_task(self, user_id: str, scene: str, user_input: str) -> Dict[str, Any]:
+    async def create_task(
+        self,
+        user_id: str,
+        scene: str,
+        user_input: str,
+        task_id: Optional[str] = None,
+        collaboration_mode: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         创建新任务
         
+        Args:
+            task_id: 任务行已由 create_task_with_quota 插入时传入其ID，此处不再插入
+            collaboration_mode: 调用方显式指定的协作模式（None时由规划AI选择）
+        
         Returns:
             - 如果需要问询：返回问题列表
             - 如果信息充足：返回task_id，后台开始处理
         """
         
-        task_id = str(uuid4())
+        inserted = task_id is not None
+        if not inserted:
+            task_id = str(uuid4())
         
         initial_state = {
             "task_id": task_id,
             "user_id": user_id,
             "scene": scene,
             "user_input": user_input,
+            "requested_mode": collaboration_mode,
             "audit_trail": [],
             "total_cost": 0.0
         }
         
         try:
             # ✅ 先插入任务（使用允许的状态）
-            initial_status = "inquiring"  # 初始状态设为询问中
-            self.supabase.table("tasks").insert({
-                "id": task_id,
-                "user_id": user_id,
-                "scene": scene,
-                "user_input": user_input,
-                "status": initial_status,  # ✅ 使用允许的状态
-                "cost": 0.0
-            }).execute()
+            if not inserted:
+                initial_status = "inquiring"  # 初始状态设为询问中
+                await self._insert_task_rest({
+                    "id": task_id,
+                    "user_id": user_id,
+                    "scene": scene,
+                    "user_input": user_input,
+                    "status": initial_status,  # ✅ 使用允许的状态
+                    "cost": 0.0
+                })
             
             # 运行Phase 0-1
             result = await self.workflow.ainvoke(initial_state)
@@ -228,10 +246,10 @@ class TaskService:
                 pass
             else:
                 # 更新为 processing 状态
-                self.supabase.table("tasks").update({
+                await self._update_task_rest(task_id, {
                     "status": "processing",
                     "cost": result.get("total_cost", 0.0)
-                }).eq("id", task_id).execute()
+                })
             
             if result.get("need_inquiry"):
                 return {
@@ -245,7 +263,8 @@ class TaskService:
                         provided_info=result.get("provided_info", {}),
                         missing_info=result.get("missing_info", []),
                         audit_trail=result.get("audit_trail", []),
-                        total_cost=result.get("total_cost", 0.0)
+                        total_cost=result.get("total_cost", 0.0),
+                        requested_mode=result.get("requested_mode")
                     ).dict()
                 }
             else:
@@ -262,10 +281,7 @@ class TaskService:
         except Exception as e:
             # ✅ 标记失败
             print(f"[SERVICE] ❌ 创建任务失败: {task_id}, 错误: {e}")
-            self.supabase.table("tasks").update({
-                "status": "failed",
-                "output": {"error": str(e)}
-            }).eq("id", task_id).execute()
+            await self._mark_failed(task_id, str(e))
             
             raise Exception(f"任务创建失败: {str(e)}")
     
@@ -285,9 +301,9 @@ class TaskService:
         
         try:
             # 获取任务
-            task = self.supabase.table("tasks").select("*").eq("id", task_id).single().execute()
+            task = await self.get_task(task_id)
             
-            if not task.data:
+            if not task:
                 raise Exception("任务不存在")
             
             # ✅ Pydantic严格校验
@@ -299,16 +315,16 @@ class TaskService:
             # ✅ 重建状态（不可被覆盖的字段在外层）
             state = {
                 "task_id": task_id,
-                "user_id": task.data["user_id"],  # ← 不可被覆盖
-                "scene": task.data["scene"],
-                "user_input": task.data["user_input"],
+                "user_id": task["user_id"],  # ← 不可被覆盖
+                "scene": task["scene"],
+                "user_input": task["user_input"],
                 **validated_state.dict(),  # ← 已校验的数据
                 "collected_info": {}
             }
             
             # Phase 1: 处理答案
             answer_result = await phase1_process_answers(state, answers)
-            state.update(answer_result)
+            merge_state(state, answer_result)
             
             # ✅ 原子更新（带状态检查）
             update_data = {
@@ -317,11 +333,9 @@ class TaskService:
                 "processing_state": state
             }
             
-            result = self.supabase.table("tasks").update(
-                update_data
-            ).eq("id", task_id).eq("status", "inquiring").execute()
+            updated = await self._update_task_rest(task_id, update_data, expected_status="inquiring")
             
-            if not result.data:
+            if not updated:
                 raise Exception("任务状态不正确或已被处理")
             
             print(f"[SERVICE] ✅ 答案已提交: {task_id}")
@@ -335,29 +349,40 @@ class TaskService:
         
         except Exception as e:
             print(f"[SERVICE] ❌ 提交答案失败: {e}")
-            self.supabase.table("tasks").update({
-                "status": "failed",
-                "output": {"error": str(e)}
-            }).eq("id", task_id).execute()
+            await self._mark_failed(task_id, str(e))
             
             raise Exception(f"答案提交失败: {str(e)}")
 
-    async def start_processing(self, task_id: str) -> Dict[str, Any]:
+    async def claim_for_processing(self, task_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+        """
+        认领任务：单条条件UPDATE把 ready_for_processing 切换为 processing，返回更新后的任务行
+        
+        ✅ 归属与状态检查都在WHERE中完成，并发启动时只有一个请求能认领成功
+        未更新任何行（不存在/不属于该用户/状态不对）返回None，由调用方再查一次区分原因
+        """
+        if await get_pool() is not None:
+            return await fetch_json_row(
+                "UPDATE tasks AS t SET status = 'processing' "
+                "WHERE t.id = $1::uuid AND t.user_id = $2::uuid AND t.status = 'ready_for_processing' "
+                "RETURNING to_jsonb(t)",
+                task_id, user_id
+            )
+        return await self._claim_for_processing_rest(task_id, user_id)
+    
+    @run_in_executor
+    def _claim_for_processing_rest(self, task_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+        result = self.supabase.table("tasks").update({
+            "status": "processing"
+        }).eq("id", task_id).eq("user_id", user_id).eq("status", "ready_for_processing").execute()
+        return result.data[0] if result.data else None
+    
+    async def start_processing(self, task_id: str, task_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         启动任务处理 - 由前端在WebSocket连接建立后调用
         
-        ✅ 使用原子更新防止多Worker重复启动
+        task_data: claim_for_processing 认领成功后返回的任务行（状态已是processing）
         """
         try:
-            # ✅ 原子更新：只有status='ready_for_processing'时才更新
-            result = self.supabase.table("tasks").update({
-                "status": "processing"
-            }).eq("id", task_id).eq("status", "ready_for_processing").execute()
-            
-            if not result.data:
-                raise Exception("任务状态不正确或已被其他实例启动")
-            
-            task_data = result.data[0]
             processing_state = task_data.get("processing_state", {})
             
             # ✅ 启动后台任务
@@ -372,10 +397,7 @@ class TaskService:
         
         except Exception as e:
             print(f"[SERVICE] ❌ 启动处理失败: {e}")
-            self.supabase.table("tasks").update({
-                "status": "failed",
-                "output": {"error": str(e)}
-            }).eq("id", task_id).execute()
+            await self._mark_failed(task_id, str(e))
             
             raise Exception(f"启动处理失败: {str(e)}")
     
@@ -424,7 +446,7 @@ class TaskService:
                 print(f"[TASK] ⚠️ WebSocket连接超时，继续处理（进度将被缓存）")
             
             from app.services.langgraph.nodes.phase2_planning import phase2_planning
-            from app.services.langgraph.nodes.phase3_collaboration import phase3_debate_mode, phase3_review_mode
+            from app.services.langgraph.nodes.phase3_collaboration import phase3_debate_mode, phase3_review_mode, phase3_both_mode
             from app.services.langgraph.nodes.phase5_integration import phase5_integration
             
             state = dict(initial_result)
@@ -439,7 +461,7 @@ class TaskService:
                 )
             
             planning_result = await phase2_planning(state)
-            state.update(planning_result)
+            merge_state(state, planning_result)
             
             # Phase 3: 协作
             collaboration_mode = state.get("collaboration_mode", "debate")
@@ -450,7 +472,7 @@ class TaskService:
                     task_id,
                     "协作",
                     state["_last_progress"],
-                    f"多AI {'辩论' if collaboration_mode == 'debate' else '审查'}模式启动..."
+                    f"多AI {'辩论' if collaboration_mode == 'debate' else '辩论+审查' if collaboration_mode == 'both' else '审查'}模式启动..."
                 )
             
             # ✅ 循环协作（带超时保护）
@@ -465,10 +487,13 @@ class TaskService:
                 
                 if collaboration_mode == "review":
                     collab_result = await phase3_review_mode(state)
+                elif collaboration_mode == "both":
+                    # 双模式在节点内跑完两种模式的全部轮次，返回时 should_stop 已为True
+                    collab_result = await phase3_both_mode(state)
                 else:
                     collab_result = await phase3_debate_mode(state)
                 
-                state.update(collab_result)
+                merge_state(state, collab_result)
                 state["current_round"] = current_round
                 
                 # ✅ UTF-8安全截断
@@ -510,7 +535,7 @@ class TaskService:
                 )
             
             integration_result = await phase5_integration(state)
-            state.update(integration_result)
+            merge_state(state, integration_result)
 
             # ✅ 推送100%完成进度
             with suppress(Exception):
@@ -518,8 +543,8 @@ class TaskService:
 
             # ✅ 先更新数据库，再发送complete事件（确保数据一致性）
             end_time = datetime.utcnow()
-            task = self.supabase.table("tasks").select("created_at").eq("id", task_id).single().execute()
-            start_time = datetime.fromisoformat(task.data["created_at"].replace("Z", "+00:00")).replace(tzinfo=None)
+            task = await self.get_task(task_id)
+            start_time = datetime.fromisoformat(task["created_at"].replace("Z", "+00:00")).replace(tzinfo=None)
             duration = int((end_time - start_time).total_seconds())
             
             # 构建完整的输出数据
@@ -533,13 +558,13 @@ class TaskService:
             }
             
             # 更新数据库状态
-            update_result = self.supabase.table("tasks").update({
+            await self._update_task_rest(task_id, {
                 "status": "completed",
                 "output": final_output,
                 "cost": state.get("total_cost", 0.0),
                 "duration": duration,
                 "completed_at": end_time.isoformat()
-            }).eq("id", task_id).execute()
+            })
             
             print(f"[TASK] ✅ 数据库状态已更新为completed: {task_id}")
             
@@ -558,19 +583,15 @@ class TaskService:
                     for entry in audit_trail
                 ]
                 # 一次性插入所有审计记录
-                self.supabase.table("audit_trails").insert(audit_rows).execute()
+                await self._insert_audit_rows_rest(audit_rows)
                 print(f"[TASK] ✅ 批量插入{len(audit_rows)}条审计记录")
             
             print(f"[TASK-END] ✅ task_id={task_id} 完成")
             
         except Exception as e:
-            print(f"[TASK-END] ❌ task_id={task_id} 异常: {e}")
-            traceback.print_exc()
+            logger.exception(f"[TASK-END] ❌ task_id={task_id} 异常: {e}")
             
-            self.supabase.table("tasks").update({
-                "status": "failed",
-                "output": {"error": str(e)}
-            }).eq("id", task_id).execute()
+            await self._mark_failed(task_id, str(e))
             
             with suppress(Exception):
                 await socket_manager.emit_error(task_id, str(e))
@@ -581,12 +602,59 @@ class TaskService:
             # ✅ 释放任务锁
             await self._release_task_lock(task_id)
     
-    def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
-        """获取任务详情"""
+    async def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """获取任务详情（✅ 配置了asyncpg连接池时直连查询，否则在线程池中走supabase-py）"""
+        if await get_pool() is not None:
+            return await fetch_json_row("SELECT to_jsonb(t) FROM tasks AS t WHERE t.id = $1::uuid", task_id)
+        return await self._get_task_rest(task_id)
+    
+    @run_in_executor
+    def _get_task_rest(self, task_id: str) -> Optional[Dict[str, Any]]:
         result = self.supabase.table("tasks").select("*").eq("id", task_id).single().execute()
         return result.data if result.data else None
     
-    def get_user_tasks(
+    # ✅ 写操作同样在线程池中执行（supabase-py 是同步客户端，直接调用会阻塞事件循环）
+    @run_in_executor
+    def _insert_task_rest(self, row: Dict[str, Any]) -> None:
+        self.supabase.table("tasks").insert(row).execute()
+    
+    @run_in_executor
+    def _update_task_rest(
+        self,
+        task_id: str,
+        fields: Dict[str, Any],
+        expected_status: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """更新任务行，返回更新后的行；指定 expected_status 时只在当前状态匹配时更新"""
+        query = self.supabase.table("tasks").update(fields).eq("id", task_id)
+        if expected_status is not None:
+            query = query.eq("status", expected_status)
+        return query.execute().data or []
+    
+    @run_in_executor
+    def _insert_audit_rows_rest(self, rows: List[Dict[str, Any]]) -> None:
+        self.supabase.table("audit_trails").insert(rows).execute()
+    
+    async def _mark_failed(self, task_id: str, error: str) -> None:
+        """把任务标记为失败"""
+        await self._update_task_rest(task_id, {"status": "failed", "output": {"error": error}})
+    
+    # ✅ 一条SQL同时取当前页和总数（COUNT(*) OVER() 在 LIMIT 之前计算），页内行在库内聚合成一个jsonb
+    _USER_TASKS_SQL = """
+        SELECT jsonb_build_object(
+            'tasks', COALESCE(jsonb_agg(to_jsonb(p) - 'total' ORDER BY p.created_at DESC), '[]'::jsonb),
+            'total', COALESCE(max(p.total), 0)
+        )
+        FROM (
+            SELECT t.*, COUNT(*) OVER() AS total
+            FROM tasks AS t
+            WHERE t.user_id = $1::uuid
+            ORDER BY t.created_at DESC
+            LIMIT $2 OFFSET $3
+        ) AS p
+    """
+    
+    async def get_user_tasks(
         self, 
         user_id: str, 
         limit: int = 20, 
@@ -596,6 +664,7 @@ class TaskService:
         获取用户的任务列表
         
         ✅ 支持分页
+        ✅ 配置了asyncpg连接池时一次查询取回当前页+总数，否则在线程池中走supabase-py（count="exact"）
         
         Args:
             user_id: 用户ID
@@ -605,20 +674,33 @@ class TaskService:
         Returns:
             包含tasks、total、limit、offset的字典
         """
+        pool = await get_pool()
+        if pool is not None:
+            page = await fetch_json_row(self._USER_TASKS_SQL, user_id, limit, offset)
+            tasks, total = page["tasks"], page["total"]
+            if not tasks and offset > 0:
+                # 页码越界时窗口函数没有行可附带总数，补查一次
+                total = await pool.fetchval("SELECT count(*) FROM tasks WHERE user_id = $1::uuid", user_id)
+        else:
+            tasks, total = await self._get_user_tasks_rest(user_id, limit, offset)
+        
+        return {
+            "tasks": tasks,
+            "total": total,
+            "limit": limit,
+            "offset": offset,
+            "has_more": total > (offset + limit)
+        }
+    
+    @run_in_executor
+    def _get_user_tasks_rest(self, user_id: str, limit: int, offset: int):
         result = self.supabase.table("tasks")\
             .select("*", count="exact")\
             .eq("user_id", user_id)\
             .order("created_at", desc=True)\
             .range(offset, offset + limit - 1)\
             .execute()
-        
-        return {
-            "tasks": result.data if result.data else [],
-            "total": result.count or 0,
-            "limit": limit,
-            "offset": offset,
-            "has_more": (result.count or 0) > (offset + limit)
-        }
+        return result.data or [], result.count or 0
     
     def get_active_task_count(self) -> int:
         """
@@ -0,0 +1,99 @@
+from typing import Dict, Any, Optional
+from app.core.database import get_supabase, run_in_executor
+from app.core.db_pool import get_pool
+import orjson
+
+
+class UserService:
+    """
+    用户服务
+    
+    ✅ supabase-py 是同步客户端，所有数据库调用都放到线程池执行，
+    避免在 async 路由中阻塞事件循环；消耗配额建任务/回滚配额在配置了asyncpg连接池时直连Postgres
+    """
+    
+    def __init__(self):
+        self._supabase = None
+    
+    @property
+    def supabase(self):
+        """延迟加载 Supabase 客户端"""
+        if self._supabase is None:
+            self._supabase = get_supabase()
+        return self._supabase
+    
+    @run_in_executor
+    def get_auth_user_id(self, token: str) -> Optional[str]:
+        """使用Supabase Auth验证token，返回用户ID（无效返回None）"""
+        user_response = self.supabase.auth.get_user(token)
+        return user_response.user.id if user_response.user else None
+    
+    @run_in_executor
+    def get_user_by_id(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """按ID查询用户，不存在返回None"""
+        result = self.supabase.table("users").select("*").eq("id", user_id).single().execute()
+        return result.data
+    
+    @run_in_executor
+    def get_user_by_email(self, email: str, columns: str = "id") -> Optional[Dict[str, Any]]:
+        """按邮箱查询用户，不存在返回None"""
+        result = self.supabase.table("users").select(columns).eq("email", email).limit(1).execute()
+        return result.data[0] if result.data else None
+    
+    @run_in_executor
+    def create_user(self, user: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """创建用户，返回新行"""
+        result = self.supabase.table("users").insert(user).execute()
+        return result.data[0] if result.data else None
+    
+    async def create_task_with_quota(self, user_id: str, scene: str, user_input: str) -> Optional[Dict[str, Any]]:
+        """
+        调用 create_task_with_quota 函数：一次往返完成配额校验 + 递增 + 插入任务
+        
+        Returns:
+            {"task_id": 新任务ID, "user_row": 更新后的用户行}；配额不足返回None（任务未插入）
+        """
+        pool = await get_pool()
+        if pool is not None:
+            row = await pool.fetchrow(
+                "SELECT task_id, user_row FROM create_task_with_quota($1::uuid, $2, $3)",
+                user_id, scene, user_input
+            )
+            if row is None:
+                return None
+            return {"task_id": str(row["task_id"]), "user_row": orjson.loads(row["user_row"])}
+        return await self._create_task_with_quota_rpc(user_id, scene, user_input)
+    
+    async def decrement_daily_used(self, user_id: str) -> None:
+        """调用 decrement_daily_used 函数（回滚配额）"""
+        pool = await get_pool()
+        if pool is not None:
+            await pool.fetchval("SELECT decrement_daily_used($1::uuid)", user_id)
+        else:
+            await self._decrement_daily_used_rpc(user_id)
+    
+    @run_in_executor
+    def _create_task_with_quota_rpc(self, user_id: str, scene: str, user_input: str) -> Optional[Dict[str, Any]]:
+        result = self.supabase.rpc("create_task_with_quota", {
+            "p_user_id": user_id,
+            "p_scene": scene,
+            "p_input": user_input
+        }).execute()
+        return result.data[0] if result.data else None
+    
+    @run_in_executor
+    def _decrement_daily_used_rpc(self, user_id: str) -> None:
+        self.supabase.rpc("decrement_daily_used", {
+            "p_user_id": user_id
+        }).execute()
+
+
+# ✅ 全局单例
+_user_service_instance: Optional[UserService] = None
+
+def get_user_service() -> UserService:
+    """获取用户服务实例（延迟初始化）"""
+    global _user_service_instance
+    if _user_service_instance is None:
+        _user_service_instance = UserService()
+    return _user_service_instance
@@ -1,33 +1,38 @@
 -- ✅ 创建原子递增配额的PostgreSQL函数
+-- 单条条件UPDATE：配额检查放在WHERE中，无需先SELECT ... FOR UPDATE
 CREATE OR REPLACE FUNCTION increment_daily_used(p_user_id UUID)
 RETURNS INTEGER AS $$
 DECLARE
     v_new_used INTEGER;
-    v_quota INTEGER;
 BEGIN
-    -- 获取当前配额并锁行
-    SELECT daily_used, daily_quota 
-    INTO v_new_used, v_quota
-    FROM users 
-    WHERE id = p_user_id
-    FOR UPDATE;
-    
-    -- 检查是否超过配额
-    IF v_new_used >= v_quota THEN
-        RAISE EXCEPTION 'quota_exceeded';
-    END IF;
-    
-    -- 原子递增
     UPDATE users 
     SET daily_used = daily_used + 1,
         updated_at = NOW()
     WHERE id = p_user_id
+      AND daily_used < daily_quota
     RETURNING daily_used INTO v_new_used;
     
+    -- 未更新任何行 = 配额已用完（或用户不存在）
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'quota_exceeded';
+    END IF;
+    
     RETURN v_new_used;
 END;
 $$ LANGUAGE plpgsql;
 
+-- ✅ 消耗配额并返回更新后的用户行（校验+递增+读取合并为一次调用）
+-- 配额不足时返回空集
+CREATE OR REPLACE FUNCTION consume_quota(p_user_id UUID)
+RETURNS SETOF users AS $$
+    UPDATE users 
+    SET daily_used = daily_used + 1,
+        updated_at = NOW()
+    WHERE id = p_user_id
+      AND daily_used < daily_quota
+    RETURNING *;
+$$ LANGUAGE sql;
+
 -- ✅ 创建补偿回滚函数
 CREATE OR REPLACE FUNCTION decrement_daily_used(p_user_id UUID)
 RETURNS INTEGER AS $$
@@ -47,3 +52,23 @@ $$ LANGUAGE plpgsql;
 -- ✅ 创建索引（如果还没有）
 CREATE INDEX IF NOT EXISTS idx_users_id_quota 
 ON users(id, daily_used, daily_quota);
+
+-- ✅ 消耗配额并插入任务（配额校验+递增+插入合并为一条语句，无需先扣配额再插入、失败再回滚）
+-- 配额不足时返回空集，不插入任务
+CREATE OR REPLACE FUNCTION create_task_with_quota(p_user_id UUID, p_scene TEXT, p_input TEXT)
+RETURNS TABLE(task_id UUID, user_row JSONB) AS $$
+    WITH q AS (
+        UPDATE users 
+        SET daily_used = daily_used + 1,
+            updated_at = NOW()
+        WHERE id = p_user_id
+          AND daily_used < daily_quota
+        RETURNING *
+    ), t AS (
+        INSERT INTO tasks (id, user_id, scene, user_input, status, cost)
+        SELECT gen_random_uuid(), p_user_id, p_scene, p_input, 'inquiring', 0.0
+        FROM q
+        RETURNING id
+    )
+    SELECT t.id, to_jsonb(q) FROM t, q;
+$$ LANGUAGE sql;
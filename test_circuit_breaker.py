@@ -0,0 +1,109 @@
+"""
+断路器状态转换测试（closed → open → half_open → closed/open，含探测请求被取消）
+
+运行：pytest test_circuit_breaker.py
+"""
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.ai_client_fixed import AIClient, CircuitBreaker, CircuitOpenError
+
+
+class FakeClient(AIClient):
+    """不发网络请求的客户端：completions.create 由测试替换"""
+
+    def __init__(self, name: str):
+        super().__init__(api_key="test", base_url="http://localhost", model="fake", name=name)
+        self.breaker.reset_timeout = 0.05
+        self.create = None
+        self.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=self._create)))
+
+    async def _create(self, **kwargs):
+        return await self.create()
+
+    def _calculate_cost(self, prompt_tokens: int, completion_tokens: int) -> float:
+        return 0.0
+
+
+async def _ok():
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content="ok"))],
+        usage=SimpleNamespace(prompt_tokens=1, completion_tokens=1, total_tokens=2)
+    )
+
+
+async def _fail():
+    raise ValueError("boom")
+
+
+async def _hang():
+    await asyncio.sleep(10)
+
+
+async def _open(client: FakeClient):
+    client.create = _fail
+    for _ in range(client.breaker.fail_max):
+        with pytest.raises(Exception):
+            await client.chat([])
+    assert client.breaker.current_state == CircuitBreaker.OPEN
+
+
+def test_closed_to_open_fails_fast():
+    async def run():
+        client = FakeClient("breaker-open")
+        await _open(client)
+        client.create = _ok
+        with pytest.raises(CircuitOpenError):
+            await client.chat([])
+    asyncio.run(run())
+
+
+def test_half_open_probe_success_closes():
+    async def run():
+        client = FakeClient("breaker-close")
+        await _open(client)
+        time.sleep(0.06)
+        assert client.breaker.current_state == CircuitBreaker.HALF_OPEN
+        client.create = _ok
+        assert (await client.chat([]))["content"] == "ok"
+        assert client.breaker.current_state == CircuitBreaker.CLOSED
+    asyncio.run(run())
+
+
+def test_half_open_probe_failure_reopens():
+    async def run():
+        client = FakeClient("breaker-reopen")
+        await _open(client)
+        time.sleep(0.06)
+        with pytest.raises(Exception):
+            await client.chat([])
+        assert client.breaker.current_state == CircuitBreaker.OPEN
+    asyncio.run(run())
+
+
+def test_half_open_allows_single_probe():
+    breaker = CircuitBreaker("breaker-single", fail_max=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_cancelled_probe_releases_trial():
+    async def run():
+        client = FakeClient("breaker-cancel")
+        await _open(client)
+        time.sleep(0.06)
+        client.create = _hang
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(client.chat([]), timeout=0.01)
+        # 被取消的探测不计为失败，也不能占住探测名额
+        assert client.breaker.current_state == CircuitBreaker.HALF_OPEN
+        client.create = _ok
+        assert (await client.chat([]))["content"] == "ok"
+        assert client.breaker.current_state == CircuitBreaker.CLOSED
+    asyncio.run(run())